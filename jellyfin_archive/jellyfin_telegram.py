@@ -1,212 +1,263 @@
-from jellyfin_api import JellyfinAPI
+from src.core.config import JELLYFIN_ACCOUNTS_LIST
+from src.integrations.jellyfin.client import JellyfinClient
+from src.integrations.telegram.client import send_chat_action
+from src.utils.formatters import truncate
 from telegram_utils import send_telegram
-import re
-import requests
+import html
+import logging
+import threading
+import traceback
+
+logger = logging.getLogger(__name__)
 
 # Comandos Jellyfin para o Telegram
 
+# Cliente compartilhado entre comandos: autentica uma vez e reaproveita o pool de conexões
+_client = None
+_client_lock = threading.Lock()
+
+def get_jellyfin_client():
+    """Retorna o cliente da primeira conta Jellyfin configurada (criado na primeira chamada)"""
+    global _client
+    if _client is None and JELLYFIN_ACCOUNTS_LIST:
+        with _client_lock:
+            if _client is None:
+                account = JELLYFIN_ACCOUNTS_LIST[0]
+                client = JellyfinClient(account['url'], account['username'], account['password'], account['api_key'])
+                if account['username'] and account['password']:
+                    # Se falhar aqui, o cliente tenta de novo ao receber 401
+                    client.authenticate()
+                _client = client
+    return _client
+
 def format_item_info(item):
     """Formata informações de um item para exibição no Telegram"""
-    name = item.get('Name', 'Sem nome')
-    item_type = item.get('Type', 'Desconhecido')
-    overview = item.get('Overview', '')
-    if overview and len(overview) > 100:
-        overview = overview[:97] + '...'
+    # O texto fica no próprio dict, que vem do cache do cliente: repetir /jfrecent ou /jfitem
+    # o reaproveita, e uma nova busca traz dicts novos (o texto é refeito)
+    cached = item.get('_info_html')
+    if cached is not None:
+        return cached
+    get = item.get
+    # Nomes e sinopses vêm do servidor: escapados para não quebrar o HTML da mensagem
+    name = html.escape(get('Name', 'Sem nome'))
+    item_type = get('Type', 'Desconhecido')
+    overview = html.escape(truncate(get('Overview') or '', 100))
     
-    info = f"<b>{name}</b> ({item_type})\n"
+    lines = [f"<b>{name}</b> ({item_type})"]
     if overview:
-        info += f"{overview}\n"
+        lines.append(overview)
     
     # Adiciona informações específicas por tipo
-    if item_type == 'Movie':
-        year = item.get('ProductionYear', '')
-        runtime = item.get('RunTimeTicks', 0) / 10000000 / 60  # Converte ticks para minutos
+    if item_type in ('Movie', 'Series'):
+        year = get('ProductionYear')
         if year:
-            info += f"Ano: {year}\n"
-        if runtime:
-            info += f"Duração: {int(runtime)} min\n"
-    elif item_type == 'Series':
-        year = item.get('ProductionYear', '')
-        status = item.get('Status', '')
-        if year:
-            info += f"Ano: {year}\n"
-        if status:
-            info += f"Status: {status}\n"
+            lines.append(f"Ano: {year}")
+        if item_type == 'Movie':
+            runtime = (get('RunTimeTicks') or 0) // 600_000_000  # Ticks (100 ns) para minutos
+            if runtime:
+                lines.append(f"Duração: {runtime} min")
+        else:
+            status = get('Status')
+            if status:
+                lines.append(f"Status: {status}")
     
+    lines.append("")
+    info = item['_info_html'] = "\n".join(lines)
     return info
 
-def process_jellyfin_command(text, chat_id):
-    jf = JellyfinAPI()
-    
-    # Comando de ajuda
-    if text == "/jfhelp":
-        try:
-            help_text = "<b>Comandos Jellyfin disponíveis:</b>\n\n"
-            help_text += "/jflib - Lista todas as bibliotecas\n"
-            help_text += "/jfsearch &lt;termo&gt; - Pesquisa por conteúdo\n"
-            help_text += "/jfrecent - Mostra adições recentes\n"
-            help_text += "/jfinfo - Informações do servidor\n"
-            help_text += "/jfitem &lt;id&gt; - Detalhes de um item específico\n"
-            help_text += "/jfsessions - Lista sessões ativas (admin)\n"
-            send_telegram(help_text, chat_id)
-            return True
-        except Exception as e:
-            print(f"❌ Erro ao processar comando /jfhelp: {str(e)}")
-            # Tenta enviar uma mensagem simplificada sem formatação
-            send_telegram("Comandos Jellyfin disponíveis: /jflib, /jfsearch, /jfrecent, /jfinfo, /jfitem, /jfsessions", chat_id, parse_mode=None)
-            return True
-    
-    # Lista bibliotecas
-    if text.startswith("/jflib"):
-        try:
-            libs = jf.get_libraries()
-            msg = "<b>Bibliotecas Jellyfin:</b>\n"
-            for item in libs.get('Items', []):
-                msg += f"- {item.get('Name')} ({item.get('Type')}) [ID: {item.get('Id')}]\n"
-            send_telegram(msg, chat_id)
-        except Exception as e:
-            send_telegram(f"❌ Erro ao listar bibliotecas Jellyfin: {str(e)}", chat_id)
-        return True
-    
-    # Pesquisa por conteúdo
-    if text.startswith("/jfsearch "):
-        query = text[len("/jfsearch "):].strip()
-        if not query:
-            send_telegram("❌ Use: /jfsearch <termo>", chat_id)
-            return True
-        try:
-            results = jf.search_media(query)
-            msg = f"<b>Resultados para '{query}':</b>\n"
-            for hint in results.get('SearchHints', []):
-                item_id = hint.get('Id')
-                msg += f"- {hint.get('Name')} ({hint.get('Type')})\n"
-                if item_id:
-                    msg += f"  ID: {item_id}\n"
-            send_telegram(msg if results.get('SearchHints') else "Nenhum resultado encontrado.", chat_id)
-        except Exception as e:
-            send_telegram(f"❌ Erro na busca Jellyfin: {str(e)}", chat_id)
-        return True
-    
-    # Mostra adições recentes
-    if text.startswith("/jfrecent"):
-        try:
-            # Verifica se há um tipo específico solicitado
-            match = re.search(r'/jfrecent\s+(\w+)', text)
-            item_type = match.group(1) if match else None
+_JFHELP_HTML = (
+    "<b>Comandos Jellyfin disponíveis:</b>\n\n"
+    "/jflib - Lista todas as bibliotecas\n"
+    "/jfsearch &lt;termo&gt; - Pesquisa por conteúdo\n"
+    "/jfrecent - Mostra adições recentes\n"
+    "/jfinfo - Informações do servidor\n"
+    "/jfitem &lt;id&gt; - Detalhes de um item específico\n"
+    "/jfsessions - Lista sessões ativas (admin)\n"
+)
+_JFHELP_PLAIN = "Comandos Jellyfin disponíveis: /jflib, /jfsearch, /jfrecent, /jfinfo, /jfitem, /jfsessions"
+
+def _send_help(chat_id):
+    try:
+        send_telegram(_JFHELP_HTML, chat_id)
+    except Exception as e:
+        logger.error(f"Erro ao processar comando /jfhelp: {e}")
+        # Tenta enviar uma mensagem simplificada sem formatação
+        send_telegram(_JFHELP_PLAIN, chat_id, parse_mode=None)
+
+def _handle_jflib(jf, text, args, chat_id):
+    """Lista bibliotecas"""
+    try:
+        libs = jf.get_libraries()
+        parts = ["📚 Bibliotecas Jellyfin:\n"]
+        for item in libs:
+            parts.append(f"- {item.get('Name')} ({item.get('CollectionType')}) [ID: {item.get('ItemId')}]\n")
+        send_telegram("".join(parts), chat_id, parse_mode=None)
+    except Exception as e:
+        send_telegram(f"❌ Erro ao listar bibliotecas Jellyfin: {str(e)}", chat_id)
+
+def _handle_jfsearch(jf, text, args, chat_id):
+    """Pesquisa por conteúdo"""
+    query = args
+    if not query:
+        send_telegram("❌ Use: /jfsearch <termo>", chat_id)
+        return
+    try:
+        results = jf.search_media(query)
+        parts = [f"🔍 Resultados para '{query}':\n"]
+        for hint in results:
+            item_id = hint.get('Id')
+            parts.append(f"- {hint.get('Name')} ({hint.get('Type')})\n")
+            if item_id:
+                parts.append(f"  ID: {item_id}\n")
+        send_telegram("".join(parts) if results else "Nenhum resultado encontrado.", chat_id, parse_mode=None)
+    except Exception as e:
+        send_telegram(f"❌ Erro na busca Jellyfin: {str(e)}", chat_id)
+
+def _handle_jfrecent(jf, text, args, chat_id):
+    """Mostra adições recentes"""
+    try:
+        # Argumentos: "/jfrecent [tipo] [limit=N]"
+        parts = args.split()
+        item_type = parts[0] if parts and '=' not in parts[0] else None
+        
+        # Define o limite padrão
+        limit = 10
+        # Verifica se há um limite especificado
+        for part in parts:
+            if part.startswith('limit=') and part[6:].isdigit():
+                limit = min(int(part[6:]), 20)  # Limita a 20 itens no máximo
+                break
+        
+        recent_items = jf.get_recently_added(limit=limit, include_item_types=item_type)
+        
+        if not recent_items:
+            send_telegram("Nenhum item recente encontrado.", chat_id)
+            return
+            
+        parts = [f"<b>Adições recentes{' de ' + html.escape(item_type) if item_type else ''}:</b>\n\n"]
+        
+        for item in recent_items:
+            parts.append(format_item_info(item) + "\n")
+            
+        send_telegram("".join(parts), chat_id)
+    except Exception as e:
+        send_telegram(f"❌ Erro ao obter itens recentes: {str(e)}", chat_id)
+
+def _handle_jfinfo(jf, text, args, chat_id):
+    """Informações do servidor"""
+    try:
+        info = jf.get_system_info()
+        if not info:
+            send_telegram("❌ Não foi possível conectar ao servidor Jellyfin. Verifique se o servidor está online.", chat_id)
+            return
+        parts = [
+            "<b>Informações do Servidor:</b>\n",
+            f"Nome: {info.get('ServerName', 'N/A')}\n",
+            f"Versão: {info.get('Version', 'N/A')}\n",
+            f"Sistema Operacional: {info.get('OperatingSystem', 'N/A')}\n",
+            f"Arquitetura: {info.get('SystemArchitecture', 'N/A')}\n",
+        ]
+
+        # Informações de usuários (requer admin)
+        users = jf.get_users()
+        if users:
+            parts.append(f"Usuários: {len(users)}\n")
+
+        send_telegram("".join(parts), chat_id)
+    except Exception as e:
+        send_telegram(f"❌ Erro ao obter informações do servidor: {str(e)}", chat_id)
+        logger.error(f"Erro no comando /jfinfo: {e}")
+        # O traceback completo só é montado com DEBUG ligado (um servidor fora do ar repetiria o mesmo)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Erro detalhado no comando /jfinfo: {traceback.format_exc()}")
+
+def _handle_jfitem(jf, text, args, chat_id):
+    """Detalhes de um item específico"""
+    item_id = args
+    if not item_id:
+        send_telegram("❌ Use: /jfitem <id>", chat_id)
+        return
+    try:
+        item = jf.get_item_details(item_id)
+        if not item:
+            send_telegram("❌ Item não encontrado.", chat_id)
+            return
+        parts = ["<b>Detalhes do Item:</b>\n\n", format_item_info(item)]
+        
+        # Adiciona informações extras
+        if item.get('Genres'):
+            parts.append(f"Gêneros: {html.escape(', '.join(item.get('Genres')))}\n")
+        if item.get('Studios'):
+            studios = [studio.get('Name') for studio in item.get('Studios', [])]
+            parts.append(f"Estúdios: {html.escape(', '.join(studios))}\n")
+        if item.get('CommunityRating'):
+            parts.append(f"Avaliação: {item.get('CommunityRating')}/10\n")
             
-            # Define o limite padrão
-            limit = 10
-            # Verifica se há um limite especificado
-            limit_match = re.search(r'\blimit=(\d+)', text)
-            if limit_match:
-                limit = int(limit_match.group(1))
-                limit = min(limit, 20)  # Limita a 20 itens no máximo
+        send_telegram("".join(parts), chat_id)
+    except Exception as e:
+        send_telegram(f"❌ Erro ao obter detalhes do item: {str(e)}", chat_id)
+
+def _handle_jfsessions(jf, text, args, chat_id):
+    """Lista sessões ativas (requer admin)"""
+    try:
+        sessions = jf.get_sessions()
+        if not sessions:
+            send_telegram("Nenhuma sessão ativa no momento.", chat_id)
+            return
             
-            recent_items = jf.get_recently_added(limit=limit, include_item_types=item_type)
+        parts = ["▶️ Sessões Ativas:\n\n"]
+        
+        for session in sessions:
+            user_name = session.get('UserName', 'Desconhecido')
+            device_name = session.get('DeviceName', 'Dispositivo desconhecido')
+            client = session.get('Client', 'Cliente desconhecido')
             
-            if not recent_items:
-                send_telegram("Nenhum item recente encontrado.", chat_id)
-                return True
-                
-            msg = f"<b>Adições recentes{' de ' + item_type if item_type else ''}:</b>\n\n"
+            parts.append(f"Usuário: {user_name}\n")
+            parts.append(f"Dispositivo: {device_name}\n")
+            parts.append(f"Cliente: {client}\n")
             
-            for item in recent_items:
-                msg += format_item_info(item) + "\n"
+            # Verifica se está reproduzindo algo
+            now_playing = session.get('NowPlayingItem')
+            if now_playing:
+                parts.append(f"Reproduzindo: {now_playing.get('Name')}\n")
                 
-            send_telegram(msg, chat_id)
-        except Exception as e:
-            send_telegram(f"❌ Erro ao obter itens recentes: {str(e)}", chat_id)
-        return True
+            parts.append("\n")
+            
+        send_telegram("".join(parts), chat_id, parse_mode=None)
+    except Exception as e:
+        send_telegram(f"❌ Erro ao listar sessões: {str(e)}", chat_id)
+
+# Comando (primeira palavra da mensagem) -> handler(jf, text, args, chat_id)
+_COMMANDS = {
+    "/jflib": _handle_jflib,
+    "/jfsearch": _handle_jfsearch,
+    "/jfrecent": _handle_jfrecent,
+    "/jfinfo": _handle_jfinfo,
+    "/jfitem": _handle_jfitem,
+    "/jfsessions": _handle_jfsessions,
+}
+
+def process_jellyfin_command(text, chat_id):
+    if not text.startswith("/jf"):
+        return False
     
-    # Informações do servidor
-    if text == "/jfinfo":
-        try:
-            # Verifica se a conexão com o servidor está funcionando
-            try:
-                # Tenta autenticar primeiro para garantir que a conexão está ativa
-                jf.authenticate()
-                info = jf.get_system_info()
-                msg = "<b>Informações do Servidor:</b>\n"
-                msg += f"Nome: {info.get('ServerName', 'N/A')}\n"
-                msg += f"Versão: {info.get('Version', 'N/A')}\n"
-                msg += f"Sistema Operacional: {info.get('OperatingSystem', 'N/A')}\n"
-                msg += f"Arquitetura: {info.get('SystemArchitecture', 'N/A')}\n"
-                
-                # Tenta obter informações de usuários (requer admin)
-                try:
-                    users = jf.get_users()
-                    msg += f"Usuários: {len(users)}\n"
-                except Exception:
-                    pass  # Ignora se não tiver permissão
-                    
-                send_telegram(msg, chat_id)
-            except requests.exceptions.ConnectionError:
-                send_telegram("❌ Não foi possível conectar ao servidor Jellyfin. Verifique se o servidor está online.", chat_id)
-            except requests.exceptions.HTTPError as http_err:
-                send_telegram(f"❌ Erro HTTP ao acessar o servidor: {http_err}", chat_id)
-            except requests.exceptions.Timeout:
-                send_telegram("❌ Tempo esgotado ao tentar conectar ao servidor Jellyfin.", chat_id)
-        except Exception as e:
-            send_telegram(f"❌ Erro ao obter informações do servidor: {str(e)}", chat_id)
-            # Evita que o erro seja repetido múltiplas vezes
-            import traceback
-            print(f"Erro detalhado no comando /jfinfo: {traceback.format_exc()}")
-        return True
+    cmd, _, args = text.partition(" ")
     
-    # Detalhes de um item específico
-    if text.startswith("/jfitem "):
-        item_id = text[len("/jfitem "):].strip()
-        if not item_id:
-            send_telegram("❌ Use: /jfitem <id>", chat_id)
-            return True
-        try:
-            item = jf.get_item_details(item_id)
-            msg = "<b>Detalhes do Item:</b>\n\n"
-            msg += format_item_info(item)
-            
-            # Adiciona informações extras
-            if item.get('Genres'):
-                msg += f"Gêneros: {', '.join(item.get('Genres'))}\n"
-            if item.get('Studios'):
-                studios = [studio.get('Name') for studio in item.get('Studios', [])]
-                msg += f"Estúdios: {', '.join(studios)}\n"
-            if item.get('CommunityRating'):
-                msg += f"Avaliação: {item.get('CommunityRating')}/10\n"
-                
-            send_telegram(msg, chat_id)
-        except Exception as e:
-            send_telegram(f"❌ Erro ao obter detalhes do item: {str(e)}", chat_id)
+    # Comando de ajuda (não precisa do servidor)
+    if cmd == "/jfhelp":
+        _send_help(chat_id)
         return True
     
-    # Lista sessões ativas (requer admin)
-    if text == "/jfsessions":
-        try:
-            sessions = jf.get_sessions()
-            if not sessions:
-                send_telegram("Nenhuma sessão ativa no momento.", chat_id)
-                return True
-                
-            msg = "<b>Sessões Ativas:</b>\n\n"
-            
-            for session in sessions:
-                user_name = session.get('UserName', 'Desconhecido')
-                device_name = session.get('DeviceName', 'Dispositivo desconhecido')
-                client = session.get('Client', 'Cliente desconhecido')
-                
-                msg += f"Usuário: {user_name}\n"
-                msg += f"Dispositivo: {device_name}\n"
-                msg += f"Cliente: {client}\n"
-                
-                # Verifica se está reproduzindo algo
-                now_playing = session.get('NowPlayingItem')
-                if now_playing:
-                    msg += f"Reproduzindo: {now_playing.get('Name')}\n"
-                    
-                msg += "\n"
-                
-            send_telegram(msg, chat_id)
-        except Exception as e:
-            send_telegram(f"❌ Erro ao listar sessões: {str(e)}", chat_id)
+    handler = _COMMANDS.get(cmd)
+    if handler is None:
+        return False
+    
+    jf = get_jellyfin_client()
+    if jf is None:
+        send_telegram("❌ Jellyfin não configurado.", chat_id)
         return True
-        
-    return False
+    
+    # Todos os comandos dependem do servidor: o usuário vê "digitando..." enquanto espera
+    send_chat_action(chat_id)
+    handler(jf, text, args.strip(), chat_id)
+    return True
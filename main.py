@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import time
 import os
+import signal
 import threading
 import logging
 from dotenv import load_dotenv
@@ -8,6 +9,8 @@ from src.integrations.telegram import send_telegram, process_messages, set_bot_c
 from src.integrations.jellyfin import JellyfinManager, JellyfinNotifier
 from src.integrations.whatsapp import init_waha_client, create_webhook_app
 from src.integrations.docker import DockerManager
+from src.core import bot_runner
+from src.core.bot_runner import start_daemon
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -23,7 +26,7 @@ INTERVALO = int(os.getenv('INTERVALO', 60))
 
 # Tenta importar os módulos necessários
 try:
-    from src.integrations.qbittorrent import login_qb, fetch_torrents, add_magnet, monitor_torrents
+    from src.integrations.qbittorrent import login_qb, add_magnet, monitor_torrents
     QBITTORRENT_AVAILABLE = True
 except ImportError as e:
     print(f"Aviso: Módulos do qBittorrent não encontrados. {e}")
@@ -69,8 +72,6 @@ def main():
     else:
         logger.warning("Módulos do qBittorrent não disponíveis. O bot será executado sem integração com o qBittorrent.")
     
-    last_update_id = 0
-    
     # Inicializa o gerenciador do Jellyfin
     jellyfin_notifier = None
     try:
@@ -199,107 +200,58 @@ def main():
     else:
         logger.info("WhatsApp WAHA não configurado (WAHA_URL ou WAHA_API_KEY ausentes)")
     
-    def mensagens_thread():
-        nonlocal last_update_id, sess
-        while True:
-            try:
-                last_update_id = process_messages(sess, last_update_id, add_magnet, QB_URL, jellyfin_manager, sync_manager, stats_manager, docker_manager, multi_instance_manager, gostream_manager)
-                time.sleep(1)
-            except Exception as e:
-                print(f"Erro no processamento de mensagens: {e}")
-                time.sleep(5)  # Espera 5 segundos antes de tentar novamente
-    
-    def monitor_thread():
-        if sess is not None and QBITTORRENT_AVAILABLE:
-            try:
-                monitor_torrents(sess, QB_URL, send_telegram, INTERVALO)
-            except Exception as e:
-                print(f"Erro no monitoramento de torrents: {e}")
-    
-    def jellyfin_notifier_thread():
-        if jellyfin_notifier is not None:
-            try:
-                jellyfin_notifier.start_monitoring()
-            except Exception as e:
-                logger.error(f"Erro no monitoramento do Jellyfin: {e}")
-    
-    def sync_manager_thread():
-        if sync_manager is not None:
-            try:
-                sync_manager.start()
-                while True:
-                    time.sleep(1)
-            except Exception as e:
-                logger.error(f"Erro no SyncManager: {e}")
-    
-    def stats_recorder_thread():
-        if stats_manager is not None:
-            try:
-                while True:
-                    stats_manager.record_bandwidth()
-                    time.sleep(60)
-            except Exception as e:
-                logger.error(f"Erro no StatisticsManager: {e}")
-    
-    def flask_webhook_thread():
-        if flask_app is not None:
-            try:
-                logger.info("Iniciando servidor Flask para webhooks WhatsApp na porta 5000")
-                flask_app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
-            except Exception as e:
-                logger.error(f"Erro no servidor Flask: {e}")
-    
+    # Sinalizado no SIGTERM (docker stop) ou no Ctrl+C; a thread principal só espera por ele
+    shutdown = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: shutdown.set())
+
     # Inicia as threads
     threads = []
-    
+
     # Thread de processamento de mensagens Telegram
-    t1 = threading.Thread(target=mensagens_thread, daemon=True)
-    threads.append(t1)
-    t1.start()
-    
+    start_daemon(
+        threads, bot_runner.message_loop, shutdown, process_messages,
+        sess, add_magnet if QBITTORRENT_AVAILABLE else None, QB_URL, jellyfin_manager, sync_manager, stats_manager,
+        docker_manager, multi_instance_manager, gostream_manager,
+    )
+
     # Thread de monitoramento de torrents (apenas se qBittorrent estiver disponível)
     if QBITTORRENT_AVAILABLE and sess is not None:
-        t2 = threading.Thread(target=monitor_thread, daemon=True)
-        threads.append(t2)
-        t2.start()
-    
+        start_daemon(threads, bot_runner.torrent_monitor_loop, monitor_torrents, sess, QB_URL, send_telegram, INTERVALO)
+
     # Thread de notificações do Jellyfin (apenas se habilitado)
     if jellyfin_notifier is not None:
-        t3 = threading.Thread(target=jellyfin_notifier_thread, daemon=True)
-        threads.append(t3)
-        t3.start()
+        start_daemon(threads, bot_runner.jellyfin_notifier_loop, jellyfin_notifier)
         logger.info("Thread de notificações do Jellyfin iniciada")
-    
+
     # Thread do servidor Flask para webhooks WhatsApp (apenas se WAHA estiver configurado)
     if flask_app is not None:
-        t4 = threading.Thread(target=flask_webhook_thread, daemon=True)
-        threads.append(t4)
-        t4.start()
+        start_daemon(threads, bot_runner.flask_webhook_loop, flask_app)
         logger.info("Thread do servidor Flask para WhatsApp iniciada")
-    
-    # Thread do SyncManager (v0.0.1.7-alpha)
+
+    # SyncManager (v0.0.1.7-alpha): start() já cria a própria thread de sincronização
     if sync_manager is not None:
-        t5 = threading.Thread(target=sync_manager_thread, daemon=True)
-        threads.append(t5)
-        t5.start()
-        logger.info("Thread do SyncManager iniciada")
-    
+        try:
+            sync_manager.start()
+        except Exception as e:
+            logger.error(f"Erro no SyncManager: {e}")
+
     # Thread do StatisticsManager (v0.0.1.7-alpha)
     if stats_manager is not None:
-        t6 = threading.Thread(target=stats_recorder_thread, daemon=True)
-        threads.append(t6)
-        t6.start()
+        start_daemon(threads, bot_runner.stats_recorder_loop, shutdown, stats_manager)
         logger.info("Thread do StatisticsManager iniciada")
-    
-    # Mantém o programa em execução
+
+    # Mantém o programa em execução até o SIGTERM ou Ctrl+C, sem acordar a cada segundo
     try:
-        while True:
-            time.sleep(1)
+        shutdown.wait()
     except KeyboardInterrupt:
-        print("\nEncerrando o bot...")
+        shutdown.set()
     except Exception as e:
         logger.error(f"Erro inesperado: {e}")
     finally:
+        print("\nEncerrando o bot...")
+        if jellyfin_manager:
+            jellyfin_manager.close()
+
         # Para GoStream se estiver rodando
         if gostream_manager:
             try:
@@ -2,7 +2,6 @@ import logging
 from typing import Optional
 from src.integrations.telegram.client import send_telegram
 from src.integrations.docker import DockerManager
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -14,29 +13,35 @@ def format_containers_list(containers: list) -> str:
     running = [c for c in containers if c['status'] == 'running']
     stopped = [c for c in containers if c['status'] != 'running']
     
-    text = f"🐳 <b>Containers Docker</b>\n\n"
+    lines = ["🐳 <b>Containers Docker</b>\n\n"]
     
     if running:
-        text += "▶️ <b>Em execução:</b>\n"
-        for c in running:
-            text += f"  • <code>{c['name']}</code>\n"
-            text += f"    ID: <code>{c['id']}</code>\n"
-            text += f"    Imagem: {c['image']}\n\n"
+        lines.append("▶️ <b>Em execução:</b>\n")
+        lines.extend(
+            f"  • <code>{c['name']}</code>\n"
+            f"    ID: <code>{c['id']}</code>\n"
+            f"    Imagem: {c['image']}\n\n"
+            for c in running
+        )
     
     if stopped:
-        text += "⏸️ <b>Parados:</b>\n"
+        lines.append("⏸️ <b>Parados:</b>\n")
         for c in stopped:
             status_emoji = "⏹️" if c['status'] == 'exited' else "⚠️"
-            text += f"  {status_emoji} <code>{c['name']}</code>\n"
-            text += f"    ID: <code>{c['id']}</code>\n"
-            text += f"    Status: {c['status']}\n"
-            text += f"    Imagem: {c['image']}\n\n"
+            lines.append(
+                f"  {status_emoji} <code>{c['name']}</code>\n"
+                f"    ID: <code>{c['id']}</code>\n"
+                f"    Status: {c['status']}\n"
+                f"    Imagem: {c['image']}\n\n"
+            )
     
-    text += f"\n📊 <b>Total:</b> {len(containers)} containers"
-    text += f"\n✅ <b>Ativos:</b> {len(running)}"
-    text += f"\n⏸️ <b>Parados:</b> {len(stopped)}"
+    lines.append(
+        f"\n📊 <b>Total:</b> {len(containers)} containers"
+        f"\n✅ <b>Ativos:</b> {len(running)}"
+        f"\n⏸️ <b>Parados:</b> {len(stopped)}"
+    )
     
-    return text
+    return "".join(lines)
 
 
 def handle_docker_list_command(docker_manager: Optional[DockerManager], chat_id: int):
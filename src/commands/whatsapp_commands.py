@@ -2,6 +2,7 @@
 Módulo para processar comandos WhatsApp via WAHA
 """
 import logging
+import traceback
 from typing import Optional
 from src.integrations.whatsapp.utils import send_whatsapp, is_authorized_whatsapp
 
@@ -22,6 +23,7 @@ def process_whatsapp_message(message_data: dict, sess, add_magnet_func, qb_url:
 
         logger.info(f"Processando mensagem WhatsApp de {from_number}: {text}")
         is_authorized = is_authorized_whatsapp(from_number)
+        cmd = text.split(None, 1)[0]
 
         if text == "/start" or text.lower() in ("ajuda", "/ajuda"):
             handle_start_command(chat_id)
@@ -32,43 +34,17 @@ def process_whatsapp_message(message_data: dict, sess, add_magnet_func, qb_url:
                 send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
             else:
                 handle_list_torrents_command(chat_id, sess, qb_url)
-        elif text == "/status":
-            handle_status_command(chat_id, jellyfin_manager)
-        elif text.startswith("/recentes"):
-            if not is_authorized:
-                send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
-            else:
-                handle_recentes_command(chat_id, jellyfin_manager)
-        elif text.startswith("/recent"):
-            if not is_authorized:
-                send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
-            else:
-                handle_recent_command(chat_id, jellyfin_manager)
-        elif text.startswith("/libraries"):
-            if not is_authorized:
-                send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
-            else:
-                handle_libraries_command(chat_id, jellyfin_manager)
-        elif text.startswith("/ytsbr_baixar"):
-            if not is_authorized:
-                send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
-            else:
-                handle_ytsbr_download_command(text, chat_id, from_number, add_magnet_func, sess, qb_url)
-        elif text.startswith("/ytsbr_series"):
-            if not is_authorized:
-                send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
-            else:
-                handle_ytsbr_series_command(text, chat_id, from_number, add_magnet_func, sess, qb_url)
-        elif text.startswith("/ytsbr_anime"):
-            if not is_authorized:
+        elif cmd in _JELLYFIN_COMMANDS:
+            requires_auth, handler = _JELLYFIN_COMMANDS[cmd]
+            if requires_auth and not is_authorized:
                 send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
             else:
-                handle_ytsbr_anime_command(text, chat_id, from_number, add_magnet_func, sess, qb_url)
-        elif text.startswith("/ytsbr"):
+                handler(chat_id, jellyfin_manager)
+        elif cmd in _YTSBR_COMMANDS:
             if not is_authorized:
                 send_whatsapp("❌ Você não tem permissão para executar este comando.", chat_id)
             else:
-                handle_ytsbr_command(text, chat_id, from_number, add_magnet_func, sess, qb_url)
+                _YTSBR_COMMANDS[cmd](text, chat_id, from_number, add_magnet_func, sess, qb_url)
         else:
             send_whatsapp("❓ Comando não reconhecido.\n\nEnvie /start para ver os comandos disponíveis.", chat_id)
 
@@ -76,7 +52,6 @@ def process_whatsapp_message(message_data: dict, sess, add_magnet_func, qb_url:
 
     except Exception as e:
         logger.error(f"Erro ao processar mensagem WhatsApp: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         return False
 
@@ -121,20 +96,19 @@ def handle_disk_space_command(chat_id: str, sess, qb_url: str):
 
 def handle_list_torrents_command(chat_id: str, sess, qb_url: str):
     try:
-        from src.integrations.qbittorrent.client import fetch_torrents, format_bytes
+        from src.integrations.qbittorrent.client import fetch_torrents
         torrents = fetch_torrents(sess, qb_url)
         if not torrents:
             send_whatsapp("📭 Nenhum torrent encontrado.", chat_id)
             return
-        message = f"📦 *Torrents ({len(torrents)} total):*\n\n"
-        for t in torrents[:10]:
-            name = t.get('name', 'Sem nome')[:40]
-            state = t.get('state', 'N/A')
-            progress = t.get('progress', 0) * 100
-            message += f"• {name}\n  Estado: {state} | {progress:.1f}%\n"
+        lines = [f"📦 *Torrents ({len(torrents)} total):*\n\n"]
+        lines.extend(
+            f"• {t.get('name', 'Sem nome')[:40]}\n  Estado: {t.get('state', 'N/A')} | {t.get('progress', 0) * 100:.1f}%\n"
+            for t in torrents[:10]
+        )
         if len(torrents) > 10:
-            message += f"\n... e mais {len(torrents) - 10} torrents"
-        send_whatsapp(message, chat_id)
+            lines.append(f"\n... e mais {len(torrents) - 10} torrents")
+        send_whatsapp("".join(lines), chat_id)
     except Exception as e:
         logger.error(f"Erro ao listar torrents: {e}")
         send_whatsapp("❌ Erro ao listar torrents.", chat_id)
@@ -169,16 +143,12 @@ def handle_recent_command(chat_id: str, jellyfin_manager):
     try:
         items = jellyfin_manager.get_recently_added(limit=10)
         if items:
-            message = "🎬 *Itens Recentes:*\n\n"
+            lines = ["🎬 *Itens Recentes:*\n\n"]
             for item in items:
-                name = item.get('Name', 'Sem nome')
-                year = item.get('ProductionYear', '')
-                item_type = item.get('Type', 'N/A')
-                message += f"• {name}"
-                if year:
-                    message += f" ({year})"
-                message += f" - {item_type}\n"
-            send_whatsapp(message, chat_id)
+                year = item.get('ProductionYear')
+                year_text = f" ({year})" if year else ""
+                lines.append(f"• {item.get('Name', 'Sem nome')}{year_text} - {item.get('Type', 'N/A')}\n")
+            send_whatsapp("".join(lines), chat_id)
         else:
             send_whatsapp("📭 Nenhum item recente encontrado.", chat_id)
     except Exception as e:
@@ -214,11 +184,9 @@ def handle_libraries_command(chat_id: str, jellyfin_manager):
     try:
         libraries = jellyfin_manager.get_libraries()
         if libraries:
-            message = "📚 *Bibliotecas Disponíveis:*\n\n"
-            for lib in libraries:
-                name = lib.get('Name', 'Sem nome')
-                lib_type = lib.get('CollectionType', 'N/A')
-                message += f"• {name} ({lib_type})\n"
+            message = "📚 *Bibliotecas Disponíveis:*\n\n" + "".join(
+                f"• {lib.get('Name', 'Sem nome')} ({lib.get('CollectionType', 'N/A')})\n" for lib in libraries
+            )
             send_whatsapp(message, chat_id)
         else:
             send_whatsapp("📭 Nenhuma biblioteca encontrada.", chat_id)
@@ -281,3 +249,20 @@ def handle_ytsbr_download_command(text: str, chat_id: str, user_id: str, add_mag
     except Exception as e:
         logger.error(f"Erro no comando YTSBR download: {e}")
         send_whatsapp("❌ Erro ao processar download.", chat_id)
+
+
+# Primeira palavra da mensagem -> (exige autorização, handler(chat_id, jellyfin_manager))
+_JELLYFIN_COMMANDS = {
+    "/status": (False, handle_status_command),
+    "/recent": (True, handle_recent_command),
+    "/recentes": (True, handle_recentes_command),
+    "/libraries": (True, handle_libraries_command),
+}
+
+# Primeira palavra da mensagem -> handler(text, chat_id, user_id, add_magnet_func, sess, qb_url); todos exigem autorização
+_YTSBR_COMMANDS = {
+    "/ytsbr": handle_ytsbr_command,
+    "/ytsbr_series": handle_ytsbr_series_command,
+    "/ytsbr_anime": handle_ytsbr_anime_command,
+    "/ytsbr_baixar": handle_ytsbr_download_command,
+}
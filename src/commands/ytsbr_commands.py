@@ -16,6 +16,9 @@ def format_ytsbr_result(item: dict, index: int) -> str:
     return f"{index}. {type_emoji} *{title}*\n   ⭐ {rating}\n   🔗 {url}\n"
 
 
+_DOWNLOAD_HINT = "\n💡 *Para baixar:* `/ytsbr_baixar [número]`\n*Exemplo:* `/ytsbr_baixar 1`"
+
+
 def format_quality_info(quality_list: list) -> str:
     if not quality_list:
         return ""
@@ -65,11 +68,10 @@ def handle_ytsbr_search(query: str, media_type: str, chat_id: str, user_id: str
             return
         if user_id:
             _user_search_cache[user_id] = results
-        message = f"📋 *Resultados para '{query}':*\n\n"
-        for i, item in enumerate(results, 1):
-            message += format_ytsbr_result(item, i)
-        message += "\n💡 *Para baixar:* `/ytsbr_baixar [número]`\n"
-        message += "*Exemplo:* `/ytsbr_baixar 1`"
+        lines = [f"📋 *Resultados para '{query}':*\n\n"]
+        lines.extend(format_ytsbr_result(item, i) for i, item in enumerate(results, 1))
+        lines.append(_DOWNLOAD_HINT)
+        message = "".join(lines)
         send_telegram(message, chat_id, parse_mode="Markdown", use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao buscar no YTS Brasil: {e}")
@@ -141,11 +143,10 @@ def handle_ytsbr_popular(media_type: str, chat_id: str, user_id: str = None):
             return
         if user_id:
             _user_search_cache[user_id] = results
-        message = f"🔥 *{type_name} Populares:*\n\n"
-        for i, item in enumerate(results, 1):
-            message += format_ytsbr_result(item, i)
-        message += "\n💡 *Para baixar:* `/ytsbr_baixar [número]`\n"
-        message += "*Exemplo:* `/ytsbr_baixar 1`"
+        lines = [f"🔥 *{type_name} Populares:*\n\n"]
+        lines.extend(format_ytsbr_result(item, i) for i, item in enumerate(results, 1))
+        lines.append(_DOWNLOAD_HINT)
+        message = "".join(lines)
         send_telegram(message, chat_id, parse_mode="Markdown", use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao obter populares do YTS Brasil: {e}")
@@ -195,11 +196,10 @@ def handle_ytsbr_by_genre(genre: str, media_type: str, chat_id: str, user_id: st
             return
         if user_id:
             _user_search_cache[user_id] = results
-        message = f"🎭 *{type_name} - {genre_display}:*\n\n"
-        for i, item in enumerate(results, 1):
-            message += format_ytsbr_result(item, i)
-        message += "\n💡 *Para baixar:* `/ytsbr_baixar [número]`\n"
-        message += "*Exemplo:* `/ytsbr_baixar 1`"
+        lines = [f"🎭 *{type_name} - {genre_display}:*\n\n"]
+        lines.extend(format_ytsbr_result(item, i) for i, item in enumerate(results, 1))
+        lines.append(_DOWNLOAD_HINT)
+        message = "".join(lines)
         send_telegram(message, chat_id, parse_mode="Markdown", use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao buscar por gênero '{genre}': {e}")
@@ -0,0 +1,61 @@
+"""
+Laços das threads de trabalho do bot.
+O main.py só inicializa as integrações e entrega os objetos prontos para estas funções.
+"""
+import logging
+import threading
+from typing import Callable, List
+
+logger = logging.getLogger(__name__)
+
+
+def message_loop(shutdown: threading.Event, process_messages: Callable, sess, *handler_args) -> None:
+    """Consome os updates do Telegram até o shutdown; `handler_args` seguem o last_update_id em process_messages"""
+    last_update_id = 0
+    while not shutdown.is_set():
+        try:
+            # Long polling: a chamada já espera por updates, então não há pausa entre as consultas
+            # O backoff de erro dentro de process_messages espera no `shutdown`, sem atrasar o encerramento
+            last_update_id = process_messages(sess, last_update_id, *handler_args, shutdown=shutdown)
+        except Exception as e:
+            print(f"Erro no processamento de mensagens: {e}")
+            shutdown.wait(5)  # Espera 5 segundos antes de tentar novamente
+
+
+def torrent_monitor_loop(monitor_torrents: Callable, sess, qb_url: str, send_notification: Callable, interval: int) -> None:
+    try:
+        monitor_torrents(sess, qb_url, send_notification, interval)
+    except Exception as e:
+        print(f"Erro no monitoramento de torrents: {e}")
+
+
+def jellyfin_notifier_loop(jellyfin_notifier) -> None:
+    try:
+        jellyfin_notifier.start_monitoring()
+    except Exception as e:
+        logger.error(f"Erro no monitoramento do Jellyfin: {e}")
+
+
+def stats_recorder_loop(shutdown: threading.Event, stats_manager) -> None:
+    try:
+        while not shutdown.is_set():
+            stats_manager.record_bandwidth()
+            shutdown.wait(60)
+    except Exception as e:
+        logger.error(f"Erro no StatisticsManager: {e}")
+
+
+def flask_webhook_loop(flask_app) -> None:
+    try:
+        logger.info("Iniciando servidor Flask para webhooks WhatsApp na porta 5000")
+        flask_app.run(host='0.0.0.0', port=5000, debug=False, use_reloader=False)
+    except Exception as e:
+        logger.error(f"Erro no servidor Flask: {e}")
+
+
+def start_daemon(threads: List[threading.Thread], target: Callable, *args) -> threading.Thread:
+    """Inicia `target(*args)` numa thread daemon e a registra em `threads`"""
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    threads.append(thread)
+    thread.start()
+    return thread
@@ -57,7 +57,8 @@ QB_MULTI_INSTANCE_ENABLED = len(QB_INSTANCES_LIST) > 1
 # Telegram
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
-AUTHORIZED_USERS = [uid.strip() for uid in os.getenv('AUTHORIZED_USERS', '').split(',') if uid.strip()]
+# frozenset: a checagem de autorização roda a cada update, e `in` fica O(1)
+AUTHORIZED_USERS = frozenset(uid.strip() for uid in os.getenv('AUTHORIZED_USERS', '').split(',') if uid.strip())
 EXPIRAR_MSG = int(os.getenv('EXPIRAR_MSG', 30))
 
 # Jellyfin - Configuração Unificada (suporta uma ou múltiplas contas)
@@ -75,7 +76,7 @@ JELLYFIN_NOTIFICATION_INTERVAL = int(os.getenv('JELLYFIN_NOTIFICATION_INTERVAL',
 
 def parse_jellyfin_accounts():
     """Parse Jellyfin accounts from comma-separated environment variables"""
-    urls = [u.strip() for u in JELLYFIN_URL.split(',') if u.strip()]
+    urls = [u.strip().rstrip('/') for u in JELLYFIN_URL.split(',') if u.strip()]
     usernames = [u.strip() for u in JELLYFIN_USERNAME.split(',') if u.strip()]
     passwords = [p.strip() for p in JELLYFIN_PASSWORD.split(',') if p.strip()]
     api_keys = [k.strip() for k in JELLYFIN_API_KEY.split(',') if k.strip()]
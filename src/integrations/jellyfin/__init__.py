@@ -1,11 +1,12 @@
 from .client import JellyfinClient
-from .formatter import JellyfinFormatter
+from .formatter import JellyfinFormatter, ItemInfo
 from .manager import JellyfinManager
 from .notifier import JellyfinNotifier
 
 __all__ = [
     "JellyfinClient",
     "JellyfinFormatter",
+    "ItemInfo",
     "JellyfinManager",
     "JellyfinNotifier",
 ]
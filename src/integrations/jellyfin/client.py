@@ -1,70 +1,298 @@
-import asyncio
 import aiohttp
 import requests
 import logging
-from typing import Optional, List, Dict
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Optional, List, Dict, Iterator, Tuple
+from src.utils.cache import TTLCache
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Só anuncia brotli quando há decodificador instalado (urllib3/aiohttp usam brotli ou brotlicffi)
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'br, gzip, deflate'
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = 'br, gzip, deflate'
+    except ImportError:
+        ACCEPT_ENCODING = 'gzip, deflate'
 
 logger = logging.getLogger(__name__)
 
+# Campos extras lidos pelos formatadores/notificador; o resto do DTO não é solicitado
+ITEM_FIELDS = 'Overview,Genres,ProductionYear,CommunityRating,DateCreated'
+AUTH_ENDPOINT = '/Users/authenticatebyname'
+JSON_CONTENT_TYPE = {'Content-Type': 'application/json'}
+LIST_QUERY_PARAMS = {
+    'Fields': ITEM_FIELDS,
+    'EnableImages': 'false',
+    'EnableUserData': 'false',
+    'EnableTotalRecordCount': 'false',
+}
+SEARCH_QUERY_PARAMS = {
+    'Recursive': 'true',
+    'IncludeItemTypes': 'Movie,Series,Episode',
+    **LIST_QUERY_PARAMS,
+}
+
+
+def _build_session() -> requests.Session:
+    """Session compartilhada: pool maior e retry com backoff para erros transitórios de gateway"""
+    session = requests.Session()
+    # Só GET é repetido: um POST (autenticação, /Library/Refresh) pode já ter sido executado pelo servidor
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+    )
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Os headers de autenticação vão em cada requisição, então todas as contas podem usar a mesma Session
+_SESSION = _build_session()
+
 
 class JellyfinClient:
     """Cliente unificado para interação com Jellyfin (síncrono e assíncrono)"""
 
+    __slots__ = (
+        'url', 'username', 'password', 'api_key', 'session', '_aio_session',
+        'access_token', 'user_id', '_auth_headers', '_response_cache', '_etag_cache', '_endpoints',
+        '_revalidating', '_revalidating_lock',
+    )
+
+    # TTL (segundos) das respostas de GET idempotentes mantidas em cache
+    LIBRARIES_TTL = 300
+    SYSTEM_INFO_TTL = 60
+    RECENT_ITEMS_TTL = 30
+    ITEM_DETAILS_TTL = 300
+    # Janela extra em que a resposta vencida ainda é servida enquanto é renovada em segundo plano
+    LIBRARIES_STALE_TTL = 3600
+    ITEM_DETAILS_STALE_TTL = 86400
+
     def __init__(self, url: str, username: str = None, password: str = None, api_key: str = None):
         self.url = url.rstrip('/')
         self.username = username
         self.password = password
         self.api_key = api_key
-        self.session = None
+        self.session = _SESSION
+        self._aio_session: Optional[aiohttp.ClientSession] = None
         self.access_token = None
         self.user_id = None
+        self._auth_headers: Optional[Dict] = None
+        self._response_cache = TTLCache()
+        # endpoint -> (ETag, corpo já decodificado) para GETs condicionais
+        self._etag_cache: Dict[str, Tuple[str, Any]] = {}
+        # Chaves com renovação em andamento (evita várias threads para a mesma resposta)
+        self._revalidating = set()
+        self._revalidating_lock = threading.Lock()
+        self._build_endpoints()
 
-    def _make_request(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> Optional[Dict]:
-        if not self.session:
-            self.session = requests.Session()
+    def _build_endpoints(self) -> None:
+        """Pré-calcula os caminhos dependentes do usuário (recalculado após autenticar)"""
+        prefix = f'/Users/{self.user_id}' if self.user_id else ''
+        self._endpoints = {
+            'items': f'{prefix}/Items',
+            'item': f'{prefix}/Items/{{item_id}}',
+            'latest': f'{prefix}/Items/Latest',
+        }
 
-        headers = {'Content-Type': 'application/json'}
-        if self.api_key:
-            headers['X-Emby-Token'] = self.api_key
-        elif self.access_token:
-            headers['X-Emby-Token'] = self.access_token
+    async def __aenter__(self) -> "JellyfinClient":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._aio_session is None or self._aio_session.closed:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75,
+                                             enable_cleanup_closed=True)
+            timeout = aiohttp.ClientTimeout(total=30)
+            self._aio_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._aio_session
+
+    async def aclose(self) -> None:
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()
+        self._aio_session = None
+
+    def _get_auth_headers(self) -> Dict:
+        if self._auth_headers is None:
+            headers = {'Accept-Encoding': ACCEPT_ENCODING}
+            token = self.api_key or self.access_token
+            if token:
+                headers['X-Emby-Token'] = token
+            self._auth_headers = headers
+        return self._auth_headers
+
+    def _send(self, method: str, endpoint: str, params: Dict = None, data: Dict = None,
+              stream: bool = False, extra_headers: Dict = None, retry_auth: bool = True) -> requests.Response:
+        """Executa a requisição síncrona; em 401 renova o token uma vez e repete"""
+        body = _json_dumps(data) if data is not None else None
+        headers = self._get_auth_headers()
+        if body is not None:
+            # Content-Type só faz sentido quando há corpo (POST)
+            headers = {**headers, **JSON_CONTENT_TYPE}
+        if extra_headers:
+            headers = {**headers, **extra_headers}
+        response = self.session.request(
+            method, f"{self.url}{endpoint}", headers=headers,
+            params=params, data=body, timeout=30, stream=stream,
+        )
+        if response.status_code == 401:
+            self._auth_headers = None
+            if retry_auth and not self.api_key and endpoint != AUTH_ENDPOINT:
+                self.access_token = None
+                if self.authenticate():
+                    response.close()
+                    return self._send(method, endpoint, params, data, stream, extra_headers, retry_auth=False)
+        response.raise_for_status()
+        return response
+
+    def _make_request(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None,
+                      cache_ttl: float = None, conditional: bool = False, stale_ttl: float = 0.0,
+                      revalidate: bool = False) -> Optional[Dict]:
+        method = method.upper()
+        cache_key = None
+        if cache_ttl and method == 'GET':
+            cache_key = (endpoint, tuple(sorted(params.items())) if params else ())
+            cached, fresh = (None, False) if revalidate else self._response_cache.lookup(cache_key)
+            if cached is not None:
+                if not fresh:
+                    self._revalidate_in_background(cache_key, endpoint, params, cache_ttl, conditional, stale_ttl)
+                return cached
+
+        # GET condicional: o servidor responde 304 sem corpo se o recurso não mudou
+        etag_entry = self._etag_cache.get(endpoint) if conditional and method == 'GET' else None
+        extra_headers = {'If-None-Match': etag_entry[0]} if etag_entry else None
 
-        url = f"{self.url}{endpoint}"
         try:
-            if method.upper() == 'GET':
-                response = self.session.get(url, headers=headers, params=params, timeout=30)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, headers=headers, json=data, timeout=30)
+            response = self._send(method, endpoint, params=params, data=data, extra_headers=extra_headers)
+            if response.status_code == 304 and etag_entry:
+                result = etag_entry[1]
             else:
-                raise ValueError(f"Método HTTP não suportado: {method}")
-            response.raise_for_status()
-            return response.json() if response.content else {}
+                result = _json_loads(response.content) if response.content else {}
+                etag = response.headers.get('ETag') if conditional else None
+                if etag:
+                    self._etag_cache[endpoint] = (etag, result)
         except requests.exceptions.RequestException as e:
-            logger.error(f"Erro na requisição para {url}: {e}")
+            logger.error(f"Erro na requisição para {self.url}{endpoint}: {e}")
             return None
         except Exception as e:
             logger.error(f"Erro inesperado: {e}")
             return None
 
-    async def _make_async_request(self, session: aiohttp.ClientSession, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None) -> Optional[Dict]:
-        headers = {'Content-Type': 'application/json'}
-        if self.api_key:
-            headers['X-Emby-Token'] = self.api_key
-        elif self.access_token:
-            headers['X-Emby-Token'] = self.access_token
+        if cache_key is not None:
+            self._response_cache.set(cache_key, result, cache_ttl, stale_ttl)
+        elif method != 'GET':
+            # Operações de escrita (ex.: /Library/Refresh) podem alterar o conteúdo
+            self._response_cache.clear()
+            self._etag_cache.clear()
+        return result
 
+    def _revalidate_in_background(self, cache_key, endpoint: str, params: Dict, cache_ttl: float,
+                                  conditional: bool, stale_ttl: float) -> None:
+        """Stale-while-revalidate: renova a entrada vencida sem bloquear quem já recebeu a cópia antiga"""
+        with self._revalidating_lock:
+            if cache_key in self._revalidating:
+                return
+            self._revalidating.add(cache_key)
+
+        def _run():
+            try:
+                self._make_request(endpoint, params=params, cache_ttl=cache_ttl, conditional=conditional,
+                                   stale_ttl=stale_ttl, revalidate=True)
+            finally:
+                with self._revalidating_lock:
+                    self._revalidating.discard(cache_key)
+
+        threading.Thread(target=_run, name='jellyfin-revalidate', daemon=True).start()
+
+    def _get(self, endpoint: str, params: Dict = None, cache_ttl: float = None, conditional: bool = False,
+             stale_ttl: float = 0.0) -> Optional[Dict]:
+        return self._make_request(endpoint, params=params, cache_ttl=cache_ttl, conditional=conditional,
+                                  stale_ttl=stale_ttl)
+
+    def _post(self, endpoint: str, data: Dict = None) -> Optional[Dict]:
+        return self._make_request(endpoint, 'POST', data=data)
+
+    def _iter_items(self, endpoint: str, params: Dict = None, prefix: str = 'Items.item') -> Iterator[Dict]:
+        """Percorre o array da resposta sem materializar o JSON inteiro (via ijson)
+
+        `prefix` segue a sintaxe do ijson: 'Items.item' para QueryResult, 'item' para array puro.
+        """
+        try:
+            with self._send('GET', endpoint, params=params, stream=True) as response:
+                if ijson is None:
+                    result = _json_loads(response.content) if response.content else {}
+                    yield from (result.get('Items', []) if prefix == 'Items.item' else result or [])
+                    return
+                response.raw.decode_content = True
+                yield from ijson.items(response.raw, prefix, use_float=True)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Erro na requisição para {self.url}{endpoint}: {e}")
+        except Exception as e:
+            logger.error(f"Erro inesperado: {e}")
+
+    async def _make_async_request(self, endpoint: str, method: str = 'GET', params: Dict = None, data: Dict = None,
+                                  cache_ttl: float = None) -> Optional[Dict]:
+        # Mesmo cache do caminho síncrono: /status e os comandos síncronos reaproveitam as respostas
+        cache_key = None
+        if cache_ttl and method.upper() == 'GET':
+            cache_key = (endpoint, tuple(sorted(params.items())) if params else ())
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        session = await self._ensure_session()
+        headers = self._get_auth_headers()
         url = f"{self.url}{endpoint}"
         try:
             if method.upper() == 'GET':
                 async with session.get(url, headers=headers, params=params) as response:
                     response.raise_for_status()
-                    return await response.json() if response.content_length else {}
+                    body = await response.read()
             elif method.upper() == 'POST':
-                async with session.post(url, headers=headers, json=data) as response:
+                payload = _json_dumps(data) if data is not None else None
+                if payload is not None:
+                    headers = {**headers, **JSON_CONTENT_TYPE}
+                async with session.post(url, headers=headers, data=payload) as response:
                     response.raise_for_status()
-                    return await response.json() if response.content_length else {}
+                    body = await response.read()
             else:
                 raise ValueError(f"Método HTTP não suportado: {method}")
+            # Respostas chunked não têm Content-Length; corpo vazio (ex.: 204) vira {}
+            result = _json_loads(body) if body else {}
+            if cache_key is not None:
+                self._response_cache.set(cache_key, result, cache_ttl)
+            return result
+        except aiohttp.ClientResponseError as e:
+            if e.status == 401:
+                self._auth_headers = None
+            logger.error(f"Erro na requisição assíncrona para {url}: {e}")
+            return None
         except aiohttp.ClientError as e:
             logger.error(f"Erro na requisição assíncrona para {url}: {e}")
             return None
@@ -76,80 +304,111 @@ class JellyfinClient:
         if not self.username or not self.password:
             return False
         auth_data = {'Username': self.username, 'Pw': self.password}
-        result = self._make_request('/Users/authenticatebyname', 'POST', data=auth_data)
+        result = self._post(AUTH_ENDPOINT, data=auth_data)
         if result and 'AccessToken' in result:
             self.access_token = result['AccessToken']
             self.user_id = result.get('User', {}).get('Id')
+            self._auth_headers = None
+            self._build_endpoints()
             logger.info("Autenticação no Jellyfin bem-sucedida")
             return True
         logger.error("Falha na autenticação do Jellyfin")
         return False
 
-    async def authenticate_async(self, session: aiohttp.ClientSession) -> bool:
+    async def authenticate_async(self) -> bool:
         if not self.username or not self.password:
             return False
         auth_data = {'Username': self.username, 'Pw': self.password}
-        result = await self._make_async_request(session, '/Users/authenticatebyname', 'POST', data=auth_data)
+        result = await self._make_async_request(AUTH_ENDPOINT, 'POST', data=auth_data)
         if result and 'AccessToken' in result:
             self.access_token = result['AccessToken']
             self.user_id = result.get('User', {}).get('Id')
+            self._auth_headers = None
+            self._build_endpoints()
             logger.info("Autenticação assíncrona no Jellyfin bem-sucedida")
             return True
         logger.error("Falha na autenticação assíncrona do Jellyfin")
         return False
 
     def get_system_info(self) -> Optional[Dict]:
-        return self._make_request('/System/Info')
+        return self._get('/System/Info', cache_ttl=self.SYSTEM_INFO_TTL, conditional=True)
+
+    async def get_system_info_async(self) -> Optional[Dict]:
+        return await self._make_async_request('/System/Info', cache_ttl=self.SYSTEM_INFO_TTL)
 
     def get_libraries(self) -> List[Dict]:
-        result = self._make_request('/Library/VirtualFolders')
+        result = self._get('/Library/VirtualFolders', cache_ttl=self.LIBRARIES_TTL, conditional=True,
+                           stale_ttl=self.LIBRARIES_STALE_TTL)
         return result if result else []
 
-    def get_recently_added(self, limit: int = 10) -> List[Dict]:
-        params = {
+    async def get_libraries_async(self) -> List[Dict]:
+        result = await self._make_async_request('/Library/VirtualFolders', cache_ttl=self.LIBRARIES_TTL)
+        return result if result else []
+
+    @staticmethod
+    def _recent_params(limit: int, include_item_types: str = 'Movie,Series,Episode') -> Dict:
+        return {
             'Limit': limit,
-            'Recursive': True,
-            'IncludeItemTypes': 'Movie,Series,Episode',
+            'Recursive': 'true',
+            'IncludeItemTypes': include_item_types,
             'SortBy': 'DateCreated',
             'SortOrder': 'Descending',
+            **LIST_QUERY_PARAMS,
         }
-        if self.user_id:
-            result = self._make_request(f'/Users/{self.user_id}/Items', params=params)
-        else:
-            result = self._make_request('/Items', params=params)
+
+    def get_recently_added(self, limit: int = 10, include_item_types: str = None) -> List[Dict]:
+        params = self._recent_params(limit, include_item_types or 'Movie,Series,Episode')
+        result = self._get(self._endpoints['items'], params=params, cache_ttl=self.RECENT_ITEMS_TTL)
         return result.get('Items', []) if result else []
 
-    async def get_recent_items_async(self, session: aiohttp.ClientSession, limit: int = 10) -> List[Dict]:
+    def iter_recently_added(self, limit: int = 10) -> Iterator[Dict]:
+        params = self._recent_params(limit)
+        return self._iter_items(self._endpoints['items'], params=params)
+
+    def iter_latest_items(self, limit: int = 10) -> Iterator[Dict]:
+        """Itens de /Items/Latest (episódios agrupados por série), lidos em streaming"""
+        if not self.user_id:
+            # /Items/Latest só existe no escopo de usuário
+            return self.iter_recently_added(limit)
         params = {
             'Limit': limit,
-            'Recursive': True,
             'IncludeItemTypes': 'Movie,Series,Episode',
-            'SortBy': 'DateCreated',
-            'SortOrder': 'Descending',
+            'Fields': ITEM_FIELDS,
+            'EnableImages': 'false',
+            'EnableUserData': 'false',
         }
-        if self.user_id:
-            result = await self._make_async_request(session, f'/Users/{self.user_id}/Items', params=params)
-        else:
-            result = await self._make_async_request(session, '/Items', params=params)
+        return self._iter_items(self._endpoints['latest'], params=params, prefix='item')
+
+    async def get_recent_items_async(self, limit: int = 10) -> List[Dict]:
+        params = self._recent_params(limit)
+        result = await self._make_async_request(self._endpoints['items'], params=params)
         return result.get('Items', []) if result else []
 
     def search_items(self, query: str, limit: int = 10) -> List[Dict]:
-        params = {
-            'searchTerm': query,
-            'Limit': limit,
-            'Recursive': True,
-            'IncludeItemTypes': 'Movie,Series,Episode',
-        }
-        if self.user_id:
-            result = self._make_request(f'/Users/{self.user_id}/Items', params=params)
-        else:
-            result = self._make_request('/Items', params=params)
+        params = {**SEARCH_QUERY_PARAMS, 'searchTerm': query, 'Limit': limit}
+        result = self._get(self._endpoints['items'], params=params)
         return result.get('Items', []) if result else []
 
     def get_item_details(self, item_id: str) -> Optional[Dict]:
+        return self._get(self._endpoints['item'].format(item_id=item_id), cache_ttl=self.ITEM_DETAILS_TTL,
+                         stale_ttl=self.ITEM_DETAILS_STALE_TTL)
+
+    def search_media(self, query: str, limit: int = 20) -> List[Dict]:
+        params = {'SearchTerm': query, 'Limit': limit}
         if self.user_id:
-            return self._make_request(f'/Users/{self.user_id}/Items/{item_id}')
-        return self._make_request(f'/Items/{item_id}')
+            params['UserId'] = self.user_id
+        result = self._get('/Search/Hints', params=params)
+        return result.get('SearchHints', []) if result else []
+
+    def get_users(self) -> List[Dict]:
+        """Lista os usuários do servidor (requer permissão de administrador)"""
+        result = self._get('/Users')
+        return result if result else []
+
+    def get_sessions(self) -> List[Dict]:
+        """Lista as sessões ativas (requer permissão de administrador)"""
+        result = self._get('/Sessions')
+        return result if result else []
 
     def get_web_link(self, item_id: str) -> str:
         return f"{self.url}/web/index.html#!/details?id={item_id}"
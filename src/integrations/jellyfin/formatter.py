@@ -1,38 +1,69 @@
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+from src.utils.formatters import truncate
+
+OVERVIEW_MAX_LENGTH = 200
+
+
+class ItemInfo(NamedTuple):
+    """Campos de um item do Jellyfin usados nas mensagens, extraídos uma única vez do dict da API"""
+    title: str
+    type: str
+    year: Optional[int]
+    rating: Optional[float]
+    genres: Tuple[str, ...]
+    overview: str
+    id: Optional[str]
+
+
+# Cabeçalho fixo de format_telegram_message, preenchido direto com o ItemInfo
+_HEADER_TEMPLATE = "📺 **{0.title}**\n▶️ Tipo: {0.type}\n"
+
+# Linhas opcionais de format_telegram_message, na ordem de exibição: (campo, template)
+_OPTIONAL_LINES = (
+    ('rating', "⭐ Avaliação: {}\n"),
+    ('year', "📅 Ano: {}\n"),
+)
+
+
+@lru_cache(maxsize=512)
+def _render_message(info: ItemInfo) -> str:
+    # Os mesmos itens recentes são formatados a cada /recent e a cada ciclo do notificador;
+    # a chave é o ItemInfo hashable (gêneros em tupla)
+    parts = [_HEADER_TEMPLATE.format(info)]
+    for field, template in _OPTIONAL_LINES:
+        value = getattr(info, field)
+        if value:
+            parts.append(template.format(value))
+    genres = info.genres
+    if genres:
+        parts.append(f"🎭 Gêneros: {', '.join(genres)}\n")
+    overview = info.overview
+    if overview:
+        parts.append(f"\n{truncate(overview, OVERVIEW_MAX_LENGTH)}")
+
+    return ''.join(parts).strip()
 
 
 class JellyfinFormatter:
     """Classe para formatação de dados do Jellyfin"""
 
     @staticmethod
-    def format_item_info(item: Dict) -> Dict[str, Any]:
-        return {
-            'title': item.get('Name', 'Sem título'),
-            'type': item.get('Type', 'Desconhecido'),
-            'year': item.get('ProductionYear'),
-            'rating': item.get('CommunityRating'),
-            'genres': item.get('Genres', []),
-            'overview': item.get('Overview', ''),
-            'id': item.get('Id'),
-        }
+    def format_item_info(item: Dict) -> ItemInfo:
+        get = item.get
+        return ItemInfo(
+            title=get('Name', 'Sem título'),
+            type=get('Type', 'Desconhecido'),
+            year=get('ProductionYear'),
+            rating=get('CommunityRating'),
+            # A API pode mandar "Genres": null
+            genres=tuple(get('Genres') or ()),
+            overview=get('Overview', ''),
+            id=get('Id'),
+        )
 
     @staticmethod
     def format_telegram_message(item: Dict, web_link: str = None) -> str:
         info = JellyfinFormatter.format_item_info(item)
-
-        message = f"📺 **{info['title']}**\n"
-        message += f"▶️ Tipo: {info['type']}\n"
-
-        if info['rating']:
-            message += f"⭐ Avaliação: {info['rating']}\n"
-        if info['year']:
-            message += f"📅 Ano: {info['year']}\n"
-        if info['genres']:
-            message += f"🎭 Gêneros: {', '.join(info['genres'][:3])}\n"
-        if info['overview']:
-            overview = info['overview']
-            if len(overview) > 200:
-                overview = overview[:200] + "..."
-            message += f"\n{overview}"
-
-        return message.strip()
+        # Só os 3 gêneros exibidos entram na chave do cache
+        return _render_message(info._replace(genres=(info.genres or ())[:3]))
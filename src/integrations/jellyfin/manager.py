@@ -1,21 +1,24 @@
-import os
+import asyncio
 import logging
-from typing import Optional, List, Dict
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Optional, List, Dict, Tuple
 from src.integrations.jellyfin.client import JellyfinClient
 from src.integrations.jellyfin.formatter import JellyfinFormatter
 from src.core.config import JELLYFIN_ACCOUNTS_LIST, JELLYFIN_MULTI_ACCOUNT_ENABLED
+from src.utils.async_loop import run_sync
 
-load_dotenv()
 logger = logging.getLogger(__name__)
 
 
 class JellyfinManager:
     """Gerenciador principal do Jellyfin para integração com Telegram (suporta múltiplas contas)"""
 
+    # Tempo máximo de espera do /status síncrono (o aiohttp já limita cada requisição a 30 s)
+    STATUS_TIMEOUT = 35
+
     def __init__(self):
         self.clients: List[JellyfinClient] = []
-        self.known_items = set()
         self.multi_account_enabled = JELLYFIN_MULTI_ACCOUNT_ENABLED
         
         # Inicializa clientes para cada conta configurada
@@ -42,6 +45,16 @@ class JellyfinManager:
         else:
             logger.info(f"JellyfinManager inicializado com {len(self.clients)} conta(s)")
     
+    def close(self) -> None:
+        """Fecha as sessões aiohttp dos clientes (chamado ao encerrar o bot)"""
+        async def _close_all():
+            await asyncio.gather(*(client.aclose() for client in self.clients))
+
+        try:
+            run_sync(_close_all(), timeout=5)
+        except Exception as e:
+            logger.error(f"Erro ao fechar sessões do Jellyfin: {e}")
+
     @property
     def client(self) -> Optional[JellyfinClient]:
         """Retorna o primeiro cliente disponível (compatibilidade com código legado)"""
@@ -51,21 +64,37 @@ class JellyfinManager:
         """Verifica se há pelo menos uma conta Jellyfin disponível"""
         return len(self.clients) > 0
 
+    def map_clients(self, fetch: Callable[[JellyfinClient], Any]) -> List[Tuple[JellyfinClient, Any]]:
+        """Executa `fetch` em todos os clientes; com várias contas, as requisições saem em paralelo
+
+        Retorna [(cliente, resultado)] na ordem de self.clients; o resultado é a exceção
+        levantada, se houver, para o chamador registrar.
+        """
+        def _safe(client):
+            try:
+                return fetch(client)
+            except Exception as e:
+                return e
+
+        if len(self.clients) == 1:
+            return [(self.clients[0], _safe(self.clients[0]))]
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            return list(zip(self.clients, executor.map(_safe, self.clients)))
+
     def get_recently_added(self, limit: int = 10) -> List[Dict]:
         """Obtém itens recentes de todas as contas Jellyfin"""
         if not self.is_available():
             return []
         
         all_items = []
-        for client in self.clients:
-            try:
-                items = client.get_recently_added(limit)
-                # Adiciona informação da URL do servidor para identificação
-                for item in items:
-                    item['_jellyfin_url'] = client.url
-                all_items.extend(items)
-            except Exception as e:
-                logger.error(f"Erro ao obter itens recentes de {client.url}: {e}")
+        for client, items in self.map_clients(lambda client: client.get_recently_added(limit)):
+            if isinstance(items, Exception):
+                logger.error(f"Erro ao obter itens recentes de {client.url}: {items}")
+                continue
+            # Adiciona informação da URL do servidor para identificação
+            for item in items:
+                item['_jellyfin_url'] = client.url
+            all_items.extend(items)
         
         # Ordena por data de criação (mais recentes primeiro)
         all_items.sort(key=lambda x: x.get('DateCreated', ''), reverse=True)
@@ -77,15 +106,14 @@ class JellyfinManager:
             return []
         
         all_libraries = []
-        for client in self.clients:
-            try:
-                libraries = client.get_libraries()
-                # Adiciona informação da URL do servidor
-                for lib in libraries:
-                    lib['_jellyfin_url'] = client.url
-                all_libraries.extend(libraries)
-            except Exception as e:
-                logger.error(f"Erro ao obter bibliotecas de {client.url}: {e}")
+        for client, libraries in self.map_clients(JellyfinClient.get_libraries):
+            if isinstance(libraries, Exception):
+                logger.error(f"Erro ao obter bibliotecas de {client.url}: {libraries}")
+                continue
+            # Adiciona informação da URL do servidor
+            for lib in libraries:
+                lib['_jellyfin_url'] = client.url
+            all_libraries.extend(libraries)
         
         return all_libraries
 
@@ -101,14 +129,12 @@ class JellyfinManager:
             return []
         
         servers_info = []
-        for client in self.clients:
-            try:
-                info = client.get_system_info()
-                if info:
-                    info['_jellyfin_url'] = client.url
-                    servers_info.append(info)
-            except Exception as e:
-                logger.error(f"Erro ao obter info do servidor {client.url}: {e}")
+        for client, info in self.map_clients(JellyfinClient.get_system_info):
+            if isinstance(info, Exception):
+                logger.error(f"Erro ao obter info do servidor {client.url}: {info}")
+            elif info:
+                info['_jellyfin_url'] = client.url
+                servers_info.append(info)
         
         return servers_info
 
@@ -116,14 +142,13 @@ class JellyfinManager:
         if not self.is_available():
             return "❌ Jellyfin não configurado ou indisponível."
         try:
-            items = self.client.get_recently_added(limit)
-            if not items:
-                return "📥 Nenhum item recente encontrado."
             messages = []
-            for item in items:
+            for item in islice(self.client.iter_latest_items(limit), limit):
                 web_link = self.client.get_web_link(item['Id'])
                 message = JellyfinFormatter.format_telegram_message(item, web_link)
                 messages.append(message)
+            if not messages:
+                return "📥 Nenhum item recente encontrado."
             return "🎬 **Itens recentemente adicionados:**\n\n" + "\n\n".join(messages)
         except Exception as e:
             logger.error(f"Erro ao obter itens recentes: {e}")
@@ -136,12 +161,12 @@ class JellyfinManager:
             libraries = self.client.get_libraries()
             if not libraries:
                 return "❌ Nenhuma biblioteca encontrada."
-            text = "📚 **Bibliotecas Disponíveis:**\n\n"
+            lines = ["📚 **Bibliotecas Disponíveis:**\n\n"]
             for lib in libraries:
                 name = lib.get('Name', 'N/A')
                 lib_type = lib.get('CollectionType', 'N/A')
-                text += f"• {name} ({lib_type})\n"
-            return text
+                lines.append(f"• {name} ({lib_type})\n")
+            return ''.join(lines)
         except Exception as e:
             logger.error(f"Erro ao obter bibliotecas: {e}")
             return f"❌ Erro ao buscar bibliotecas: {str(e)}"
@@ -150,33 +175,54 @@ class JellyfinManager:
         """Obtém status de todas as contas Jellyfin"""
         if not self.is_available():
             return "❌ Jellyfin não configurado ou indisponível."
-        
+
         try:
-            status_parts = []
-            for idx, client in enumerate(self.clients, 1):
-                try:
-                    libraries = client.get_libraries()
-                    recent_items = client.get_recently_added(1)
-                    
-                    if self.multi_account_enabled:
-                        status_parts.append(f"🟢 **Servidor Jellyfin #{idx}**")
-                    else:
-                        status_parts.append(f"🟢 **Status do Servidor Jellyfin**")
-                    
-                    status_parts.append(f"🌐 Servidor: {client.url}")
-                    if client.username:
-                        status_parts.append(f"👤 Usuário: {client.username}")
-                    status_parts.append(f"📚 Bibliotecas: {len(libraries)}")
-                    status_parts.append(f"🆕 Último item: {recent_items[0].get('Name', 'N/A') if recent_items else 'N/A'}")
-                    status_parts.append("✅ Conexão OK")
-                    
-                    if idx < len(self.clients):
-                        status_parts.append("")  # Linha em branco entre servidores
-                except Exception as e:
-                    logger.error(f"Erro ao obter status de {client.url}: {e}")
-                    status_parts.append(f"❌ Erro no servidor {client.url}: {str(e)}")
-            
-            return "\n".join(status_parts)
+            # Loop persistente: as sessões aiohttp dos clientes continuam abertas para o próximo /status
+            return run_sync(self.get_status_text_async(), timeout=self.STATUS_TIMEOUT)
         except Exception as e:
             logger.error(f"Erro ao obter status: {e}")
             return f"❌ Erro de conexão: {str(e)}"
+
+    async def _fetch_client_status(self, client: JellyfinClient):
+        return await asyncio.gather(
+            client.get_system_info_async(),
+            client.get_libraries_async(),
+            client.get_recent_items_async(limit=1),
+        )
+
+    async def get_status_text_async(self) -> str:
+        """Obtém status de todas as contas Jellyfin com as requisições em paralelo"""
+        if not self.is_available():
+            return "❌ Jellyfin não configurado ou indisponível."
+
+        results = await asyncio.gather(
+            *(self._fetch_client_status(client) for client in self.clients),
+            return_exceptions=True,
+        )
+
+        status_parts = []
+        for idx, (client, result) in enumerate(zip(self.clients, results), 1):
+            if isinstance(result, Exception):
+                logger.error(f"Erro ao obter status de {client.url}: {result}")
+                status_parts.append(f"❌ Erro no servidor {client.url}: {str(result)}")
+                continue
+
+            system_info, libraries, recent_items = result
+            if self.multi_account_enabled:
+                status_parts.append(f"🟢 **Servidor Jellyfin #{idx}**")
+            else:
+                status_parts.append(f"🟢 **Status do Servidor Jellyfin**")
+
+            status_parts.append(f"🌐 Servidor: {client.url}")
+            if system_info:
+                status_parts.append(f"🏷️ Versão: {system_info.get('Version', 'N/A')}")
+            if client.username:
+                status_parts.append(f"👤 Usuário: {client.username}")
+            status_parts.append(f"📚 Bibliotecas: {len(libraries)}")
+            status_parts.append(f"🆕 Último item: {recent_items[0].get('Name', 'N/A') if recent_items else 'N/A'}")
+            status_parts.append("✅ Conexão OK")
+
+            if idx < len(self.clients):
+                status_parts.append("")  # Linha em branco entre servidores
+
+        return "\n".join(status_parts)
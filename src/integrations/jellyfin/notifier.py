@@ -2,11 +2,26 @@ import time
 import logging
 import json
 import os
-from datetime import datetime
-from typing import Optional, Dict, List, Set
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+from src.integrations.jellyfin.formatter import OVERVIEW_MAX_LENGTH
+from src.utils.formatters import truncate
 
 logger = logging.getLogger(__name__)
 
+_TYPE_ICONS = {
+    'Movie': '🎬', 'Series': '📺', 'Season': '📺',
+    'Episode': '📺', 'Audio': '🎵', 'MusicAlbum': '💿', 'Book': '📚',
+}
+
+# Várias notificações por mensagem: menos chamadas à API do Telegram e menos risco de 429
+NOTIFICATIONS_PER_MESSAGE = 5
+TELEGRAM_MESSAGE_LIMIT = 4096
+_NOTIFICATION_SEPARATOR = "\n\n"
+
+# Máximo de IDs lembrados por servidor; os mais antigos saem primeiro (LRU)
+KNOWN_ITEMS_MAX = 4096
+
 
 class JellyfinNotifier:
     """Monitora o Jellyfin e envia notificações quando novos conteúdos são adicionados."""
@@ -15,7 +30,10 @@ class JellyfinNotifier:
         self.jellyfin_manager = jellyfin_manager
         self.interval = interval
         self.state_file = state_file
-        self.known_items: Dict[str, Set[str]] = {}  # {url: set(item_ids)}
+        # {url: OrderedDict(item_id -> None)}: conjunto ordenado por uso, limitado a KNOWN_ITEMS_MAX
+        self.known_items: Dict[str, "OrderedDict[str, None]"] = {}
+        # {url: impressão digital da última lista de IDs}; igual => nada mudou no servidor
+        self._last_fingerprint: Dict[str, int] = {}
         self.last_check_time: Optional[float] = None
         self.enabled = True
         self._load_state()
@@ -31,12 +49,12 @@ class JellyfinNotifier:
                         # Formato antigo: migra para o primeiro servidor
                         if self.jellyfin_manager.clients:
                             first_url = self.jellyfin_manager.clients[0].url
-                            self.known_items = {first_url: set(known_items_data)}
+                            self.known_items = {first_url: self._bounded(known_items_data)}
                         else:
                             self.known_items = {}
                     elif isinstance(known_items_data, dict):
                         # Formato novo: dict de {url: [item_ids]}
-                        self.known_items = {url: set(items) for url, items in known_items_data.items()}
+                        self.known_items = {url: self._bounded(items) for url, items in known_items_data.items()}
                     else:
                         self.known_items = {}
                     
@@ -48,28 +66,43 @@ class JellyfinNotifier:
             self.known_items = {}
             self.last_check_time = None
 
+    @staticmethod
+    def _bounded(item_ids) -> "OrderedDict[str, None]":
+        """Cria o conjunto de IDs conhecidos mantendo apenas os KNOWN_ITEMS_MAX mais recentes"""
+        item_ids = list(item_ids)
+        return OrderedDict.fromkeys(item_ids[-KNOWN_ITEMS_MAX:])
+
+    def _remember(self, url: str, item_id: str) -> None:
+        """Marca o item como conhecido (ou recente) e descarta o mais antigo se passar do limite"""
+        known = self.known_items.setdefault(url, OrderedDict())
+        known[item_id] = None
+        known.move_to_end(item_id)
+        if len(known) > KNOWN_ITEMS_MAX:
+            known.popitem(last=False)
+
     def _save_state(self):
         try:
             state = {
                 'known_items': {url: list(items) for url, items in self.known_items.items()},
                 'last_check_time': self.last_check_time,
             }
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(state, f, indent=2)
+            # Grava num temporário e troca de uma vez: um arquivo truncado por queda no meio da
+            # escrita faria o bot esquecer os itens conhecidos e renotificar tudo ao reiniciar
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, separators=(',', ':'))
+            os.replace(tmp_file, self.state_file)
         except Exception as e:
             logger.error(f"Erro ao salvar estado: {e}")
 
     def _format_item_notification(self, item: Dict) -> str:
-        name = item.get('Name', 'Sem título')
-        item_type = item.get('Type', 'Desconhecido')
-        year = item.get('ProductionYear', '')
-        jellyfin_url = item.get('_jellyfin_url', '')
+        get = item.get
+        name = get('Name', 'Sem título')
+        item_type = get('Type', 'Desconhecido')
+        year = get('ProductionYear', '')
+        jellyfin_url = get('_jellyfin_url', '')
         
-        type_icons = {
-            'Movie': '🎬', 'Series': '📺', 'Season': '📺',
-            'Episode': '📺', 'Audio': '🎵', 'MusicAlbum': '💿', 'Book': '📚',
-        }
-        icon = type_icons.get(item_type, '🎁')
+        icon = _TYPE_ICONS.get(item_type, '🎁')
         msg_parts = [f"{icon} <b>Novo conteúdo adicionado!</b>\n"]
         msg_parts.append(f"<b>{name}</b>")
         if year:
@@ -80,17 +113,15 @@ class JellyfinNotifier:
         if self.jellyfin_manager.multi_account_enabled and jellyfin_url:
             msg_parts.append(f"\n🌐 Servidor: {jellyfin_url}")
         
-        genres = item.get('Genres', [])
+        genres = get('Genres', [])
         if genres:
             msg_parts.append(f"\n🎭 Gêneros: {', '.join(genres[:3])}")
-        rating = item.get('CommunityRating')
+        rating = get('CommunityRating')
         if rating:
             msg_parts.append(f"\n⭐ Avaliação: {rating:.1f}/10")
-        overview = item.get('Overview', '')
+        overview = get('Overview', '')
         if overview:
-            if len(overview) > 200:
-                overview = overview[:200] + "..."
-            msg_parts.append(f"\n\n<i>{overview}</i>")
+            msg_parts.append(f"\n\n<i>{truncate(overview, OVERVIEW_MAX_LENGTH)}</i>")
         return ''.join(msg_parts)
 
     def check_new_items(self, limit: int = 20) -> List[Dict]:
@@ -101,24 +132,33 @@ class JellyfinNotifier:
         try:
             all_new_items = []
             
-            # Verifica cada cliente Jellyfin
-            for client in self.jellyfin_manager.clients:
+            # Consulta todos os clientes Jellyfin de uma vez (em paralelo com várias contas)
+            results = self.jellyfin_manager.map_clients(lambda client: client.get_recently_added(limit))
+            for client, items in results:
+                if isinstance(items, Exception):
+                    logger.error(f"Erro ao verificar itens de {client.url}: {items}")
+                    continue
                 try:
-                    items = client.get_recently_added(limit)
                     if not items:
                         continue
-                    
-                    # Inicializa set de itens conhecidos para este servidor se não existir
-                    if client.url not in self.known_items:
-                        self.known_items[client.url] = set()
-                    
-                    # Verifica novos itens para este servidor
+
+                    fingerprint = hash(tuple(item.get('Id') for item in items))
+                    if self._last_fingerprint.get(client.url) == fingerprint:
+                        continue
+                    self._last_fingerprint[client.url] = fingerprint
+
+                    known = self.known_items.get(client.url, {})
+
+                    # Verifica novos itens para este servidor numa única diferença de conjuntos
+                    item_ids = [item_id for item_id in (item.get('Id') for item in items) if item_id]
+                    new_ids = set(item_ids).difference(known)
                     for item in items:
-                        item_id = item.get('Id')
-                        if item_id and item_id not in self.known_items[client.url]:
+                        if item.get('Id') in new_ids:
                             item['_jellyfin_url'] = client.url
                             all_new_items.append(item)
-                            self.known_items[client.url].add(item_id)
+                    # Só depois atualiza a fila LRU (os já conhecidos voltam ao fim dela)
+                    for item_id in item_ids:
+                        self._remember(client.url, item_id)
                 except Exception as e:
                     logger.error(f"Erro ao verificar itens de {client.url}: {e}")
             
@@ -131,14 +171,34 @@ class JellyfinNotifier:
             logger.error(f"Erro ao verificar novos itens: {e}")
             return []
 
+    def _batch_notifications(self, new_items: List[Dict]) -> List[Tuple[str, int]]:
+        """Agrupa as notificações em mensagens de até NOTIFICATIONS_PER_MESSAGE itens
+
+        Quebra sempre entre itens, nunca no meio de um, para respeitar o limite do Telegram.
+        Retorna [(mensagem, quantidade de itens)].
+        """
+        batches = []
+        parts: List[str] = []
+        size = 0
+        for item in new_items:
+            text = self._format_item_notification(item)
+            extra = len(text) + (len(_NOTIFICATION_SEPARATOR) if parts else 0)
+            if parts and (len(parts) >= NOTIFICATIONS_PER_MESSAGE or size + extra > TELEGRAM_MESSAGE_LIMIT):
+                batches.append((_NOTIFICATION_SEPARATOR.join(parts), len(parts)))
+                parts, size = [], 0
+                extra = len(text)
+            parts.append(text)
+            size += extra
+        if parts:
+            batches.append((_NOTIFICATION_SEPARATOR.join(parts), len(parts)))
+        return batches
+
     def send_notifications(self, new_items: List[Dict]):
         from src.integrations.telegram.client import send_telegram
-        for item in new_items:
+        for message, count in self._batch_notifications(new_items):
             try:
-                message = self._format_item_notification(item)
                 send_telegram(message, parse_mode="HTML", use_keyboard=True)
-                logger.info(f"Notificação enviada: {item.get('Name', 'Sem nome')}")
-                time.sleep(1)
+                logger.info(f"Notificação enviada: {count} item(ns)")
             except Exception as e:
                 logger.error(f"Erro ao enviar notificação: {e}")
 
@@ -159,14 +219,17 @@ class JellyfinNotifier:
         # Inicializa itens conhecidos para cada servidor na primeira execução
         if not self.known_items and self.jellyfin_manager.is_available():
             logger.info("Primeira execução: populando itens conhecidos...")
-            for client in self.jellyfin_manager.clients:
+            results = self.jellyfin_manager.map_clients(lambda client: client.get_recently_added(50))
+            for client, items in results:
+                if isinstance(items, Exception):
+                    logger.error(f"Erro ao inicializar itens de {client.url}: {items}")
+                    continue
                 try:
-                    items = client.get_recently_added(50)
-                    self.known_items[client.url] = set()
+                    self.known_items[client.url] = OrderedDict()
                     for item in items:
                         item_id = item.get('Id')
                         if item_id:
-                            self.known_items[client.url].add(item_id)
+                            self._remember(client.url, item_id)
                     logger.info(f"Servidor {client.url}: {len(self.known_items[client.url])} itens conhecidos")
                 except Exception as e:
                     logger.error(f"Erro ao inicializar itens de {client.url}: {e}")
@@ -174,10 +237,11 @@ class JellyfinNotifier:
             total_items = sum(len(items) for items in self.known_items.values())
             logger.info(f"Itens conhecidos inicializados: {total_items} em {len(self.known_items)} servidor(es)")
 
-        last_check = 0
+        # Relógio monotônico: o intervalo não é afetado por ajustes do relógio do sistema (NTP)
+        last_check = float('-inf')
         while True:
             try:
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time - last_check >= self.interval:
                     self.run_check()
                     last_check = current_time
@@ -199,6 +263,7 @@ class JellyfinNotifier:
 
     def reset_state(self):
         self.known_items = {}
+        self._last_fingerprint = {}
         self.last_check_time = None
         self._save_state()
         logger.info("Estado do notificador resetado")
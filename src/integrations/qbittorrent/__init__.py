@@ -1,6 +1,8 @@
 from .client import (
     login_qb,
     fetch_torrents,
+    invalidate_torrents_cache,
+    fetch_maindata,
     summarize_torrents,
     add_magnet,
     pause_torrent,
@@ -22,6 +24,8 @@ from .multi_instance_manager import (
 __all__ = [
     "login_qb",
     "fetch_torrents",
+    "invalidate_torrents_cache",
+    "fetch_maindata",
     "summarize_torrents",
     "add_magnet",
     "pause_torrent",
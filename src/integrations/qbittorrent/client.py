@@ -1,9 +1,17 @@
 import requests
 import logging
 from typing import Optional, List, Dict
+from src.utils.cache import TTLCache
+from src.utils.formatters import format_bytes
 
 logger = logging.getLogger(__name__)
 
+# Respostas curtas em cache: monitor, SyncManager, /qtorrents e estatísticas consultam as mesmas
+# rotas em paralelo. Ações que alteram torrents invalidam a lista da instância.
+TORRENTS_TTL = 3
+TRANSFER_INFO_TTL = 10
+_response_cache = TTLCache(maxsize=64)
+
 
 def login_qb(qb_url: str, qb_user: str, qb_pass: str) -> Optional[requests.Session]:
     session = requests.Session()
@@ -24,27 +32,47 @@ def login_qb(qb_url: str, qb_user: str, qb_pass: str) -> Optional[requests.Sessi
         return None
 
 
-def fetch_torrents(sess: requests.Session, qb_url: str) -> List[Dict]:
+def invalidate_torrents_cache(qb_url: str) -> None:
+    """Descarta a lista de torrents em cache da instância (após pausar, adicionar, remover...)"""
+    _response_cache.invalidate(('torrents', qb_url))
+
+
+def fetch_torrents(sess: requests.Session, qb_url: str, force: bool = False) -> List[Dict]:
+    key = ('torrents', qb_url)
+    if not force:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
     try:
         resp = sess.get(f"{qb_url}/api/v2/torrents/info", timeout=10)
         resp.raise_for_status()
-        return resp.json()
+        torrents = resp.json()
+        _response_cache.set(key, torrents, ttl=TORRENTS_TTL)
+        return torrents
     except Exception as e:
         logger.error(f"Erro ao buscar torrents: {e}")
         return []
 
 
+def fetch_maindata(sess: requests.Session, qb_url: str, rid: int = 0) -> Optional[Dict]:
+    """Mudanças desde `rid` via sync/maindata; com rid=0 (ou rid desconhecido) vem o estado completo"""
+    try:
+        resp = sess.get(f"{qb_url}/api/v2/sync/maindata", params={"rid": rid}, timeout=10)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as e:
+        logger.error(f"Erro ao buscar maindata: {e}")
+        return None
+
+
 def summarize_torrents(torrents: List[Dict]) -> str:
     if not torrents:
         return "Nenhum torrent encontrado."
-    lines = []
-    for t in torrents:
-        name = t.get("name", "Sem nome")
-        progress = t.get("progress", 0) * 100
-        state = t.get("state", "unknown")
-        size = format_bytes(t.get("size", 0))
-        lines.append(f"• {name} | {progress:.1f}% | {state} | {size}")
-    return "\n".join(lines)
+    return "\n".join(
+        f"• {t.get('name', 'Sem nome')} | {t.get('progress', 0) * 100:.1f}% | "
+        f"{t.get('state', 'unknown')} | {format_bytes(t.get('size', 0))}"
+        for t in torrents
+    )
 
 
 def add_magnet(sess: requests.Session, qb_url: str, magnet: str) -> bool:
@@ -55,6 +83,7 @@ def add_magnet(sess: requests.Session, qb_url: str, magnet: str) -> bool:
             timeout=10,
         )
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         logger.info("Magnet adicionado com sucesso.")
         return True
     except Exception as e:
@@ -70,6 +99,7 @@ def pause_torrent(sess: requests.Session, qb_url: str, torrent_hash: str) -> boo
             timeout=10,
         )
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         return True
     except Exception as e:
         logger.error(f"Erro ao pausar torrent {torrent_hash}: {e}")
@@ -84,6 +114,7 @@ def resume_torrent(sess: requests.Session, qb_url: str, torrent_hash: str) -> bo
             timeout=10,
         )
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         return True
     except Exception as e:
         logger.error(f"Erro ao retomar torrent {torrent_hash}: {e}")
@@ -98,6 +129,7 @@ def delete_torrent(sess: requests.Session, qb_url: str, torrent_hash: str, delet
             timeout=10,
         )
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         return True
     except Exception as e:
         logger.error(f"Erro ao deletar torrent {torrent_hash}: {e}")
@@ -122,6 +154,7 @@ def set_torrent_priority(sess: requests.Session, qb_url: str, torrent_hash: str,
             timeout=10,
         )
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         return True
     except Exception as e:
         logger.error(f"Erro ao definir prioridade do torrent {torrent_hash}: {e}")
@@ -136,6 +169,7 @@ def set_torrent_location(sess: requests.Session, qb_url: str, torrent_hash: str,
             timeout=10,
         )
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         return True
     except Exception as e:
         logger.error(f"Erro ao definir localização do torrent {torrent_hash}: {e}")
@@ -157,19 +191,18 @@ def get_torrent_info(sess: requests.Session, qb_url: str, torrent_hash: str) ->
         return None
 
 
-def get_transfer_info(sess: requests.Session, qb_url: str) -> Optional[Dict]:
+def get_transfer_info(sess: requests.Session, qb_url: str, force: bool = False) -> Optional[Dict]:
+    key = ('transfer', qb_url)
+    if not force:
+        cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
     try:
         resp = sess.get(f"{qb_url}/api/v2/transfer/info", timeout=10)
         resp.raise_for_status()
-        return resp.json()
+        info = resp.json()
+        _response_cache.set(key, info, ttl=TRANSFER_INFO_TTL)
+        return info
     except Exception as e:
         logger.error(f"Erro ao obter informações de transferência: {e}")
         return None
-
-
-def format_bytes(size: int) -> str:
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.2f} {unit}"
-        size /= 1024.0
-    return f"{size:.2f} PB"
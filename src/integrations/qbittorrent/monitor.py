@@ -2,10 +2,13 @@ import time
 import logging
 import json
 import os
-from typing import Callable, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+# Estados do qBittorrent em que o download já terminou
+_COMPLETED_STATES = frozenset(("uploading", "seeding", "stalledUP", "forcedUP"))
+
 
 def _load_completed_state(state_file: str = "torrent_monitor_state.json") -> Set[str]:
     try:
@@ -23,12 +26,24 @@ def _load_completed_state(state_file: str = "torrent_monitor_state.json") -> Set
 def _save_completed_state(known_completed: Set[str], state_file: str = "torrent_monitor_state.json"):
     try:
         state = {'known_completed': list(known_completed)}
-        with open(state_file, 'w', encoding='utf-8') as f:
+        # Troca atômica: um arquivo truncado faria todos os concluídos serem notificados de novo
+        tmp_file = f"{state_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(state, f, indent=2)
+        os.replace(tmp_file, state_file)
     except Exception as e:
         logger.error(f"Erro ao salvar estado dos torrents: {e}")
 
 
+def _completed_torrents(torrents: List[Dict]) -> Dict[str, str]:
+    """{hash: nome} dos torrents já concluídos, na ordem retornada pelo qBittorrent"""
+    return {
+        t.get("hash", ""): t.get("name", "Sem nome")
+        for t in torrents
+        if t.get("state", "") in _COMPLETED_STATES
+    }
+
+
 def monitor_torrents(
     sess,
     qb_url: str,
@@ -40,16 +55,13 @@ def monitor_torrents(
     from src.integrations.qbittorrent.client import fetch_torrents
 
     known_completed = _load_completed_state()
-    last_status_time = 0
+    last_status_time = float('-inf')  # Medido com time.monotonic()
     
     if not known_completed:
         logger.info("Primeira execução: populando torrents conhecidos...")
         try:
             torrents = fetch_torrents(sess, qb_url)
-            for t in torrents:
-                state = t.get("state", "")
-                if state in ("uploading", "seeding", "stalledUP", "forcedUP"):
-                    known_completed.add(t.get("hash", ""))
+            known_completed.update(_completed_torrents(torrents))
             _save_completed_state(known_completed)
             logger.info(f"Torrents conhecidos inicializados: {len(known_completed)}")
         except Exception as e:
@@ -60,20 +72,27 @@ def monitor_torrents(
     while True:
         try:
             torrents = fetch_torrents(sess, qb_url)
-            for t in torrents:
-                torrent_hash = t.get("hash", "")
-                state = t.get("state", "")
-                name = t.get("name", "Sem nome")
-
-                if state in ("uploading", "seeding", "stalledUP", "forcedUP") and torrent_hash not in known_completed:
-                    known_completed.add(torrent_hash)
-                    _save_completed_state(known_completed)
-                    msg = f"✅ <b>Download concluído:</b> {name}"
-                    send_notification(msg)
-                    logger.info(f"Torrent concluído: {name}")
+            newly_completed = [
+                (torrent_hash, name)
+                for torrent_hash, name in _completed_torrents(torrents).items()
+                if torrent_hash not in known_completed
+            ]
+            # Esquece torrents removidos do qBittorrent, para o estado não crescer sem limite
+            # (lista vazia pode ser erro de conexão: nesse caso não remove nada)
+            removed = known_completed.difference(t.get("hash", "") for t in torrents) if torrents else set()
+
+            if newly_completed or removed:
+                known_completed -= removed
+                known_completed.update(torrent_hash for torrent_hash, _ in newly_completed)
+                _save_completed_state(known_completed)
+
+            for _, name in newly_completed:
+                msg = f"✅ <b>Download concluído:</b> {name}"
+                send_notification(msg)
+                logger.info(f"Torrent concluído: {name}")
 
             if send_status:
-                current_time = time.time()
+                current_time = time.monotonic()
                 if current_time - last_status_time >= status_interval:
                     send_status()
                     last_status_time = current_time
@@ -4,6 +4,7 @@ from typing import Optional, List, Dict, Tuple
 from dataclasses import dataclass
 from threading import Lock
 import time
+from src.utils.formatters import format_bytes
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +17,7 @@ class QBInstance:
     password: str
     storage_path: str
     session: Optional[requests.Session] = None
-    last_check: float = 0
+    last_check: float = float('-inf')  # time.monotonic() da última atualização de espaço
     available_space: int = 0
     total_space: int = 0
     is_active: bool = False
@@ -126,9 +127,9 @@ class MultiInstanceManager:
                 
                 logger.debug(
                     f"Instância '{instance.name}': "
-                    f"Usado: {self._format_bytes(used_space)}, "
-                    f"Livre: {self._format_bytes(free_space)}, "
-                    f"Total calculado: {self._format_bytes(total_space)}"
+                    f"Usado: {format_bytes(used_space)}, "
+                    f"Livre: {format_bytes(free_space)}, "
+                    f"Total calculado: {format_bytes(total_space)}"
                 )
             except Exception as torrent_err:
                 logger.debug(f"Erro ao obter torrents para calcular espaço usado em '{instance.name}': {torrent_err}")
@@ -137,12 +138,12 @@ class MultiInstanceManager:
             
             instance.available_space = free_space
             instance.total_space = total_space if total_space > 0 else free_space
-            instance.last_check = time.time()
+            instance.last_check = time.monotonic()
             
             logger.debug(
                 f"Instância '{instance.name}': "
-                f"{self._format_bytes(instance.available_space)} livres de "
-                f"{self._format_bytes(instance.total_space)}"
+                f"{format_bytes(instance.available_space)} livres de "
+                f"{format_bytes(instance.total_space)}"
             )
             return True
         except Exception as e:
@@ -158,7 +159,7 @@ class MultiInstanceManager:
     
     def get_best_instance_for_download(self, estimated_size: int = 0) -> Optional[QBInstance]:
         with self.lock:
-            current_time = time.time()
+            current_time = time.monotonic()
             
             for instance in self.instances.values():
                 if instance.is_active and (current_time - instance.last_check) > self.storage_check_interval:
@@ -181,7 +182,7 @@ class MultiInstanceManager:
             best = active_instances[0]
             logger.info(
                 f"Instância selecionada: '{best.name}' com "
-                f"{self._format_bytes(best.available_space)} disponíveis"
+                f"{format_bytes(best.available_space)} disponíveis"
             )
             return best
     
@@ -220,8 +221,8 @@ class MultiInstanceManager:
                     space_info = ""
                     if instance.available_space > 0:
                         space_info = (
-                            f"\n   💾 Espaço: {self._format_bytes(instance.available_space)} livres / "
-                            f"{self._format_bytes(instance.total_space)} total"
+                            f"\n   💾 Espaço: {format_bytes(instance.available_space)} livres / "
+                            f"{format_bytes(instance.total_space)} total"
                         )
                     priority_info = f"\n   ⭐ Prioridade: {instance.priority}" if instance.priority > 0 else ""
                     
@@ -260,7 +261,7 @@ class MultiInstanceManager:
             )
             resp.raise_for_status()
             logger.info(f"Magnet adicionado à instância '{instance.name}'.")
-            return True, f"Download adicionado à instância '{instance.name}' ({self._format_bytes(instance.available_space)} disponíveis)"
+            return True, f"Download adicionado à instância '{instance.name}' ({format_bytes(instance.available_space)} disponíveis)"
         except Exception as e:
             logger.error(f"Erro ao adicionar magnet à instância '{instance.name}': {e}")
             return False, f"Erro ao adicionar download: {str(e)}"
@@ -293,14 +294,6 @@ class MultiInstanceManager:
                         pass
                 results[name] = self._connect_instance(instance)
         return results
-    
-    @staticmethod
-    def _format_bytes(size: int) -> str:
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024.0:
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} PB"
 
 
 _manager_instance: Optional[MultiInstanceManager] = None
@@ -3,10 +3,14 @@ from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import logging
 import re
-from urllib.parse import urljoin, quote
+from urllib.parse import urljoin
+from src.utils.magnet_parser import MAGNET_HREF_RE, MAGNET_IN_HTML_RE
 
 logger = logging.getLogger(__name__)
 
+# Rótulo de versão (áudio/qualidade) escrito antes de cada link magnet na página de detalhes
+_VERSION_LABEL_RE = re.compile(r'(DUBLADO|LEGENDADO|DUAL|1080P|720P|4K)', re.IGNORECASE)
+
 
 class RedeTorrentApi:
     """Cliente para interagir com o site Rede Torrent"""
@@ -334,14 +338,14 @@ class RedeTorrentApi:
         seen = set()
 
         # Primeiro tenta links <a> com href magnet
-        magnet_anchors = soup.find_all('a', href=re.compile(r'^magnet:\?'))
+        magnet_anchors = soup.find_all('a', href=MAGNET_HREF_RE)
         for anchor in magnet_anchors:
             href = anchor.get('href', '')
             if href and href not in seen:
                 seen.add(href)
                 label = anchor.get_text(strip=True) or 'DOWNLOAD'
                 # Tenta pegar o texto do bloco acima do link (descrição da versão)
-                prev = anchor.find_previous(string=re.compile(r'(DUBLADO|LEGENDADO|DUAL|1080P|720P|4K)', re.IGNORECASE))
+                prev = anchor.find_previous(string=_VERSION_LABEL_RE)
                 version_label = prev.strip() if prev else label
                 magnets.append({
                     'url': href.replace('&amp;', '&'),
@@ -350,8 +354,7 @@ class RedeTorrentApi:
 
         # Fallback: busca no HTML bruto
         if not magnets:
-            magnet_pattern = r'magnet:\?xt=urn:btih:[a-fA-F0-9]{40}[^\s\'"<>]*'
-            raw_matches = re.findall(magnet_pattern, html_text)
+            raw_matches = MAGNET_IN_HTML_RE.findall(html_text)
             for m in raw_matches:
                 clean = m.replace('&amp;', '&')
                 if clean not in seen:
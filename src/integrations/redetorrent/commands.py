@@ -20,6 +20,9 @@ def format_redetorrent_result(item: dict, index: int) -> str:
     return f"{index}. {type_emoji} *{title}*\n   ⭐ {rating}\n{quality_str}{audio_str}   🔗 {url}\n"
 
 
+_DOWNLOAD_HINT = "\n💡 *Para baixar:* `/rede_baixar [número]`\n*Exemplo:* `/rede_baixar 1`"
+
+
 def format_detail_info(details: dict) -> str:
     title = details.get('title', 'Título desconhecido')
     original_title = details.get('original_title')
@@ -67,11 +70,10 @@ def handle_redetorrent_search(query: str, media_type: str, chat_id: str, user_id
             return
         if user_id:
             _user_search_cache[user_id] = results
-        message = f"📋 *Resultados para '{query}':*\n\n"
-        for i, item in enumerate(results, 1):
-            message += format_redetorrent_result(item, i)
-        message += "\n💡 *Para baixar:* `/rede_baixar [número]`\n"
-        message += "*Exemplo:* `/rede_baixar 1`"
+        lines = [f"📋 *Resultados para '{query}':*\n\n"]
+        lines.extend(format_redetorrent_result(item, i) for i, item in enumerate(results, 1))
+        lines.append(_DOWNLOAD_HINT)
+        message = "".join(lines)
         send_telegram(message, chat_id, parse_mode="Markdown", use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao buscar no Rede Torrent: {e}")
@@ -145,11 +147,10 @@ def handle_redetorrent_popular(media_type: str, chat_id: str, user_id: str = Non
             return
         if user_id:
             _user_search_cache[user_id] = results
-        message = f"🔥 *{type_name} Populares - Rede Torrent:*\n\n"
-        for i, item in enumerate(results, 1):
-            message += format_redetorrent_result(item, i)
-        message += "\n💡 *Para baixar:* `/rede_baixar [número]`\n"
-        message += "*Exemplo:* `/rede_baixar 1`"
+        lines = [f"🔥 *{type_name} Populares - Rede Torrent:*\n\n"]
+        lines.extend(format_redetorrent_result(item, i) for i, item in enumerate(results, 1))
+        lines.append(_DOWNLOAD_HINT)
+        message = "".join(lines)
         send_telegram(message, chat_id, parse_mode="Markdown", use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao obter populares do Rede Torrent: {e}")
@@ -199,11 +200,10 @@ def handle_redetorrent_by_genre(genre: str, media_type: str, chat_id: str, user_
             return
         if user_id:
             _user_search_cache[user_id] = results
-        message = f"🎭 *{type_name} - {genre_display} (Rede Torrent):*\n\n"
-        for i, item in enumerate(results, 1):
-            message += format_redetorrent_result(item, i)
-        message += "\n💡 *Para baixar:* `/rede_baixar [número]`\n"
-        message += "*Exemplo:* `/rede_baixar 1`"
+        lines = [f"🎭 *{type_name} - {genre_display} (Rede Torrent):*\n\n"]
+        lines.extend(format_redetorrent_result(item, i) for i, item in enumerate(results, 1))
+        lines.append(_DOWNLOAD_HINT)
+        message = "".join(lines)
         send_telegram(message, chat_id, parse_mode="Markdown", use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao buscar por gênero '{genre}': {e}")
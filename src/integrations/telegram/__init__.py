@@ -3,6 +3,7 @@ from .client import (
     send_and_expire_status,
     delete_message,
     answer_callback_query,
+    send_chat_action,
     send_video_to_telegram,
     set_bot_commands,
     TELEGRAM_BOT_TOKEN,
@@ -10,7 +11,7 @@ from .client import (
     AUTHORIZED_USERS,
     EXPIRAR_MSG,
 )
-from .keyboards import get_main_keyboard
+from .keyboards import get_main_keyboard, get_torrent_actions_keyboard
 from .utils import (
     format_bytes,
     get_disk_space_info,
@@ -26,9 +27,11 @@ __all__ = [
     "send_and_expire_status",
     "delete_message",
     "answer_callback_query",
+    "send_chat_action",
     "send_video_to_telegram",
     "set_bot_commands",
     "get_main_keyboard",
+    "get_torrent_actions_keyboard",
     "format_bytes",
     "get_disk_space_info",
     "get_recent_items_detailed",
@@ -1,15 +1,60 @@
 import requests
+from requests.adapters import HTTPAdapter
 import re
 import logging
 import json
 import threading
+from collections import OrderedDict
 from typing import Optional, Union
 from dotenv import load_dotenv
 from src.core.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID, EXPIRAR_MSG, AUTHORIZED_USERS
+from src.utils.formatters import truncate
+from src.utils.rate_limiter import TokenBucket
+from src.integrations.telegram.keyboards import get_main_keyboard
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Usados para conferir se as tags HTML da mensagem estão balanceadas antes de enviar com parse_mode=HTML
+_HTML_OPEN_TAG_RE = re.compile(r'<([a-z]+)[^<>]*>', re.IGNORECASE)
+_HTML_CLOSE_TAG_RE = re.compile(r'</([a-z]+)>', re.IGNORECASE)
+
+
+def _build_session() -> requests.Session:
+    """Session compartilhada com api.telegram.org: reaproveita as conexões TCP/TLS entre chamadas"""
+    session = requests.Session()
+    # Sem retry automático: repetir um sendMessage que chegou ao Telegram duplicaria a mensagem
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10)
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+# Limites do Telegram: ~30 mensagens/s no total e ~1/s sustentada por chat (rajadas curtas são toleradas)
+_GLOBAL_LIMITER = TokenBucket(rate=25)
+# Máximo de chats com limitador próprio; o usado há mais tempo sai primeiro (LRU)
+CHAT_LIMITERS_MAX = 1024
+_chat_limiters: "OrderedDict[str, TokenBucket]" = OrderedDict()
+_chat_limiters_lock = threading.Lock()
+
+
+def _throttle(chat_id: Union[str, int]) -> None:
+    """Espera, se preciso, para não estourar os limites de envio do Telegram (evita o 429)"""
+    key = str(chat_id)
+    with _chat_limiters_lock:
+        limiter = _chat_limiters.get(key)
+        if limiter is None:
+            limiter = _chat_limiters[key] = TokenBucket(rate=1, capacity=5)
+            if len(_chat_limiters) > CHAT_LIMITERS_MAX:
+                _chat_limiters.popitem(last=False)
+        else:
+            _chat_limiters.move_to_end(key)
+    limiter.acquire()
+    _GLOBAL_LIMITER.acquire()
+
 
 def set_bot_commands() -> None:
     commands = [
@@ -47,7 +92,7 @@ def set_bot_commands() -> None:
     ]
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/setMyCommands"
     try:
-        resp = requests.post(url, json={"commands": commands}, timeout=10)
+        resp = _SESSION.post(url, json={"commands": commands}, timeout=10)
         resp.raise_for_status()
         logger.info("Comandos do bot registrados com sucesso no Telegram.")
     except Exception as e:
@@ -68,7 +113,8 @@ def send_and_expire_status(msg: str, chat_id: Optional[Union[str, int]] = None,
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     data = {"chat_id": chat_id, "text": msg, "parse_mode": parse_mode}
     try:
-        resp = requests.post(url, json=data, timeout=10)
+        _throttle(chat_id)
+        resp = _SESSION.post(url, json=data, timeout=10)
         resp.raise_for_status()
         message_id = resp.json()["result"]["message_id"]
         threading.Timer(expirar, delete_message, args=(chat_id, message_id)).start()
@@ -81,7 +127,7 @@ def send_and_expire_status(msg: str, chat_id: Optional[Union[str, int]] = None,
 def delete_message(chat_id, message_id) -> None:
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/deleteMessage"
     try:
-        requests.post(url, json={"chat_id": chat_id, "message_id": message_id}, timeout=10)
+        _SESSION.post(url, json={"chat_id": chat_id, "message_id": message_id}, timeout=10)
     except Exception as e:
         logger.error(f"Erro ao apagar mensagem: {e}")
 
@@ -97,15 +143,12 @@ def send_telegram(msg: str, chat_id: Optional[Union[str, int]] = None, parse_mod
             return False
 
     if parse_mode and parse_mode.upper() == "HTML":
-        open_tags = re.findall(r'<([a-z]+)[^<>]*>', msg, re.IGNORECASE)
-        close_tags = re.findall(r'</([a-z]+)>', msg, re.IGNORECASE)
+        open_tags = _HTML_OPEN_TAG_RE.findall(msg)
+        close_tags = _HTML_CLOSE_TAG_RE.findall(msg)
         if len(open_tags) != len(close_tags):
             parse_mode = None
 
-    if len(msg) > 4096:
-        msg = msg[:4093] + "..."
-
-    from src.integrations.telegram.keyboards import get_main_keyboard
+    msg = truncate(msg, TELEGRAM_MESSAGE_LIMIT, "...")
 
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     data = {"chat_id": str(chat_id), "text": msg}
@@ -117,7 +160,8 @@ def send_telegram(msg: str, chat_id: Optional[Union[str, int]] = None, parse_mod
         data["reply_markup"] = get_main_keyboard()
 
     try:
-        resp = requests.post(url, json=data, timeout=10)
+        _throttle(chat_id)
+        resp = _SESSION.post(url, json=data, timeout=10)
         resp.raise_for_status()
         return True
     except requests.exceptions.RequestException as e:
@@ -138,7 +182,7 @@ def answer_callback_query(callback_id: str, text: str = None) -> bool:
     if text:
         data["text"] = text
     try:
-        resp = requests.post(url, json=data, timeout=10)
+        resp = _SESSION.post(url, json=data, timeout=10)
         resp.raise_for_status()
         return True
     except Exception as e:
@@ -146,13 +190,25 @@ def answer_callback_query(callback_id: str, text: str = None) -> bool:
         return False
 
 
+def send_chat_action(chat_id: Union[str, int], action: str = "typing") -> bool:
+    """Mostra "digitando..." (ou outra ação) no chat por até 5 s enquanto uma resposta lenta é montada"""
+    if not TELEGRAM_BOT_TOKEN:
+        return False
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendChatAction"
+    try:
+        resp = _SESSION.post(url, json={"chat_id": str(chat_id), "action": action}, timeout=5)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        logger.debug(f"Erro ao enviar ação de chat: {e}")
+        return False
+
+
 def send_video_to_telegram(file_path: str, chat_id: str, title: str) -> bool:
     if not TELEGRAM_BOT_TOKEN:
         logger.error("Token do bot do Telegram não configurado")
         return False
 
-    from src.integrations.telegram.keyboards import get_main_keyboard
-
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendVideo"
     try:
         with open(file_path, 'rb') as video_file:
@@ -164,7 +220,7 @@ def send_video_to_telegram(file_path: str, chat_id: str, title: str) -> bool:
                 'supports_streaming': True,
                 'reply_markup': json.dumps(get_main_keyboard()),
             }
-            resp = requests.post(url, files=files, data=data, timeout=120)
+            resp = _SESSION.post(url, files=files, data=data, timeout=120)
             resp.raise_for_status()
             logger.info(f"Vídeo enviado com sucesso: {title}")
             return True
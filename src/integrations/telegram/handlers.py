@@ -1,12 +1,22 @@
 import requests
 import re
+import json
 import logging
 import time
 import asyncio
 import os
-from typing import Optional
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Deque, Dict, NamedTuple, Optional, Tuple
 from src.core.config import TELEGRAM_BOT_TOKEN, AUTHORIZED_USERS
-from src.integrations.telegram.client import send_telegram, answer_callback_query, send_video_to_telegram
+from src.utils.async_loop import submit
+from src.utils.magnet_parser import extract_magnet_links, format_magnet_info
+from src.integrations.youtube.utils import is_youtube_url
+from src.integrations.telegram.client import send_telegram, answer_callback_query, send_chat_action, send_video_to_telegram
 from src.integrations.telegram.utils import (
     get_disk_space_info,
     list_torrents,
@@ -17,6 +27,75 @@ from src.integrations.telegram.utils import (
 
 logger = logging.getLogger(__name__)
 
+# Textos e mapeamentos fixos, montados uma vez na importação do módulo
+WELCOME_MESSAGE = """
+🤖 *Bem-vindo ao Bot de Gerenciamento de Mídia* 🤖
+
+*Comandos disponíveis:*
+- /start - Mostrar esta mensagem
+- /qespaco - Mostrar espaço em disco
+- /qtorrents - Listar torrents ativos
+- /magnet - Adicionar torrent via magnet link
+- /recent - Ver itens recentes do Jellyfin
+- /recentes - Ver itens recentemente adicionados (detalhado)
+- /libraries - Listar bibliotecas do Jellyfin
+- /status - Status do servidor Jellyfin
+- /youtube - Baixar vídeo do YouTube
+
+Ou use os botões abaixo para navegar facilmente!"""
+
+TORRENT_HELP_TEXT = """
+<b>📋 AJUDA - GERENCIADOR DE TORRENTS</b>
+
+<b>Botões disponíveis:</b>
+• 🔄 <b>Atualizar Lista</b> - Atualiza a lista de torrents
+• ⏸️ <b>Pausar Todos</b> - Pausa todos os torrents ativos
+• ▶️ <b>Retomar Todos</b> - Retoma todos os torrents pausados
+• 📋 <b>Detalhes</b> - Mostra esta mensagem de ajuda
+
+<b>Estados dos torrents:</b>
+• 📥 <b>Downloads Ativos</b> - Torrents sendo baixados
+• ⏸️ <b>Pausados</b> - Torrents pausados manualmente
+• ✅ <b>Finalizados/Seeding</b> - Torrents completos
+• ❌ <b>Com Erro</b> - Torrents com problemas
+
+<b>Comandos úteis:</b>
+• /qtorrents - Listar torrents
+• /qespaco - Ver espaço em disco
+"""
+
+# Texto dos botões do teclado principal -> comando equivalente
+KEYBOARD_COMMAND_MAP = {
+    "📊 Status do Servidor": "/status",
+    "📦 Listar Torrents": "/qtorrents",
+    "💾 Espaço em Disco": "/qespaco",
+    "🎬 Itens Recentes": "/recent",
+    "🎭 Recentes Detalhado": "/recentes",
+    "📚 Bibliotecas": "/libraries",
+    "🎥 YouTube": "/youtube",
+    "🎬 Buscar Filmes": "/ytsbr",
+    "📺 Buscar Séries": "/ytsbr_series",
+    "🎌 Buscar Animes": "/ytsbr_anime",
+    "🌐 Rede Filmes": "/rede",
+    "📺 Rede Séries": "/rede_series",
+    "🎨 Rede Desenhos": "/rede_desenhos",
+    "🆕 Rede Lançamentos": "/rede_lancamentos",
+    "❓ Ajuda": "/start",
+}
+
+
+def _send_torrent_help(sess, qb_url: str, chat_id) -> None:
+    send_telegram(TORRENT_HELP_TEXT, chat_id, parse_mode="HTML", use_keyboard=True)
+
+
+# callback_data dos botões inline -> handler(sess, qb_url, chat_id)
+CALLBACK_HANDLERS = {
+    'torrent_refresh': list_torrents,
+    'torrent_pause_all': handle_pause_all_torrents,
+    'torrent_resume_all': handle_resume_all_torrents,
+    'torrent_details': _send_torrent_help,
+}
+
 
 async def process_youtube_download(url: str, chat_id: str) -> None:
     from src.integrations.youtube.downloader import YouTubeDownloader
@@ -24,11 +103,14 @@ async def process_youtube_download(url: str, chat_id: str) -> None:
     from src.core.config import REMOVE_AFTER_SEND
 
     downloader = YouTubeDownloader(download_dir="downloads")
+    # Os envios ao Telegram bloqueiam (requests + limitador), então também saem do loop compartilhado
+    send = partial(asyncio.to_thread, send_telegram)
     try:
-        send_telegram("🔍 Obtendo informações do vídeo...", chat_id, use_keyboard=True)
-        video_info = downloader.get_video_info(url)
+        await send("🔍 Obtendo informações do vídeo...", chat_id, use_keyboard=True)
+        # Roda no loop compartilhado: a extração (yt-dlp) bloqueia, então vai para uma thread
+        video_info = await asyncio.to_thread(downloader.get_video_info, url)
         if not video_info:
-            send_telegram("❌ Não foi possível obter informações do vídeo. Verifique se o link está correto.", chat_id, use_keyboard=True)
+            await send("❌ Não foi possível obter informações do vídeo. Verifique se o link está correto.", chat_id, use_keyboard=True)
             return
 
         title = video_info.get('title', 'Título não disponível')
@@ -39,7 +121,6 @@ async def process_youtube_download(url: str, chat_id: str) -> None:
 
         if upload_date and upload_date != 'Data desconhecida':
             try:
-                from datetime import datetime
                 date_obj = datetime.strptime(upload_date, '%Y%m%d')
                 upload_date = date_obj.strftime('%d/%m/%Y')
             except Exception:
@@ -54,7 +135,7 @@ async def process_youtube_download(url: str, chat_id: str) -> None:
 📅 *Publicado:* {upload_date}
 
 📥 *Iniciando download...*"""
-        send_telegram(video_info_text, chat_id, parse_mode="Markdown", use_keyboard=True)
+        await send(video_info_text, chat_id, parse_mode="Markdown", use_keyboard=True)
 
         def on_complete(download_id, file_path):
             try:
@@ -91,223 +172,457 @@ async def process_youtube_download(url: str, chat_id: str) -> None:
         await asyncio.sleep(2)
         last_progress_update = 0
         max_wait_time = 600
-        start_time = time.time()
+        start_time = time.monotonic()
 
         while True:
             status = downloader.get_download_status(download_id)
             if not status:
                 break
-            current_time = time.time()
+            current_time = time.monotonic()
             if current_time - start_time > max_wait_time:
-                send_telegram("⏰ Download cancelado por timeout (10 minutos)", chat_id, use_keyboard=True)
+                await send("⏰ Download cancelado por timeout (10 minutos)", chat_id, use_keyboard=True)
                 downloader.cancel_download(download_id)
                 break
             if status['status'].value in ['completed', 'failed', 'cancelled']:
                 break
             if current_time - last_progress_update >= 10:
-                elapsed = int(current_time - status['start_time'])
-                send_telegram(f"📥 *Baixando...* ⏱ {elapsed}s", chat_id, parse_mode="Markdown", use_keyboard=True)
+                # start_time do downloader é horário de parede (time.time())
+                elapsed = int(time.time() - status['start_time'])
+                await send(f"📥 *Baixando...* ⏱ {elapsed}s", chat_id, parse_mode="Markdown", use_keyboard=True)
                 last_progress_update = current_time
             await asyncio.sleep(2)
 
     except Exception as e:
         logger.error(f"Erro no processo de download do YouTube: {e}")
-        send_telegram(f"❌ Erro inesperado: {str(e)}", chat_id, use_keyboard=True)
+        await send(f"❌ Erro inesperado: {str(e)}", chat_id, use_keyboard=True)
+
+
+# Links de sites de torrent reconhecidos no texto livre das mensagens
+_REDETORRENT_URL_RE = re.compile(r'https?://redetorrent\.com/[^\s]+')
+_YTSBR_URL_RE = re.compile(r'https?://ytsbr\.com/(?:filme|serie|anime)/[^\s]+')
+
+# Long polling: o Telegram segura o getUpdates até chegar um update ou passar POLL_TIMEOUT segundos
+POLL_TIMEOUT = 30
+# Espera após falhas seguidas no getUpdates: dobra a cada falha (1s, 2s, 4s...) até POLL_MAX_RETRY_DELAY
+POLL_RETRY_DELAY = 0.5
+POLL_MAX_RETRY_DELAY = 30
+# Só os tipos de update tratados em _process_update; o Telegram descarta o resto no servidor
+_ALLOWED_UPDATES = json.dumps(['message', 'callback_query'])
+# Sessão própria do polling, que mantém a conexão com api.telegram.org aberta entre as chamadas
+_poll_session = requests.Session()
+_poll_failures = 0
+
+
+class _ChatDispatcher:
+    """Executa updates de chats diferentes em paralelo, mantendo a ordem dentro de cada chat
+
+    Cada chat com trabalho pendente ocupa no máximo um worker, que drena a fila do chat;
+    assim um /magnet lento em um chat não atrasa as respostas dos outros.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='telegram-update')
+        # chat_id -> tarefas à espera do worker que já está processando aquele chat
+        self._pending: Dict[Any, Deque[Tuple[Callable, tuple]]] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, chat_id, fn: Callable, *args) -> None:
+        with self._lock:
+            queue = self._pending.get(chat_id)
+            if queue is not None:
+                queue.append((fn, args))
+                return
+            self._pending[chat_id] = deque()
+        self._executor.submit(self._drain, chat_id, fn, args)
+
+    def _drain(self, chat_id, fn: Callable, args: tuple) -> None:
+        while True:
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error(f"Erro ao processar update do chat {chat_id}: {e}")
+            with self._lock:
+                queue = self._pending[chat_id]
+                if not queue:
+                    del self._pending[chat_id]
+                    return
+                fn, args = queue.popleft()
 
 
-def process_messages(sess, last_update_id: int, add_magnet_func, qb_url: str, jellyfin_manager=None, sync_manager=None, stats_manager=None, docker_manager=None, multi_instance_manager=None, gostream_manager=None) -> int:
-    if not TELEGRAM_BOT_TOKEN:
-        logger.error("Token do bot do Telegram não configurado")
-        return last_update_id
+_dispatcher = _ChatDispatcher()
 
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getUpdates"
-    params = {'offset': last_update_id + 1, 'timeout': 10}
 
+def _update_chat_id(update: dict):
+    """Chat de origem do update (mensagem ou callback), ou None se não houver"""
+    if 'callback_query' in update:
+        return update['callback_query'].get('message', {}).get('chat', {}).get('id')
+    return update.get('message', {}).get('chat', {}).get('id')
+
+
+class _CommandContext(NamedTuple):
+    """Dados do update e integrações repassados aos handlers de TEXT_COMMANDS"""
+    chat_id: int
+    user_id: str
+    args: str  # Texto após o comando ('' quando não há argumentos)
+    sess: Any
+    add_magnet_func: Optional[Callable]
+    qb_url: str
+    sync_manager: Any
+    stats_manager: Any
+    docker_manager: Any
+    multi_instance_manager: Any
+
+
+class _TextCommand(NamedTuple):
+    """Entrada de TEXT_COMMANDS: handler(ctx) e se o comando exige usuário autorizado"""
+    handler: Callable[[_CommandContext], None]
+    requires_auth: bool = True
+
+
+def _int_arg(parts: list, index: int, default: int) -> int:
+    return int(parts[index]) if len(parts) > index and parts[index].isdigit() else default
+
+
+def _cmd_start(ctx: _CommandContext) -> None:
+    send_telegram(WELCOME_MESSAGE, ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+
+
+def _cmd_qespaco(ctx: _CommandContext) -> None:
+    logger.debug(f"Comando /qespaco - multi_instance_manager: {ctx.multi_instance_manager}, sess: {ctx.sess}")
+    if ctx.multi_instance_manager:
+        # Modo multi-instância: mostrar espaço de todas as instâncias
+        logger.info("Usando modo multi-instância para /qespaco")
+        from src.commands.multi_instance_commands import handle_instances_command
+        handle_instances_command(ctx.chat_id)
+    else:
+        # Modo instância única
+        logger.info("Usando modo instância única para /qespaco")
+        disk_info = get_disk_space_info(ctx.sess, ctx.qb_url, ctx.chat_id)
+        send_telegram(disk_info, ctx.chat_id, parse_mode="HTML", use_keyboard=True)
+
+
+def _cmd_qtorrents(ctx: _CommandContext) -> None:
+    logger.debug(f"Comando /qtorrents - multi_instance_manager: {ctx.multi_instance_manager}, sess: {ctx.sess}")
+    if ctx.multi_instance_manager:
+        # Modo multi-instância: listar torrents de todas as instâncias
+        logger.info("Usando modo multi-instância para /qtorrents")
+        from src.commands.multi_instance_commands import handle_torrents_multi_command
+        handle_torrents_multi_command(ctx.chat_id)
+    else:
+        # Modo instância única
+        logger.info("Usando modo instância única para /qtorrents")
+        list_torrents(ctx.sess, ctx.qb_url, ctx.chat_id)
+
+
+def _cmd_stats(ctx: _CommandContext) -> None:
+    from src.commands.telegram_commands import handle_stats_command
+    handle_stats_command(ctx.stats_manager, ctx.chat_id, _int_arg(ctx.args.split(), 0, 24))
+
+
+def _cmd_history(ctx: _CommandContext) -> None:
+    from src.commands.telegram_commands import handle_history_command
+    handle_history_command(ctx.stats_manager, ctx.chat_id, _int_arg(ctx.args.split(), 0, 7))
+
+
+def _cmd_sync(ctx: _CommandContext) -> None:
+    from src.commands.telegram_commands import handle_sync_command
+    handle_sync_command(ctx.sync_manager, ctx.chat_id)
+
+
+def _cmd_sync_status(ctx: _CommandContext) -> None:
+    from src.commands.telegram_commands import handle_sync_status_command
+    handle_sync_status_command(ctx.sync_manager, ctx.chat_id)
+
+
+def _cmd_priority(ctx: _CommandContext) -> None:
+    from src.commands.telegram_commands import handle_priority_command
+    parts = ctx.args.split()
+    torrent_hash = parts[0] if parts else None
+    priority = parts[1] if len(parts) > 1 else None
+    handle_priority_command(ctx.sess, ctx.qb_url, ctx.chat_id, torrent_hash, priority)
+
+
+def _cmd_remove(ctx: _CommandContext) -> None:
+    from src.commands.telegram_commands import handle_remove_command
+    parts = ctx.args.split()
+    torrent_hash = parts[0] if parts else None
+    delete_files = len(parts) > 1 and parts[1].lower() == 'delete'
+    handle_remove_command(ctx.sess, ctx.qb_url, ctx.chat_id, torrent_hash, delete_files)
+
+
+def _cmd_instances(ctx: _CommandContext) -> None:
+    from src.commands.multi_instance_commands import handle_instances_command
+    handle_instances_command(ctx.chat_id)
+
+
+def _cmd_torrents_multi(ctx: _CommandContext) -> None:
+    from src.commands.multi_instance_commands import handle_torrents_multi_command
+    handle_torrents_multi_command(ctx.chat_id)
+
+
+def _cmd_refresh_storage(ctx: _CommandContext) -> None:
+    from src.commands.multi_instance_commands import handle_refresh_storage_command
+    handle_refresh_storage_command(ctx.chat_id)
+
+
+def _cmd_reconnect_instances(ctx: _CommandContext) -> None:
+    from src.commands.multi_instance_commands import handle_reconnect_instances_command
+    handle_reconnect_instances_command(ctx.chat_id)
+
+
+def _cmd_docker_list(ctx: _CommandContext) -> None:
+    from src.commands.docker_commands import handle_docker_list_command
+    handle_docker_list_command(ctx.docker_manager, ctx.chat_id)
+
+
+def _cmd_docker_container(action: str, ctx: _CommandContext) -> None:
+    from src.commands import docker_commands
+    handler = getattr(docker_commands, f"handle_docker_{action}_command")
+    handler(ctx.docker_manager, ctx.chat_id, ctx.args or None)
+
+
+def _cmd_docker_logs(ctx: _CommandContext) -> None:
+    from src.commands.docker_commands import handle_docker_logs_command
+    parts = ctx.args.split()
+    container_name = parts[0] if parts else None
+    handle_docker_logs_command(ctx.docker_manager, ctx.chat_id, container_name, _int_arg(parts, 1, 30))
+
+
+def _cmd_ytsbr_download(ctx: _CommandContext) -> None:
+    from src.commands.ytsbr_commands import handle_ytsbr_download_by_number
+    if not ctx.args:
+        send_telegram("❌ Use: `/ytsbr_baixar [número]`\nExemplo: `/ytsbr_baixar 1`", ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+        return
     try:
-        resp = requests.get(url, params=params, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        number = int(ctx.args)
+    except ValueError:
+        send_telegram("❌ Número inválido. Use apenas números.\n\n*Exemplo:* `/ytsbr_baixar 1`", ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+        return
+    handle_ytsbr_download_by_number(number, ctx.user_id, ctx.chat_id, ctx.add_magnet_func, ctx.sess, ctx.qb_url)
 
-        if not data.get('ok', False):
-            logger.error(f"Resposta inesperada da API do Telegram: {data}")
-            return last_update_id
 
-        updates = data.get('result', [])
-        new_last_id = last_update_id
+def _cmd_ytsbr_genres(media_type: str, ctx: _CommandContext) -> None:
+    from src.commands.ytsbr_commands import handle_ytsbr_genres
+    handle_ytsbr_genres(media_type, ctx.chat_id, ctx.user_id)
 
-        for update in updates:
-            try:
-                update_id = update.get('update_id')
-                if update_id is None:
-                    continue
-                new_last_id = max(new_last_id, update_id)
 
-                if 'callback_query' in update:
-                    callback_query = update['callback_query']
-                    callback_id = callback_query.get('id')
-                    callback_data = callback_query.get('data', '')
-                    chat_id = callback_query.get('message', {}).get('chat', {}).get('id')
-                    user_id = str(callback_query.get('from', {}).get('id', ''))
-
-                    if not chat_id or not user_id:
-                        continue
-                    is_authorized = not AUTHORIZED_USERS or user_id in AUTHORIZED_USERS
-                    if not is_authorized:
-                        answer_callback_query(callback_id, "❌ Você não tem permissão para usar este bot.")
-                        continue
-                    answer_callback_query(callback_id)
-
-                    if callback_data == 'torrent_refresh':
-                        list_torrents(sess, qb_url, chat_id)
-                    elif callback_data == 'torrent_pause_all':
-                        handle_pause_all_torrents(sess, qb_url, chat_id)
-                    elif callback_data == 'torrent_resume_all':
-                        handle_resume_all_torrents(sess, qb_url, chat_id)
-                    elif callback_data == 'torrent_details':
-                        help_text = """
-<b>📋 AJUDA - GERENCIADOR DE TORRENTS</b>
+def _cmd_ytsbr_by_genre(media_type: str, usage: str, ctx: _CommandContext) -> None:
+    from src.commands.ytsbr_commands import handle_ytsbr_by_genre
+    if not ctx.args:
+        send_telegram(usage, ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+        return
+    handle_ytsbr_by_genre(ctx.args, media_type, ctx.chat_id, ctx.user_id)
 
-<b>Botões disponíveis:</b>
-• 🔄 <b>Atualizar Lista</b> - Atualiza a lista de torrents
-• ⏸️ <b>Pausar Todos</b> - Pausa todos os torrents ativos
-• ▶️ <b>Retomar Todos</b> - Retoma todos os torrents pausados
-• 📋 <b>Detalhes</b> - Mostra esta mensagem de ajuda
 
-<b>Estados dos torrents:</b>
-• 📥 <b>Downloads Ativos</b> - Torrents sendo baixados
-• ⏸️ <b>Pausados</b> - Torrents pausados manualmente
-• ✅ <b>Finalizados/Seeding</b> - Torrents completos
-• ❌ <b>Com Erro</b> - Torrents com problemas
+def _cmd_ytsbr_search(media_type: str, ctx: _CommandContext) -> None:
+    from src.commands.ytsbr_commands import handle_ytsbr_search, handle_ytsbr_popular
+    if ctx.args:
+        handle_ytsbr_search(ctx.args, media_type, ctx.chat_id, ctx.user_id)
+    else:
+        handle_ytsbr_popular(media_type, ctx.chat_id, ctx.user_id)
 
-<b>Comandos úteis:</b>
-• /qtorrents - Listar torrents
-• /qespaco - Ver espaço em disco
-"""
-                        send_telegram(help_text, chat_id, parse_mode="HTML", use_keyboard=True)
-                    continue
 
-                message = update.get('message', {})
-                text = message.get('text', '').strip()
-                chat_id = message.get('chat', {}).get('id')
-                user_id = str(message.get('from', {}).get('id', ''))
+def _cmd_rede_download(ctx: _CommandContext) -> None:
+    from src.integrations.redetorrent.commands import handle_redetorrent_download_by_number
+    if not ctx.args:
+        send_telegram("❌ Use: `/rede_baixar [número]`\nExemplo: `/rede_baixar 1`", ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+        return
+    try:
+        number = int(ctx.args)
+    except ValueError:
+        send_telegram("❌ Número inválido. Use apenas números.\n\n*Exemplo:* `/rede_baixar 1`", ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+        return
+    handle_redetorrent_download_by_number(number, ctx.user_id, ctx.chat_id, ctx.add_magnet_func, ctx.sess, ctx.qb_url, ctx.multi_instance_manager)
+
+
+def _cmd_rede_genres(media_type: str, ctx: _CommandContext) -> None:
+    from src.integrations.redetorrent.commands import handle_redetorrent_genres
+    handle_redetorrent_genres(media_type, ctx.chat_id, ctx.user_id)
+
+
+def _cmd_rede_by_genre(media_type: str, usage: str, ctx: _CommandContext) -> None:
+    from src.integrations.redetorrent.commands import handle_redetorrent_by_genre
+    if not ctx.args:
+        send_telegram(usage, ctx.chat_id, parse_mode="Markdown", use_keyboard=True)
+        return
+    handle_redetorrent_by_genre(ctx.args, media_type, ctx.chat_id, ctx.user_id)
+
+
+def _cmd_rede_search(popular_type: str, search_type: str, ctx: _CommandContext) -> None:
+    from src.integrations.redetorrent.commands import handle_redetorrent_search, handle_redetorrent_popular
+    if ctx.args:
+        handle_redetorrent_search(ctx.args, search_type, ctx.chat_id, ctx.user_id)
+    else:
+        handle_redetorrent_popular(popular_type, ctx.chat_id, ctx.user_id)
+
+
+def _cmd_rede_popular(media_type: str, ctx: _CommandContext) -> None:
+    from src.integrations.redetorrent.commands import handle_redetorrent_popular
+    handle_redetorrent_popular(media_type, ctx.chat_id, ctx.user_id)
+
+
+# Comando (sem argumentos nem @bot) -> _TextCommand; /start e /qespaco valem para qualquer usuário.
+# Busca exata no dict, então /ytsbr_series não cai mais no /ytsbr por ser prefixo dele.
+TEXT_COMMANDS: Dict[str, _TextCommand] = {
+    '/start': _TextCommand(_cmd_start, requires_auth=False),
+    '/qespaco': _TextCommand(_cmd_qespaco, requires_auth=False),
+    '/qtorrents': _TextCommand(_cmd_qtorrents),
+    '/stats': _TextCommand(_cmd_stats),
+    '/history': _TextCommand(_cmd_history),
+    '/sync': _TextCommand(_cmd_sync),
+    '/sync_status': _TextCommand(_cmd_sync_status),
+    '/priority': _TextCommand(_cmd_priority),
+    '/remove': _TextCommand(_cmd_remove),
+    '/instances': _TextCommand(_cmd_instances),
+    '/torrents_multi': _TextCommand(_cmd_torrents_multi),
+    '/refresh_storage': _TextCommand(_cmd_refresh_storage),
+    '/reconnect_instances': _TextCommand(_cmd_reconnect_instances),
+    '/docker_list': _TextCommand(_cmd_docker_list),
+    '/docker_start': _TextCommand(partial(_cmd_docker_container, 'start')),
+    '/docker_stop': _TextCommand(partial(_cmd_docker_container, 'stop')),
+    '/docker_restart': _TextCommand(partial(_cmd_docker_container, 'restart')),
+    '/docker_stats': _TextCommand(partial(_cmd_docker_container, 'stats')),
+    '/docker_logs': _TextCommand(_cmd_docker_logs),
+    '/ytsbr_baixar': _TextCommand(_cmd_ytsbr_download),
+    '/ytsbr': _TextCommand(partial(_cmd_ytsbr_search, 'movie')),
+    '/ytsbr_series': _TextCommand(partial(_cmd_ytsbr_search, 'series')),
+    '/ytsbr_anime': _TextCommand(partial(_cmd_ytsbr_search, 'anime')),
+    '/ytsbr_generos': _TextCommand(partial(_cmd_ytsbr_genres, 'movie')),
+    '/ytsbr_series_generos': _TextCommand(partial(_cmd_ytsbr_genres, 'series')),
+    '/ytsbr_anime_generos': _TextCommand(partial(_cmd_ytsbr_genres, 'anime')),
+    '/ytsbr_genero': _TextCommand(partial(
+        _cmd_ytsbr_by_genre, 'movie',
+        "❌ Use: `/ytsbr_genero [nome do gênero]`\nExemplo: `/ytsbr_genero acao`\n\nPara ver gêneros disponíveis: `/ytsbr_generos`",
+    )),
+    '/ytsbr_series_genero': _TextCommand(partial(
+        _cmd_ytsbr_by_genre, 'series',
+        "❌ Use: `/ytsbr_series_genero [nome do gênero]`\nExemplo: `/ytsbr_series_genero drama`\n\nPara ver gêneros disponíveis: `/ytsbr_series_generos`",
+    )),
+    '/ytsbr_anime_genero': _TextCommand(partial(
+        _cmd_ytsbr_by_genre, 'anime',
+        "❌ Use: `/ytsbr_anime_genero [nome do gênero]`\nExemplo: `/ytsbr_anime_genero acao`\n\nPara ver gêneros disponíveis: `/ytsbr_anime_generos`",
+    )),
+    '/rede_baixar': _TextCommand(_cmd_rede_download),
+    '/rede': _TextCommand(partial(_cmd_rede_search, 'movie', 'all')),
+    '/rede_series': _TextCommand(partial(_cmd_rede_search, 'series', 'series')),
+    '/rede_desenhos': _TextCommand(partial(_cmd_rede_search, 'desenho', 'desenho')),
+    '/rede_dublados': _TextCommand(partial(_cmd_rede_popular, 'dublado')),
+    '/rede_legendados': _TextCommand(partial(_cmd_rede_popular, 'legendado')),
+    '/rede_lancamentos': _TextCommand(partial(_cmd_rede_popular, 'lancamento')),
+    '/rede_generos': _TextCommand(partial(_cmd_rede_genres, 'movie')),
+    '/rede_series_generos': _TextCommand(partial(_cmd_rede_genres, 'series')),
+    '/rede_desenhos_generos': _TextCommand(partial(_cmd_rede_genres, 'desenho')),
+    '/rede_genero': _TextCommand(partial(
+        _cmd_rede_by_genre, 'movie',
+        "❌ Use: `/rede_genero [nome do gênero]`\nExemplo: `/rede_genero acao`\n\nPara ver gêneros disponíveis: `/rede_generos`",
+    )),
+    '/rede_series_genero': _TextCommand(partial(
+        _cmd_rede_by_genre, 'series',
+        "❌ Use: `/rede_series_genero [nome do gênero]`\nExemplo: `/rede_series_genero drama`\n\nPara ver gêneros disponíveis: `/rede_series_generos`",
+    )),
+    '/rede_desenhos_genero': _TextCommand(partial(
+        _cmd_rede_by_genre, 'desenho',
+        "❌ Use: `/rede_desenhos_genero [nome do gênero]`\nExemplo: `/rede_desenhos_genero anime`\n\nPara ver gêneros disponíveis: `/rede_desenhos_generos`",
+    )),
+}
+
+
+def _process_update(update: dict, sess, add_magnet_func, qb_url: str, jellyfin_manager=None, sync_manager=None, stats_manager=None, docker_manager=None, multi_instance_manager=None, gostream_manager=None) -> None:
+    """Processa um único update do Telegram (mensagem ou callback)"""
+    try:
+        if 'callback_query' in update:
+            callback_query = update['callback_query']
+            callback_id = callback_query.get('id')
+            callback_data = callback_query.get('data', '')
+            chat_id = callback_query.get('message', {}).get('chat', {}).get('id')
+            user_id = str(callback_query.get('from', {}).get('id', ''))
+
+            if not chat_id or not user_id:
+                return
+            is_authorized = not AUTHORIZED_USERS or user_id in AUTHORIZED_USERS
+            if not is_authorized:
+                answer_callback_query(callback_id, "❌ Você não tem permissão para usar este bot.")
+                return
+            answer_callback_query(callback_id)
+
+            callback_handler = CALLBACK_HANDLERS.get(callback_data)
+            if callback_handler:
+                callback_handler(sess, qb_url, chat_id)
+            return
 
-                if not text or not chat_id or not user_id:
-                    continue
+        message = update.get('message', {})
+        text = message.get('text', '').strip()
+        chat_id = message.get('chat', {}).get('id')
+        user_id = str(message.get('from', {}).get('id', ''))
 
-                is_authorized = not AUTHORIZED_USERS or user_id in AUTHORIZED_USERS
-
-                keyboard_command_map = {
-                    "📊 Status do Servidor": "/status",
-                    "📦 Listar Torrents": "/qtorrents",
-                    "💾 Espaço em Disco": "/qespaco",
-                    "🎬 Itens Recentes": "/recent",
-                    "🎭 Recentes Detalhado": "/recentes",
-                    "📚 Bibliotecas": "/libraries",
-                    "🎥 YouTube": "/youtube",
-                    "🎬 Buscar Filmes": "/ytsbr",
-                    "📺 Buscar Séries": "/ytsbr_series",
-                    "🎌 Buscar Animes": "/ytsbr_anime",
-                    "🌐 Rede Filmes": "/rede",
-                    "📺 Rede Séries": "/rede_series",
-                    "🎨 Rede Desenhos": "/rede_desenhos",
-                    "🆕 Rede Lançamentos": "/rede_lancamentos",
-                    "❓ Ajuda": "/start",
-                }
-                text = keyboard_command_map.get(text, text)
-
-                if text == "/start" or text == "❓ Ajuda":
-                    WELCOME_MESSAGE = """
-                    🤖 *Bem-vindo ao Bot de Gerenciamento de Mídia* 🤖
-                    
-                    *Comandos disponíveis:*
-                    - /start - Mostrar esta mensagem
-                    - /qespaco - Mostrar espaço em disco
-                    - /qtorrents - Listar torrents ativos
-                    - /magnet - Adicionar torrent via magnet link
-                    - /recent - Ver itens recentes do Jellyfin
-                    - /recentes - Ver itens recentemente adicionados (detalhado)
-                    - /libraries - Listar bibliotecas do Jellyfin
-                    - /status - Status do servidor Jellyfin
-                    - /youtube - Baixar vídeo do YouTube
-                    
-                    Ou use os botões abaixo para navegar facilmente!"""
-                    send_telegram(WELCOME_MESSAGE, chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
+        if not text or not chat_id or not user_id:
+            return
 
-                elif text == "/qespaco":
-                    logger.debug(f"Comando /qespaco - multi_instance_manager: {multi_instance_manager}, sess: {sess}")
-                    if multi_instance_manager:
-                        # Modo multi-instância: mostrar espaço de todas as instâncias
-                        logger.info("Usando modo multi-instância para /qespaco")
-                        from src.commands.multi_instance_commands import handle_instances_command
-                        handle_instances_command(chat_id)
-                    else:
-                        # Modo instância única
-                        logger.info("Usando modo instância única para /qespaco")
-                        disk_info = get_disk_space_info(sess, qb_url, chat_id)
-                        send_telegram(disk_info, chat_id, parse_mode="HTML", use_keyboard=True)
-                    continue
+        is_authorized = not AUTHORIZED_USERS or user_id in AUTHORIZED_USERS
+
+        text = KEYBOARD_COMMAND_MAP.get(text, text)
+
+        # O comando é separado uma vez; "/cmd@NomeDoBot" (grupos) vale como "/cmd"
+        command, *rest = text.split(maxsplit=1)
+        args = rest[0] if rest else ''
+        command = command.partition('@')[0]
+        text_command = TEXT_COMMANDS.get(command)
+        if text_command:
+            if text_command.requires_auth and not is_authorized:
+                send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
+                return
+            text_command.handler(_CommandContext(
+                chat_id, user_id, args, sess, add_magnet_func, qb_url,
+                sync_manager, stats_manager, docker_manager, multi_instance_manager,
+            ))
+            return
 
-                elif text == "/qtorrents":
-                    if not is_authorized:
-                        send_telegram("Você não tem permissão para executar este comando.", chat_id)
-                        continue
-                    
-                    logger.debug(f"Comando /qtorrents - multi_instance_manager: {multi_instance_manager}, sess: {sess}")
-                    if multi_instance_manager:
-                        # Modo multi-instância: listar torrents de todas as instâncias
-                        logger.info("Usando modo multi-instância para /qtorrents")
-                        from src.commands.multi_instance_commands import handle_torrents_multi_command
-                        handle_torrents_multi_command(chat_id)
-                    else:
-                        # Modo instância única
-                        logger.info("Usando modo instância única para /qtorrents")
-                        list_torrents(sess, qb_url, chat_id)
-                    continue
+        if command == "/recent" and jellyfin_manager:
+            if not is_authorized:
+                send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
+                return
+            send_chat_action(chat_id)
+            recent_text = jellyfin_manager.get_recent_items_text()
+            send_telegram(recent_text, chat_id, parse_mode="Markdown", use_keyboard=True)
+            return
 
-                elif text == "/recent" and jellyfin_manager:
-                    if not is_authorized:
-                        send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    recent_text = jellyfin_manager.get_recent_items_text()
-                    send_telegram(recent_text, chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
+        elif command == "/recentes" and jellyfin_manager:
+            if not is_authorized:
+                send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
+                return
+            send_chat_action(chat_id)
+            recent_detailed = get_recent_items_detailed(jellyfin_manager, 8)
+            send_telegram(recent_detailed, chat_id, parse_mode="Markdown", use_keyboard=True)
+            return
 
-                elif text == "/recentes" and jellyfin_manager:
-                    if not is_authorized:
-                        send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    send_telegram("🔍 Buscando itens recentemente adicionados...", chat_id, use_keyboard=True)
-                    recent_detailed = get_recent_items_detailed(jellyfin_manager, 8)
-                    send_telegram(recent_detailed, chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
+        elif command == "/libraries" and jellyfin_manager:
+            if not is_authorized:
+                send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
+                return
+            send_chat_action(chat_id)
+            libraries_text = jellyfin_manager.get_libraries_text()
+            send_telegram(libraries_text, chat_id, parse_mode="Markdown", use_keyboard=True)
+            return
 
-                elif text == "/libraries" and jellyfin_manager:
-                    if not is_authorized:
-                        send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    libraries_text = jellyfin_manager.get_libraries_text()
-                    send_telegram(libraries_text, chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
+        elif command == "/status" and jellyfin_manager:
+            if not is_authorized:
+                send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
+                return
+            send_chat_action(chat_id)
+            status_text = jellyfin_manager.get_status_text()
+            send_telegram(status_text, chat_id, parse_mode="Markdown", use_keyboard=True)
+            return
 
-                elif text == "/status" and jellyfin_manager:
-                    if not is_authorized:
-                        send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    status_text = jellyfin_manager.get_status_text()
-                    send_telegram(status_text, chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
+        elif command == "/magnet":
+            if not is_authorized:
+                send_telegram("❌ Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
+                return
 
-                elif text.startswith("/magnet"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    
-                    # Extrair o magnet link do comando
-                    parts = text.split(maxsplit=1)
-                    if len(parts) < 2:
-                        # Sem magnet link fornecido, mostrar ajuda
-                        magnet_help = """
+            # Extrair o magnet link do comando
+            parts = text.split(maxsplit=1)
+            if len(parts) < 2:
+                # Sem magnet link fornecido, mostrar ajuda
+                magnet_help = """
 🧲 *Adicionar Torrent via Magnet Link*
 
 *Como usar:*
@@ -321,54 +636,52 @@ def process_messages(sess, last_update_id: int, add_magnet_func, qb_url: str, je
 • Com parâmetros adicionais (dn, xl, tr, etc.)
 
 📝 *Dica:* Você pode enviar o magnet link diretamente sem usar o comando!"""
-                        send_telegram(magnet_help, chat_id, parse_mode="Markdown", use_keyboard=True)
-                        continue
-                    
-                    # Processar o magnet link fornecido
-                    magnet_text = parts[1]
-                    from src.utils.magnet_parser import extract_magnet_links, format_magnet_info
-                    
-                    magnet_links = extract_magnet_links(magnet_text)
-                    
-                    if not magnet_links:
-                        send_telegram("❌ Magnet link inválido. Verifique o formato e tente novamente.", chat_id, use_keyboard=True)
-                        continue
-                    
-                    for magnet_obj in magnet_links:
-                        try:
-                            # Mostrar informações do torrent antes de adicionar
-                            info_msg = format_magnet_info(magnet_obj)
+                send_telegram(magnet_help, chat_id, parse_mode="Markdown", use_keyboard=True)
+                return
+
+            # Processar o magnet link fornecido
+            magnet_text = parts[1]
+            magnet_links = extract_magnet_links(magnet_text)
+
+            if not magnet_links:
+                send_telegram("❌ Magnet link inválido. Verifique o formato e tente novamente.", chat_id, use_keyboard=True)
+                return
+
+            for magnet_obj in magnet_links:
+                try:
+                    # Mostrar informações do torrent antes de adicionar
+                    info_msg = format_magnet_info(magnet_obj)
+                    send_telegram(
+                        f"{info_msg}\n\n⏳ Adicionando torrent, aguarde...",
+                        chat_id,
+                        parse_mode="HTML"
+                    )
+
+                    if multi_instance_manager:
+                        from src.commands.multi_instance_commands import handle_add_magnet_multi
+                        handle_add_magnet_multi(magnet_obj.raw_link, chat_id)
+                    else:
+                        result = add_magnet_func(sess, qb_url, magnet_obj.raw_link)
+                        if result:
                             send_telegram(
-                                f"{info_msg}\n\n⏳ Adicionando torrent, aguarde...",
+                                f"✅ <b>Torrent adicionado com sucesso!</b>\n\n"
+                                f"📝 {magnet_obj.get_display_name()}",
                                 chat_id,
-                                parse_mode="HTML"
+                                parse_mode="HTML",
+                                use_keyboard=True
                             )
-                            
-                            if multi_instance_manager:
-                                from src.commands.multi_instance_commands import handle_add_magnet_multi
-                                handle_add_magnet_multi(magnet_obj.raw_link, chat_id)
-                            else:
-                                result = add_magnet_func(sess, qb_url, magnet_obj.raw_link)
-                                if result:
-                                    send_telegram(
-                                        f"✅ <b>Torrent adicionado com sucesso!</b>\n\n"
-                                        f"📝 {magnet_obj.get_display_name()}",
-                                        chat_id,
-                                        parse_mode="HTML",
-                                        use_keyboard=True
-                                    )
-                                else:
-                                    send_telegram("❌ Falha ao adicionar o torrent.", chat_id, use_keyboard=True)
-                        except Exception as e:
-                            logger.error(f"Erro ao adicionar magnet link via comando /magnet: {e}")
-                            send_telegram(f"❌ Erro ao adicionar torrent: {str(e)}", chat_id, use_keyboard=True)
-                    continue
+                        else:
+                            send_telegram("❌ Falha ao adicionar o torrent.", chat_id, use_keyboard=True)
+                except Exception as e:
+                    logger.error(f"Erro ao adicionar magnet link via comando /magnet: {e}")
+                    send_telegram(f"❌ Erro ao adicionar torrent: {str(e)}", chat_id, use_keyboard=True)
+            return
 
-                elif text == "/youtube":
-                    if not is_authorized:
-                        send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    youtube_help = """
+        elif command == "/youtube" and not is_youtube_url(args):
+            if not is_authorized:
+                send_telegram("Você não tem permissão para executar este comando.", chat_id, use_keyboard=True)
+                return
+            youtube_help = """
 🎥 *Download de Vídeos do YouTube*
 
 *Como usar:*
@@ -387,480 +700,162 @@ def process_messages(sess, last_update_id: int, add_magnet_func, qb_url: str, je
 • Sem playlists (apenas vídeos individuais)
 
 📝 *Dica:* Você pode enviar o link diretamente sem usar o comando!"""
-                    send_telegram(youtube_help, chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
-
-                elif text.startswith("/stats"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.telegram_commands import handle_stats_command
-                    parts = text.split()
-                    hours = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 24
-                    handle_stats_command(stats_manager, chat_id, hours)
-                    continue
-
-                elif text.startswith("/history"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.telegram_commands import handle_history_command
-                    parts = text.split()
-                    days = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 7
-                    handle_history_command(stats_manager, chat_id, days)
-                    continue
-
-                elif text == "/sync":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.telegram_commands import handle_sync_command
-                    handle_sync_command(sync_manager, chat_id)
-                    continue
-
-                elif text == "/sync_status":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.telegram_commands import handle_sync_status_command
-                    handle_sync_status_command(sync_manager, chat_id)
-                    continue
-
-                elif text.startswith("/priority"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.telegram_commands import handle_priority_command
-                    parts = text.split()
-                    torrent_hash = parts[1] if len(parts) > 1 else None
-                    priority = parts[2] if len(parts) > 2 else None
-                    handle_priority_command(sess, qb_url, chat_id, torrent_hash, priority)
-                    continue
-
-                elif text.startswith("/remove"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.telegram_commands import handle_remove_command
-                    parts = text.split()
-                    torrent_hash = parts[1] if len(parts) > 1 else None
-                    delete_files = len(parts) > 2 and parts[2].lower() == 'delete'
-                    handle_remove_command(sess, qb_url, chat_id, torrent_hash, delete_files)
-                    continue
-
-                elif text == "/instances":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.multi_instance_commands import handle_instances_command
-                    handle_instances_command(chat_id)
-                    continue
-
-                elif text == "/torrents_multi":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.multi_instance_commands import handle_torrents_multi_command
-                    handle_torrents_multi_command(chat_id)
-                    continue
-
-                elif text == "/refresh_storage":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.multi_instance_commands import handle_refresh_storage_command
-                    handle_refresh_storage_command(chat_id)
-                    continue
-
-                elif text == "/reconnect_instances":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.multi_instance_commands import handle_reconnect_instances_command
-                    handle_reconnect_instances_command(chat_id)
-                    continue
-
-                elif text == "/docker_list":
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.docker_commands import handle_docker_list_command
-                    handle_docker_list_command(docker_manager, chat_id)
-                    continue
-
-                elif text.startswith("/docker_start"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.docker_commands import handle_docker_start_command
-                    parts = text.split(maxsplit=1)
-                    container_name = parts[1] if len(parts) > 1 else None
-                    handle_docker_start_command(docker_manager, chat_id, container_name)
-                    continue
-
-                elif text.startswith("/docker_stop"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.docker_commands import handle_docker_stop_command
-                    parts = text.split(maxsplit=1)
-                    container_name = parts[1] if len(parts) > 1 else None
-                    handle_docker_stop_command(docker_manager, chat_id, container_name)
-                    continue
-
-                elif text.startswith("/docker_restart"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.docker_commands import handle_docker_restart_command
-                    parts = text.split(maxsplit=1)
-                    container_name = parts[1] if len(parts) > 1 else None
-                    handle_docker_restart_command(docker_manager, chat_id, container_name)
-                    continue
-
-                elif text.startswith("/docker_stats"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.docker_commands import handle_docker_stats_command
-                    parts = text.split(maxsplit=1)
-                    container_name = parts[1] if len(parts) > 1 else None
-                    handle_docker_stats_command(docker_manager, chat_id, container_name)
-                    continue
-
-                elif text.startswith("/docker_logs"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.docker_commands import handle_docker_logs_command
-                    parts = text.split()
-                    container_name = parts[1] if len(parts) > 1 else None
-                    tail = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 30
-                    handle_docker_logs_command(docker_manager, chat_id, container_name, tail)
-                    continue
-
-                elif text.startswith("/ytsbr_baixar"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_download_by_number
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/ytsbr_baixar [número]`\nExemplo: `/ytsbr_baixar 1`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        try:
-                            number = int(parts[1])
-                            handle_ytsbr_download_by_number(number, user_id, chat_id, add_magnet_func, sess, qb_url)
-                        except ValueError:
-                            send_telegram("❌ Número inválido. Use apenas números.\n\n*Exemplo:* `/ytsbr_baixar 1`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
-
-                elif text.startswith("/ytsbr_generos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_genres
-                    handle_ytsbr_genres("movie", chat_id)
-                    continue
-
-                elif text.startswith("/ytsbr_genero"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_by_genre
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/ytsbr_genero [nome do gênero]`\nExemplo: `/ytsbr_genero acao`\n\nPara ver gêneros disponíveis: `/ytsbr_generos`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        handle_ytsbr_by_genre(parts[1], "movie", chat_id, user_id)
-                    continue
-
-                elif text.startswith("/ytsbr_series_generos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_genres
-                    handle_ytsbr_genres("series", chat_id, user_id)
-                    continue
-
-                elif text.startswith("/ytsbr_series_genero"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_by_genre
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/ytsbr_series_genero [nome do gênero]`\nExemplo: `/ytsbr_series_genero drama`\n\nPara ver gêneros disponíveis: `/ytsbr_series_generos`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        handle_ytsbr_by_genre(parts[1], "series", chat_id, user_id)
-                    continue
-
-                elif text.startswith("/ytsbr_anime_generos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_genres
-                    handle_ytsbr_genres("anime", chat_id, user_id)
-                    continue
+            send_telegram(youtube_help, chat_id, parse_mode="Markdown", use_keyboard=True)
+            return
 
-                elif text.startswith("/ytsbr_anime_genero"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_by_genre
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/ytsbr_anime_genero [nome do gênero]`\nExemplo: `/ytsbr_anime_genero acao`\n\nPara ver gêneros disponíveis: `/ytsbr_anime_generos`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        handle_ytsbr_by_genre(parts[1], "anime", chat_id, user_id)
-                    continue
+        elif "redetorrent.com/" in text:
+            if not is_authorized:
+                send_telegram("❌ Você não tem permissão para baixar torrents.", chat_id, use_keyboard=True)
+                return
+            from src.integrations.redetorrent.commands import handle_redetorrent_details
+            url_match = _REDETORRENT_URL_RE.search(text)
+            if url_match:
+                handle_redetorrent_details(url_match.group(0), chat_id, add_magnet_func, sess, qb_url, multi_instance_manager)
+            return
 
-                elif text.startswith("/ytsbr"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_search, handle_ytsbr_popular
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        handle_ytsbr_popular("movie", chat_id, user_id)
-                    else:
-                        handle_ytsbr_search(parts[1], "movie", chat_id, user_id)
-                    continue
+        elif "ytsbr.com/" in text and any(x in text for x in ["/filme/", "/serie/", "/anime/"]):
+            if not is_authorized:
+                send_telegram("❌ Você não tem permissão para baixar torrents.", chat_id, use_keyboard=True)
+                return
+            from src.commands.ytsbr_commands import handle_ytsbr_details
+            url_match = _YTSBR_URL_RE.search(text)
+            if url_match:
+                handle_ytsbr_details(url_match.group(0), chat_id, add_magnet_func, sess, qb_url)
+            return
 
-                elif text.startswith("/ytsbr_series"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_search, handle_ytsbr_popular
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        handle_ytsbr_popular("series", chat_id, user_id)
-                    else:
-                        handle_ytsbr_search(parts[1], "series", chat_id, user_id)
-                    continue
+        # "/youtube <link>" baixa o link passado como argumento, igual ao link enviado direto
+        youtube_url = args if command == "/youtube" else text
+        if is_youtube_url(youtube_url):
+            if not is_authorized:
+                send_telegram("❌ Você não tem permissão para baixar vídeos do YouTube.", chat_id, use_keyboard=True)
+                return
+            try:
+                # process_messages é síncrono (sem loop rodando): agenda no loop compartilhado
+                submit(process_youtube_download(youtube_url, chat_id))
+            except Exception as e:
+                logger.error(f"Erro ao processar download do YouTube: {e}")
+                send_telegram(f"❌ Erro ao processar o vídeo do YouTube: {str(e)}", chat_id, use_keyboard=True)
+            return
 
-                elif text.startswith("/ytsbr_anime"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_search, handle_ytsbr_popular
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        handle_ytsbr_popular("anime", chat_id, user_id)
-                    else:
-                        handle_ytsbr_search(parts[1], "anime", chat_id, user_id)
-                    continue
+        # Usar parser de magnet links melhorado
+        magnet_links = extract_magnet_links(text)
 
-                elif text.startswith("/rede_baixar"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_download_by_number
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/rede_baixar [número]`\nExemplo: `/rede_baixar 1`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        try:
-                            number = int(parts[1])
-                            handle_redetorrent_download_by_number(number, user_id, chat_id, add_magnet_func, sess, qb_url, multi_instance_manager)
-                        except ValueError:
-                            send_telegram("❌ Número inválido. Use apenas números.\n\n*Exemplo:* `/rede_baixar 1`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    continue
+        if not magnet_links:
+            return
+        if not is_authorized:
+            send_telegram("❌ Você não tem permissão para adicionar torrents.", chat_id)
+            return
 
-                elif text.startswith("/rede_generos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_genres
-                    handle_redetorrent_genres("movie", chat_id)
-                    continue
+        if multi_instance_manager:
+            from src.commands.multi_instance_commands import handle_add_magnet_multi
+            # Cada magnet pode ir para uma instância diferente: adicionados um a um
+            for magnet_obj in magnet_links:
+                try:
+                    # Mostrar informações do torrent antes de adicionar
+                    info_msg = format_magnet_info(magnet_obj)
+                    send_telegram(
+                        f"{info_msg}\n\n⏳ Adicionando torrent, aguarde...",
+                        chat_id,
+                        parse_mode="HTML"
+                    )
+                    handle_add_magnet_multi(magnet_obj.raw_link, chat_id)
+                except Exception as e:
+                    logger.error(f"Erro ao adicionar magnet link: {e}")
+                    send_telegram(f"❌ Erro ao adicionar torrent: {str(e)}", chat_id)
+            return
 
-                elif text.startswith("/rede_genero"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_by_genre
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/rede_genero [nome do gênero]`\nExemplo: `/rede_genero acao`\n\nPara ver gêneros disponíveis: `/rede_generos`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        handle_redetorrent_by_genre(parts[1], "movie", chat_id, user_id)
-                    continue
+        # Instância única: o /torrents/add aceita vários links (um por linha), então todos os
+        # magnets da mensagem vão numa requisição, com um aviso antes e um resultado depois
+        try:
+            info_msg = "\n\n".join(format_magnet_info(magnet_obj) for magnet_obj in magnet_links)
+            send_telegram(
+                f"{info_msg}\n\n⏳ Adicionando torrent, aguarde...",
+                chat_id,
+                parse_mode="HTML"
+            )
+
+            result = add_magnet_func(sess, qb_url, "\n".join(magnet_obj.raw_link for magnet_obj in magnet_links))
+            if result:
+                count = len(magnet_links)
+                title = "Torrent adicionado com sucesso!" if count == 1 else f"{count} torrents adicionados com sucesso!"
+                names = "\n".join(f"📝 {magnet_obj.get_display_name()}" for magnet_obj in magnet_links)
+                send_telegram(
+                    f"✅ <b>{title}</b>\n\n{names}",
+                    chat_id,
+                    parse_mode="HTML"
+                )
+            else:
+                send_telegram("❌ Falha ao adicionar o torrent.", chat_id)
+        except Exception as e:
+            logger.error(f"Erro ao adicionar magnet link: {e}")
+            send_telegram(f"❌ Erro ao adicionar torrent: {str(e)}", chat_id)
 
-                elif text.startswith("/rede_series_generos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_genres
-                    handle_redetorrent_genres("series", chat_id, user_id)
-                    continue
+    except Exception as e:
+        logger.error(f"Erro ao processar mensagem: {e}")
+        logger.error(traceback.format_exc())
 
-                elif text.startswith("/rede_series_genero"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_by_genre
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/rede_series_genero [nome do gênero]`\nExemplo: `/rede_series_genero drama`\n\nPara ver gêneros disponíveis: `/rede_series_generos`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        handle_redetorrent_by_genre(parts[1], "series", chat_id, user_id)
-                    continue
 
-                elif text.startswith("/rede_desenhos_generos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_genres
-                    handle_redetorrent_genres("desenho", chat_id, user_id)
-                    continue
+def _poll_backoff(shutdown: Optional[threading.Event] = None) -> None:
+    """Espera antes de repetir o getUpdates que falhou; o atraso cresce enquanto as falhas se repetem
 
-                elif text.startswith("/rede_desenhos_genero"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_by_genre
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        send_telegram("❌ Use: `/rede_desenhos_genero [nome do gênero]`\nExemplo: `/rede_desenhos_genero anime`\n\nPara ver gêneros disponíveis: `/rede_desenhos_generos`", chat_id, parse_mode="Markdown", use_keyboard=True)
-                    else:
-                        handle_redetorrent_by_genre(parts[1], "desenho", chat_id, user_id)
-                    continue
+    Com `shutdown`, a espera termina assim que o bot é encerrado.
+    """
+    global _poll_failures
+    _poll_failures += 1
+    delay = min(POLL_MAX_RETRY_DELAY, POLL_RETRY_DELAY * 2 ** _poll_failures)
+    if shutdown is not None:
+        shutdown.wait(delay)
+    else:
+        time.sleep(delay)
 
-                elif text.startswith("/rede_series"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_search, handle_redetorrent_popular
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        handle_redetorrent_popular("series", chat_id, user_id)
-                    else:
-                        handle_redetorrent_search(parts[1], "series", chat_id, user_id)
-                    continue
 
-                elif text.startswith("/rede_desenhos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_search, handle_redetorrent_popular
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        handle_redetorrent_popular("desenho", chat_id, user_id)
-                    else:
-                        handle_redetorrent_search(parts[1], "desenho", chat_id, user_id)
-                    continue
+def process_messages(sess, last_update_id: int, add_magnet_func, qb_url: str, jellyfin_manager=None, sync_manager=None, stats_manager=None, docker_manager=None, multi_instance_manager=None, gostream_manager=None,
+                     shutdown: Optional[threading.Event] = None) -> int:
+    """Faz um long polling do getUpdates e despacha os updates recebidos
 
-                elif text.startswith("/rede_dublados"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_popular
-                    handle_redetorrent_popular("dublado", chat_id, user_id)
-                    continue
+    Bloqueia até POLL_TIMEOUT segundos esperando updates, então pode ser chamada em loop sem pausa;
+    em caso de erro espera (com backoff exponencial, interrompido por `shutdown`) antes de retornar.
+    """
+    global _poll_failures
+    if not TELEGRAM_BOT_TOKEN:
+        logger.error("Token do bot do Telegram não configurado")
+        _poll_backoff(shutdown)
+        return last_update_id
 
-                elif text.startswith("/rede_legendados"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_popular
-                    handle_redetorrent_popular("legendado", chat_id, user_id)
-                    continue
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/getUpdates"
+    params = {'offset': last_update_id + 1, 'timeout': POLL_TIMEOUT, 'allowed_updates': _ALLOWED_UPDATES}
 
-                elif text.startswith("/rede_lancamentos"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_popular
-                    handle_redetorrent_popular("lancamento", chat_id, user_id)
-                    continue
+    try:
+        resp = _poll_session.get(url, params=params, timeout=POLL_TIMEOUT + 5)
+        resp.raise_for_status()
+        data = resp.json()
 
-                elif text.startswith("/rede"):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para usar este comando.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_search, handle_redetorrent_popular
-                    parts = text.split(maxsplit=1)
-                    if len(parts) == 1:
-                        handle_redetorrent_popular("movie", chat_id, user_id)
-                    else:
-                        handle_redetorrent_search(parts[1], "all", chat_id, user_id)
-                    continue
+        if not data.get('ok', False):
+            logger.error(f"Resposta inesperada da API do Telegram: {data}")
+            _poll_backoff(shutdown)
+            return last_update_id
 
-                elif "redetorrent.com/" in text:
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para baixar torrents.", chat_id, use_keyboard=True)
-                        continue
-                    from src.integrations.redetorrent.commands import handle_redetorrent_details
-                    url_match = re.search(r'https?://redetorrent\.com/[^\s]+', text)
-                    if url_match:
-                        handle_redetorrent_details(url_match.group(0), chat_id, add_magnet_func, sess, qb_url, multi_instance_manager)
-                    continue
+        _poll_failures = 0
+        updates = data.get('result', [])
+        new_last_id = last_update_id
 
-                elif "ytsbr.com/" in text and any(x in text for x in ["/filme/", "/serie/", "/anime/"]):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para baixar torrents.", chat_id, use_keyboard=True)
-                        continue
-                    from src.commands.ytsbr_commands import handle_ytsbr_details
-                    url_match = re.search(r'https?://ytsbr\.com/(?:filme|serie|anime)/[^\s]+', text)
-                    if url_match:
-                        handle_ytsbr_details(url_match.group(0), chat_id, add_magnet_func, sess, qb_url)
+        for update in updates:
+            try:
+                update_id = update.get('update_id')
+                if update_id is None:
                     continue
+                new_last_id = max(new_last_id, update_id)
 
-                from src.integrations.youtube.utils import is_youtube_url
-                if is_youtube_url(text):
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para baixar vídeos do YouTube.", chat_id, use_keyboard=True)
-                        continue
-                    try:
-                        asyncio.create_task(process_youtube_download(text, chat_id))
-                    except Exception as e:
-                        logger.error(f"Erro ao processar download do YouTube: {e}")
-                        send_telegram(f"❌ Erro ao processar o vídeo do YouTube: {str(e)}", chat_id, use_keyboard=True)
+                chat_id = _update_chat_id(update)
+                if chat_id is None:
                     continue
-
-                # Usar parser de magnet links melhorado
-                from src.utils.magnet_parser import extract_magnet_links, format_magnet_info
-                
-                magnet_links = extract_magnet_links(text)
-                
-                for magnet_obj in magnet_links:
-                    if not is_authorized:
-                        send_telegram("❌ Você não tem permissão para adicionar torrents.", chat_id)
-                        continue
-                    
-                    try:
-                        # Mostrar informações do torrent antes de adicionar
-                        info_msg = format_magnet_info(magnet_obj)
-                        send_telegram(
-                            f"{info_msg}\n\n⏳ Adicionando torrent, aguarde...",
-                            chat_id,
-                            parse_mode="HTML"
-                        )
-                        
-                        if multi_instance_manager:
-                            from src.commands.multi_instance_commands import handle_add_magnet_multi
-                            # Passar tamanho estimado para seleção inteligente de instância
-                            estimated_size = magnet_obj.size if magnet_obj.size else 0
-                            handle_add_magnet_multi(magnet_obj.raw_link, chat_id)
-                        else:
-                            result = add_magnet_func(sess, qb_url, magnet_obj.raw_link)
-                            if result:
-                                send_telegram(
-                                    f"✅ <b>Torrent adicionado com sucesso!</b>\n\n"
-                                    f"📝 {magnet_obj.get_display_name()}",
-                                    chat_id,
-                                    parse_mode="HTML"
-                                )
-                            else:
-                                send_telegram("❌ Falha ao adicionar o torrent.", chat_id)
-                    except Exception as e:
-                        logger.error(f"Erro ao adicionar magnet link: {e}")
-                        send_telegram(f"❌ Erro ao adicionar torrent: {str(e)}", chat_id)
-
+                # Chats diferentes rodam em paralelo; o mesmo chat mantém a ordem das mensagens
+                _dispatcher.submit(
+                    chat_id, _process_update, update, sess, add_magnet_func, qb_url, jellyfin_manager,
+                    sync_manager, stats_manager, docker_manager, multi_instance_manager, gostream_manager,
+                )
             except Exception as e:
-                logger.error(f"Erro ao processar mensagem: {e}")
-                import traceback
+                logger.error(f"Erro ao despachar update: {e}")
                 logger.error(traceback.format_exc())
 
         return new_last_id
@@ -869,7 +864,7 @@ def process_messages(sess, last_update_id: int, add_magnet_func, qb_url: str, je
         logger.error(f"Erro na requisição para a API do Telegram: {e}")
     except Exception as e:
         logger.error(f"Erro inesperado em process_messages: {e}")
-        import traceback
         logger.error(traceback.format_exc())
 
+    _poll_backoff(shutdown)
     return last_update_id
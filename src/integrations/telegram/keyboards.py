@@ -1,13 +1,33 @@
-def get_main_keyboard() -> dict:
-    keyboard = {
-        'keyboard': [
-            [{'text': '📊 Status do Servidor'}],
-            [{'text': '📦 Listar Torrents'}, {'text': '💾 Espaço em Disco'}],
-            [{'text': '🎬 Itens Recentes'}, {'text': '🎭 Recentes Detalhado'}],
-            [{'text': '📚 Bibliotecas'}, {'text': '🎥 YouTube'}],
-            [{'text': '❓ Ajuda'}],
+# Teclados fixos, montados uma vez e compartilhados entre os envios (tratar como somente leitura)
+MAIN_KEYBOARD = {
+    'keyboard': [
+        [{'text': '📊 Status do Servidor'}],
+        [{'text': '📦 Listar Torrents'}, {'text': '💾 Espaço em Disco'}],
+        [{'text': '🎬 Itens Recentes'}, {'text': '🎭 Recentes Detalhado'}],
+        [{'text': '📚 Bibliotecas'}, {'text': '🎥 YouTube'}],
+        [{'text': '❓ Ajuda'}],
+    ],
+    'resize_keyboard': True,
+    'one_time_keyboard': False,
+}
+
+TORRENT_ACTIONS_KEYBOARD = {
+    'inline_keyboard': [
+        [
+            {'text': '🔄 Atualizar Lista', 'callback_data': 'torrent_refresh'},
+            {'text': '⏸️ Pausar Todos', 'callback_data': 'torrent_pause_all'},
+        ],
+        [
+            {'text': '▶️ Retomar Todos', 'callback_data': 'torrent_resume_all'},
+            {'text': '📋 Detalhes', 'callback_data': 'torrent_details'},
         ],
-        'resize_keyboard': True,
-        'one_time_keyboard': False,
-    }
-    return keyboard
+    ]
+}
+
+
+def get_main_keyboard() -> dict:
+    return MAIN_KEYBOARD
+
+
+def get_torrent_actions_keyboard() -> dict:
+    return TORRENT_ACTIONS_KEYBOARD
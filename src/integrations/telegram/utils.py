@@ -1,20 +1,17 @@
 import logging
-import re
+import os
+import shutil
 from datetime import datetime
 from typing import Optional, Union
+from src.integrations.qbittorrent.client import fetch_torrents, invalidate_torrents_cache
 from src.integrations.telegram.client import send_telegram
+from src.integrations.telegram.keyboards import get_torrent_actions_keyboard
+from src.utils.cache import TTLCache
+from src.utils.formatters import format_bytes
 
 logger = logging.getLogger(__name__)
 
 
-def format_bytes(size: int) -> str:
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.2f} {unit}"
-        size /= 1024.0
-    return f"{size:.2f} PB"
-
-
 def get_recent_items_detailed(jellyfin_manager, limit: int = 10) -> str:
     if not jellyfin_manager or not jellyfin_manager.is_available():
         return "❌ Jellyfin não configurado ou indisponível."
@@ -23,6 +20,7 @@ def get_recent_items_detailed(jellyfin_manager, limit: int = 10) -> str:
         if not items:
             return "📥 Nenhum item recente encontrado."
 
+        clients_by_url = {client.url: client for client in jellyfin_manager.clients}
         messages = ["🎬 **Itens recentemente adicionados (detalhado):**\n"]
         for i, item in enumerate(items, 1):
             name = item.get('Name', 'Sem título')
@@ -41,17 +39,16 @@ def get_recent_items_detailed(jellyfin_manager, limit: int = 10) -> str:
                     date_text = date_obj.strftime('%d/%m/%Y')
                 except Exception:
                     pass
-            overview = item.get('Overview', '')
-            if overview and len(overview) > 150:
-                overview = overview[:150] + "..."
+            overview = item.get('Overview') or ''
+            if overview[150:151]:
+                overview = overview[:150] + '…'
             
             # Busca o cliente correto para gerar o link
             web_link = ''
             if jellyfin_url:
-                for client in jellyfin_manager.clients:
-                    if client.url == jellyfin_url:
-                        web_link = client.get_web_link(item['Id'])
-                        break
+                client = clients_by_url.get(jellyfin_url)
+                if client:
+                    web_link = client.get_web_link(item['Id'])
             elif jellyfin_manager.client:
                 web_link = jellyfin_manager.client.get_web_link(item['Id'])
             
@@ -79,10 +76,26 @@ def get_recent_items_detailed(jellyfin_manager, limit: int = 10) -> str:
         return f"❌ Erro ao buscar itens recentes: {str(e)}"
 
 
+# O espaço em disco muda devagar: /qespaco repetido (Telegram ou WhatsApp) reaproveita a última leitura
+DISK_SPACE_TTL = 30
+_disk_space_cache = TTLCache(default_ttl=DISK_SPACE_TTL, maxsize=16)
+
+
 def get_disk_space_info(sess, qb_url: str, chat_id: int) -> str:
+    if sess is None:
+        return "❌ Não conectado ao qBittorrent."
+    cached = _disk_space_cache.get(qb_url)
+    if cached is not None:
+        return cached
+    info = _read_disk_space_info(sess, qb_url)
+    # Só leituras bem-sucedidas entram no cache; erros são refeitos na próxima chamada
+    if info.startswith("💾"):
+        _disk_space_cache.set(qb_url, info)
+    return info
+
+
+def _read_disk_space_info(sess, qb_url: str) -> str:
     try:
-        if sess is None:
-            return "❌ Não conectado ao qBittorrent."
         prefs_resp = sess.get(f"{qb_url}/api/v2/app/preferences")
         prefs_resp.raise_for_status()
         prefs_data = prefs_resp.json()
@@ -107,8 +120,6 @@ def get_disk_space_info(sess, qb_url: str, chat_id: int) -> str:
                     server_state = maindata.get('server_state', {})
                     free = server_state.get('free_space_on_disk')
                     if free is not None:
-                        import os
-                        import shutil
                         if save_path and os.path.exists(save_path):
                             try:
                                 disk_usage = shutil.disk_usage(save_path)
@@ -126,48 +137,41 @@ def get_disk_space_info(sess, qb_url: str, chat_id: int) -> str:
     return "❌ Não foi possível obter as informações de espaço em disco."
 
 
+# Agrupamento de estados do qBittorrent usado em list_torrents
+_ACTIVE_STATES = frozenset(('downloading', 'stalledDL', 'checkingDL', 'queuedDL', 'forcedDL', 'metaDL'))
+_PAUSED_STATES = frozenset(('pausedDL', 'pausedUP'))
+_SEEDING_STATES = frozenset(('uploading', 'seeding', 'stalledUP', 'checkingUP', 'forcedUP', 'queuedUP'))
+_ERROR_STATES = frozenset(('error', 'missingFiles', 'unknown'))
+MAX_NAME_LENGTH = 50
+
+
+def _display_name(torrent: dict) -> str:
+    nome = torrent.get('name', 'Sem nome')
+    return nome if len(nome) <= MAX_NAME_LENGTH else nome[:MAX_NAME_LENGTH] + "..."
+
+
 def list_torrents(sess, qb_url: str, chat_id: Optional[Union[str, int]] = None) -> bool:
     try:
         if sess is None:
             send_telegram("❌ Não conectado ao qBittorrent.", chat_id, use_keyboard=True)
             return False
-        from src.integrations.qbittorrent.client import fetch_torrents, format_bytes as fb
         torrents = fetch_torrents(sess, qb_url)
         if not torrents:
             send_telegram("📭 Nenhum torrent encontrado.", chat_id, use_keyboard=True)
             return True
 
+        # Só separa os torrents por estado: a formatação fica para os poucos que aparecem na mensagem
         ativos, pausados, finalizados, parados = [], [], [], []
-        MAX_NAME_LENGTH = 50
-
         for t in torrents:
             estado = t.get('state', '')
-            nome = t.get('name', 'Sem nome')
-            progresso = t.get('progress', 0) * 100
-            hash_torrent = t.get('hash', '')
-            size = t.get('size', 0)
-            dlspeed = t.get('dlspeed', 0)
-            upspeed = t.get('upspeed', 0)
-            nome_display = nome if len(nome) <= MAX_NAME_LENGTH else nome[:MAX_NAME_LENGTH] + "..."
-            size_str = fb(size)
-            speed_info = ""
-            if dlspeed > 0:
-                speed_info = f" ↓{fb(dlspeed)}/s"
-            if upspeed > 0:
-                speed_info += f" ↑{fb(upspeed)}/s"
-            torrent_info = {
-                'name': nome_display, 'hash': hash_torrent,
-                'progress': progresso, 'size': size_str,
-                'speed': speed_info, 'state': estado,
-            }
-            if estado in ['downloading', 'stalledDL', 'checkingDL', 'queuedDL', 'forcedDL', 'metaDL']:
-                ativos.append(torrent_info)
-            elif estado in ['pausedDL', 'pausedUP']:
-                pausados.append(torrent_info)
-            elif estado in ['uploading', 'seeding', 'stalledUP', 'checkingUP', 'forcedUP', 'queuedUP']:
-                finalizados.append(torrent_info)
-            elif estado in ['error', 'missingFiles', 'unknown']:
-                parados.append(torrent_info)
+            if estado in _ACTIVE_STATES:
+                ativos.append(t)
+            elif estado in _PAUSED_STATES:
+                pausados.append(t)
+            elif estado in _SEEDING_STATES:
+                finalizados.append(t)
+            elif estado in _ERROR_STATES:
+                parados.append(t)
 
         total = len(torrents)
         msg_parts = ["<b>📊 GERENCIADOR DE TORRENTS</b>", "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━",
@@ -177,14 +181,22 @@ def list_torrents(sess, qb_url: str, chat_id: Optional[Union[str, int]] = None)
             msg_parts.append(f"<b>Com Erro:</b> {len(parados)}")
         msg_parts.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-        def fmt_line(t_info, show_progress=False):
-            line = f"<b>•</b> {t_info['name']}"
+        def fmt_line(t, show_progress=False):
+            line = f"<b>•</b> {_display_name(t)}"
+            size_str = format_bytes(t.get('size', 0))
             if show_progress:
-                line += f"\n   📊 {t_info['progress']:.1f}% | 💾 {t_info['size']}"
-                if t_info['speed']:
-                    line += f" | {t_info['speed']}"
+                line += f"\n   📊 {t.get('progress', 0) * 100:.1f}% | 💾 {size_str}"
+                speed_info = ""
+                dlspeed = t.get('dlspeed', 0)
+                upspeed = t.get('upspeed', 0)
+                if dlspeed > 0:
+                    speed_info = f" ↓{format_bytes(dlspeed)}/s"
+                if upspeed > 0:
+                    speed_info += f" ↑{format_bytes(upspeed)}/s"
+                if speed_info:
+                    line += f" | {speed_info}"
             else:
-                line += f"\n   💾 {t_info['size']}"
+                line += f"\n   💾 {size_str}"
             return line
 
         if ativos:
@@ -211,25 +223,15 @@ def list_torrents(sess, qb_url: str, chat_id: Optional[Union[str, int]] = None)
         if parados:
             msg_parts.append(f"\n<b>❌ COM ERRO ({len(parados)})</b>")
             msg_parts.append("─────────────────────────────")
-            for t in parados:
-                msg_parts.append(f"<b>•</b> {t['name']}\n   ⚠️ Estado: {t['state']}")
+            for t in parados[:10]:
+                msg_parts.append(f"<b>•</b> {_display_name(t)}\n   ⚠️ Estado: {t.get('state', '')}")
+            if len(parados) > 10:
+                msg_parts.append(f"\n<i>... e mais {len(parados) - 10} torrent(s)</i>")
         msg_parts.append("\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
         msg_parts.append("<i>💡 Use os botões abaixo para gerenciar torrents</i>")
 
-        inline_keyboard = {
-            'inline_keyboard': [
-                [
-                    {'text': '🔄 Atualizar Lista', 'callback_data': 'torrent_refresh'},
-                    {'text': '⏸️ Pausar Todos', 'callback_data': 'torrent_pause_all'},
-                ],
-                [
-                    {'text': '▶️ Retomar Todos', 'callback_data': 'torrent_resume_all'},
-                    {'text': '📋 Detalhes', 'callback_data': 'torrent_details'},
-                ],
-            ]
-        }
         message = "\n".join(msg_parts)
-        return send_telegram(message, chat_id, parse_mode="HTML", reply_markup=inline_keyboard)
+        return send_telegram(message, chat_id, parse_mode="HTML", reply_markup=get_torrent_actions_keyboard())
     except Exception as e:
         logger.error(f"Erro ao listar torrents: {e}")
         send_telegram(f"❌ Erro ao listar torrents: {str(e)}", chat_id, use_keyboard=True)
@@ -241,13 +243,13 @@ def handle_pause_all_torrents(sess, qb_url: str, chat_id: int) -> None:
         if sess is None:
             send_telegram("❌ Não conectado ao qBittorrent.", chat_id, use_keyboard=True)
             return
-        from src.integrations.qbittorrent.client import fetch_torrents
         torrents = fetch_torrents(sess, qb_url)
         if not torrents:
             send_telegram("📭 Nenhum torrent encontrado.", chat_id, use_keyboard=True)
             return
         resp = sess.post(f"{qb_url}/api/v2/torrents/pause", data={"hashes": "all"})
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         send_telegram(f"⏸️ Todos os torrents foram pausados ({len(torrents)} torrent(s)).", chat_id, use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao pausar todos os torrents: {e}")
@@ -259,13 +261,13 @@ def handle_resume_all_torrents(sess, qb_url: str, chat_id: int) -> None:
         if sess is None:
             send_telegram("❌ Não conectado ao qBittorrent.", chat_id, use_keyboard=True)
             return
-        from src.integrations.qbittorrent.client import fetch_torrents
         torrents = fetch_torrents(sess, qb_url)
         if not torrents:
             send_telegram("📭 Nenhum torrent encontrado.", chat_id, use_keyboard=True)
             return
         resp = sess.post(f"{qb_url}/api/v2/torrents/resume", data={"hashes": "all"})
         resp.raise_for_status()
+        invalidate_torrents_cache(qb_url)
         send_telegram(f"▶️ Todos os torrents foram retomados ({len(torrents)} torrent(s)).", chat_id, use_keyboard=True)
     except Exception as e:
         logger.error(f"Erro ao retomar todos os torrents: {e}")
@@ -13,6 +13,11 @@ WAHA_API_KEY = os.getenv('WAHA_API_KEY', 'local-dev-key-123')
 WAHA_SESSION = os.getenv('WAHA_SESSION', 'default')
 AUTHORIZED_WHATSAPP_NUMBERS = os.getenv('AUTHORIZED_WHATSAPP_NUMBERS', '').split(',')
 AUTHORIZED_WHATSAPP_GROUP = os.getenv('AUTHORIZED_WHATSAPP_GROUP', '').strip()
+# Só os dígitos de cada número autorizado, calculados uma vez (entradas vazias são ignoradas)
+_AUTHORIZED_WHATSAPP_DIGITS = tuple(
+    digits for digits in (''.join(filter(str.isdigit, n)) for n in AUTHORIZED_WHATSAPP_NUMBERS) if digits
+)
+_AUTHORIZED_WHATSAPP_DIGITS_SET = frozenset(_AUTHORIZED_WHATSAPP_DIGITS)
 
 waha_client: Optional[WAHAApi] = None
 
@@ -58,11 +63,10 @@ def is_authorized_whatsapp(phone_number: str) -> bool:
         return True
     clean_number = phone_number.split('@')[0] if '@' in phone_number else phone_number
     clean_number = ''.join(filter(str.isdigit, clean_number))
-    for authorized in AUTHORIZED_WHATSAPP_NUMBERS:
-        clean_authorized = ''.join(filter(str.isdigit, authorized))
-        if clean_number == clean_authorized or clean_number.endswith(clean_authorized) or clean_authorized in clean_number:
-            return True
-    return False
+    if clean_number in _AUTHORIZED_WHATSAPP_DIGITS_SET:
+        return True
+    # Aceita o número com prefixo de país/DDD diferente do cadastrado
+    return any(authorized in clean_number for authorized in _AUTHORIZED_WHATSAPP_DIGITS)
 
 
 def is_authorized_chat(chat_id: str, from_number: str) -> bool:
@@ -2,9 +2,10 @@
 Webhook Flask para receber mensagens do WhatsApp via WAHA
 """
 import logging
+import traceback
 from typing import Dict, Any
 from flask import Flask, request, jsonify
-from src.integrations.whatsapp.utils import is_authorized_whatsapp, is_authorized_chat, send_whatsapp, waha_client
+from src.integrations.whatsapp.utils import is_authorized_chat, waha_client
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +46,6 @@ def process_whatsapp_webhook(data: Dict[str, Any], sess=None, add_magnet_func=No
 
     except Exception as e:
         logger.error(f"Erro ao processar webhook WhatsApp: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         return {"status": "error", "message": str(e)}
 
@@ -76,7 +76,8 @@ class StatisticsManager:
             collected = 0
 
             for session, url, name in instances:
-                transfer_info = get_transfer_info(session, url)
+                # Amostra do histórico: sempre lida do qBittorrent, nunca do cache
+                transfer_info = get_transfer_info(session, url, force=True)
                 if not transfer_info:
                     continue
                 total_dl_speed += transfer_info.get('dl_info_speed', 0)
@@ -180,40 +181,40 @@ class StatisticsManager:
             return {}
 
     def format_bandwidth_stats(self, hours: int = 24) -> str:
-        from src.integrations.qbittorrent.client import format_bytes
+        from src.utils.formatters import format_bytes
         stats = self.get_bandwidth_stats(hours)
         if not stats:
             return "❌ Erro ao obter estatísticas"
         if stats['records_count'] == 0:
             return f"📊 Sem dados de banda para as últimas {hours} horas"
-        text = f"📊 <b>Estatísticas de Banda ({hours}h)</b>\n\n"
-        text += f"📥 <b>Download:</b>\n"
-        text += f"  • Total: {format_bytes(stats['total_downloaded'])}\n"
-        text += f"  • Média: {format_bytes(stats['avg_dl_speed'])}/s\n"
-        text += f"  • Pico: {format_bytes(stats['peak_dl_speed'])}/s\n\n"
-        text += f"📤 <b>Upload:</b>\n"
-        text += f"  • Total: {format_bytes(stats['total_uploaded'])}\n"
-        text += f"  • Média: {format_bytes(stats['avg_up_speed'])}/s\n"
-        text += f"  • Pico: {format_bytes(stats['peak_up_speed'])}/s\n\n"
-        text += f"📈 Registros: {stats['records_count']}"
-        return text
+        return (
+            f"📊 <b>Estatísticas de Banda ({hours}h)</b>\n\n"
+            f"📥 <b>Download:</b>\n"
+            f"  • Total: {format_bytes(stats['total_downloaded'])}\n"
+            f"  • Média: {format_bytes(stats['avg_dl_speed'])}/s\n"
+            f"  • Pico: {format_bytes(stats['peak_dl_speed'])}/s\n\n"
+            f"📤 <b>Upload:</b>\n"
+            f"  • Total: {format_bytes(stats['total_uploaded'])}\n"
+            f"  • Média: {format_bytes(stats['avg_up_speed'])}/s\n"
+            f"  • Pico: {format_bytes(stats['peak_up_speed'])}/s\n\n"
+            f"📈 Registros: {stats['records_count']}"
+        )
 
     def format_download_history(self, days: int = 7) -> str:
-        from src.integrations.qbittorrent.client import format_bytes
+        from src.utils.formatters import format_bytes
         downloads = self.get_download_history(days)
         if not downloads:
             return f"📜 Nenhum download nos últimos {days} dias"
-        text = f"📜 <b>Histórico de Downloads ({days} dias)</b>\n\n"
+        lines = [f"📜 <b>Histórico de Downloads ({days} dias)</b>\n\n"]
         for i, dl in enumerate(downloads[:10], 1):
             timestamp = datetime.fromisoformat(dl['timestamp'])
             date_str = timestamp.strftime('%d/%m %H:%M')
             name = dl['name'][:40]
             size = format_bytes(dl['size'])
-            text += f"{i}. <b>{name}</b>\n"
-            text += f"   📅 {date_str} | 💾 {size}\n\n"
+            lines.append(f"{i}. <b>{name}</b>\n   📅 {date_str} | 💾 {size}\n\n")
         if len(downloads) > 10:
-            text += f"... e mais {len(downloads) - 10} downloads"
-        return text
+            lines.append(f"... e mais {len(downloads) - 10} downloads")
+        return "".join(lines)
 
     def format_activity_graph(self, hours: int = 24) -> str:
         try:
@@ -239,16 +240,16 @@ class StatisticsManager:
             max_speed = max(avg_speeds) if avg_speeds else 1
             bar_chars = ['▁', '▂', '▃', '▄', '▅', '▆', '▇', '█']
 
-            text = f"📈 <b>Gráfico de Atividade ({hours}h)</b>\n\n"
+            lines = [f"📈 <b>Gráfico de Atividade ({hours}h)</b>\n\n"]
             for i, speed in enumerate(reversed(avg_speeds)):
                 bar_level = int((speed / max_speed) * (len(bar_chars) - 1)) if max_speed > 0 else 0
                 bar = bar_chars[bar_level]
                 hours_label = f"-{(i+1)*interval_duration:.0f}h"
-                text += f"{hours_label:>5} {bar}\n"
+                lines.append(f"{hours_label:>5} {bar}\n")
 
-            from src.integrations.qbittorrent.client import format_bytes
-            text += f"\nMáx: {format_bytes(max_speed)}/s"
-            return text
+            from src.utils.formatters import format_bytes
+            lines.append(f"\nMáx: {format_bytes(max_speed)}/s")
+            return "".join(lines)
         except Exception as e:
             logger.error(f"Erro ao gerar gráfico de atividade: {e}")
             return "❌ Erro ao gerar gráfico"
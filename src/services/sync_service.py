@@ -9,6 +9,9 @@ from dotenv import load_dotenv
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+_DOWNLOAD_STATES = frozenset(('downloading', 'stalledDL', 'checkingDL', 'pausedDL', 'queuedDL', 'forcedDL', 'metaDL'))
+_COMPLETION_STATES = frozenset(('uploading', 'seeding', 'finished', 'stalledUP', 'checkingUP', 'forcedUP', 'pausedUP'))
+
 
 class SyncManager:
     """Gerenciador de sincronização entre qBittorrent e Jellyfin"""
@@ -44,35 +47,41 @@ class SyncManager:
         logger.info("SyncManager parado")
 
     def _sync_loop(self):
-        from src.integrations.qbittorrent.client import fetch_torrents
+        from src.integrations.qbittorrent.client import fetch_maindata
 
-        previous_state: Dict[str, Dict] = {}
+        # Estado local {hash: campos}, mantido com os deltas do sync/maindata: a cada ciclo
+        # o qBittorrent só envia os torrents que mudaram desde o último `rid`
+        torrents_state: Dict[str, Dict] = {}
+        rid = 0
 
         while self.running:
             try:
-                current_torrents = fetch_torrents(self.qb_session, self.qb_url)
-
-                for torrent in current_torrents:
-                    torrent_hash = torrent['hash']
-                    current_state = torrent['state']
-                    name = torrent['name']
-                    save_path = torrent.get('save_path', '')
-
-                    download_states = ['downloading', 'stalledDL', 'checkingDL', 'pausedDL', 'queuedDL', 'forcedDL', 'metaDL']
-                    completion_states = ['uploading', 'seeding', 'finished', 'stalledUP', 'checkingUP', 'forcedUP', 'pausedUP']
-
-                    if torrent_hash in previous_state:
-                        prev_state = previous_state[torrent_hash]['state']
-                        if prev_state in download_states and current_state in completion_states:
-                            if torrent_hash not in self.completed_torrents:
-                                self._handle_completed_torrent(torrent_hash, name, save_path)
-                                self.completed_torrents.add(torrent_hash)
-
-                    previous_state[torrent_hash] = {
-                        'state': current_state,
-                        'name': name,
-                        'save_path': save_path,
-                    }
+                data = fetch_maindata(self.qb_session, self.qb_url, rid)
+                if data is None:
+                    # Falha na consulta: recomeça com uma atualização completa
+                    rid = 0
+                    time.sleep(self.sync_interval)
+                    continue
+
+                rid = data.get('rid', 0)
+                changes: Dict[str, Dict] = data.get('torrents', {})
+                if data.get('full_update'):
+                    # Atualização completa: o que não veio na resposta foi removido
+                    for torrent_hash in torrents_state.keys() - changes.keys():
+                        del torrents_state[torrent_hash]
+                for torrent_hash in data.get('torrents_removed', []):
+                    torrents_state.pop(torrent_hash, None)
+
+                for torrent_hash, partial in changes.items():
+                    torrent = torrents_state.setdefault(torrent_hash, {})
+                    prev_state = torrent.get('state')
+                    torrent.update(partial)
+                    current_state = torrent.get('state')
+
+                    if prev_state in _DOWNLOAD_STATES and current_state in _COMPLETION_STATES:
+                        if torrent_hash not in self.completed_torrents:
+                            self._handle_completed_torrent(torrent_hash, torrent.get('name', ''), torrent.get('save_path', ''))
+                            self.completed_torrents.add(torrent_hash)
 
                 self._process_queue()
                 time.sleep(self.sync_interval)
@@ -4,6 +4,7 @@ from typing import List, Dict, Optional
 import logging
 import re
 from urllib.parse import urljoin
+from src.utils.magnet_parser import MAGNET_HREF_RE, MAGNET_IN_HTML_RE
 
 logger = logging.getLogger(__name__)
 
@@ -160,14 +161,14 @@ class YTSBRApi:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             html_content = response.text
-            magnet_pattern = r'magnet:\?xt=urn:btih:[a-fA-F0-9]{40}[^\s\'"<>]*'
-            magnet_matches = re.findall(magnet_pattern, html_content)
-            if magnet_matches:
-                magnet_link = magnet_matches[0].replace('&amp;', '&')
+            # Só o primeiro link interessa: search para no primeiro match em vez de varrer a página toda
+            magnet_match = MAGNET_IN_HTML_RE.search(html_content)
+            if magnet_match:
+                magnet_link = magnet_match.group(0).replace('&amp;', '&')
                 logger.info(f"Link magnet encontrado: {magnet_link[:100]}...")
                 return magnet_link
             soup = BeautifulSoup(response.content, 'html.parser')
-            magnet_links = soup.find_all('a', href=re.compile(r'^magnet:\?'))
+            magnet_links = soup.find_all('a', href=MAGNET_HREF_RE)
             if magnet_links:
                 return magnet_links[0].get('href')
             logger.warning(f"Link magnet não encontrado em {url}")
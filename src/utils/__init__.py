@@ -1,4 +1,7 @@
-from .formatters import format_bytes, format_duration, format_filesize
+from .async_loop import get_background_loop, run_sync, submit
+from .cache import TTLCache
+from .formatters import format_bytes, format_duration, format_filesize, truncate
+from .rate_limiter import TokenBucket
 from .magnet_parser import (
     MagnetLink,
     extract_magnet_links,
@@ -7,9 +10,15 @@ from .magnet_parser import (
 )
 
 __all__ = [
+    "get_background_loop",
+    "run_sync",
+    "submit",
+    "TTLCache",
     "format_bytes",
     "format_duration",
     "format_filesize",
+    "truncate",
+    "TokenBucket",
     "MagnetLink",
     "extract_magnet_links",
     "validate_magnet_link",
@@ -0,0 +1,42 @@
+"""
+Loop asyncio persistente rodando em uma thread daemon.
+Permite que as threads síncronas do bot executem corrotinas sem criar e destruir um loop
+a cada chamada, mantendo sessões aiohttp (e suas conexões keep-alive) vivas entre chamadas.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Retorna o loop compartilhado, iniciando sua thread na primeira chamada"""
+    global _loop
+    if _loop is None:
+        with _lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='asyncio-background', daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def submit(coro: Coroutine) -> Future:
+    """Agenda a corrotina no loop compartilhado sem esperar (retorna um concurrent.futures.Future)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_background_loop())
+
+
+def run_sync(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Executa a corrotina no loop compartilhado e bloqueia até o resultado
+
+    Não deve ser chamada de dentro do próprio loop (travaria esperando por si mesmo).
+    """
+    future = submit(coro)
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise
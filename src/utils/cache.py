@@ -0,0 +1,69 @@
+"""
+Cache em memória com expiração por tempo (TTL).
+Usado para evitar requisições repetidas a APIs externas em curtos intervalos.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Cache thread-safe onde cada entrada expira após um TTL próprio.
+
+    Uma entrada pode ter ainda uma janela `stale_ttl` após o TTL: nela `get` já não a
+    retorna, mas `lookup` sim (marcada como não-fresca), para stale-while-revalidate.
+    """
+
+    def __init__(self, default_ttl: float = 60.0, maxsize: int = 1024):
+        self.default_ttl = default_ttl
+        self.maxsize = maxsize
+        # chave -> (remover_em, fresca_até, valor)
+        self._cache: Dict[Hashable, Tuple[float, float, Any]] = {}
+        self._lock = threading.RLock()
+
+    def lookup(self, key: Hashable, default: Any = None) -> Tuple[Any, bool]:
+        """Retorna (valor, fresco); (`default`, False) se ausente ou fora da janela stale."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return default, False
+            expires_at, fresh_until, value = entry
+            now = time.monotonic()
+            if now >= expires_at:
+                del self._cache[key]
+                return default, False
+            return value, now < fresh_until
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor armazenado ou `default` se ausente/expirado."""
+        value, fresh = self.lookup(key, default)
+        return value if fresh else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, stale_ttl: float = 0.0) -> None:
+        """Armazena um valor com o TTL informado (ou o padrão) e a janela stale opcional."""
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            if key not in self._cache and len(self._cache) >= self.maxsize:
+                self._evict()
+            fresh_until = time.monotonic() + ttl
+            self._cache[key] = (fresh_until + stale_ttl, fresh_until, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def _evict(self) -> None:
+        # Remove entradas expiradas; se nada expirou, descarta a mais antiga
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _, _) in self._cache.items() if expires_at <= now]
+        for k in expired:
+            del self._cache[k]
+        if len(self._cache) >= self.maxsize:
+            del self._cache[next(iter(self._cache))]
@@ -1,9 +1,17 @@
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_bytes(size: int) -> str:
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024.0:
-            return f"{size:.2f} {unit}"
-        size /= 1024.0
-    return f"{size:.2f} PB"
+    # Cada unidade equivale a 10 bits, então o índice sai direto do bit_length
+    idx = min((int(size).bit_length() - 1) // 10, 5) if size >= 1024 else 0
+    return f"{size / (1 << (idx * 10)):.2f} {_SIZE_UNITS[idx]}"
+
+
+def truncate(text: str, limit: int, suffix: str = '…') -> str:
+    """Corta `text` para no máximo `limit` caracteres, terminando em `suffix` quando cortado"""
+    if len(text) <= limit:
+        return text
+    return text[:limit - len(suffix)] + suffix
 
 
 def format_duration(seconds: int) -> str:
@@ -9,6 +9,19 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Regex melhorado para capturar magnet links completos
+# Aceita qualquer magnet link que comece com magnet:? e contenha xt=urn:btih:
+# em qualquer posição, seguido de hash de 40 (hex) ou 32 (base32) caracteres
+MAGNET_LINK_RE = re.compile(
+    r'magnet:\?[^\s<>"]*xt=urn:btih:(?:[0-9a-fA-F]{40}|[0-9a-zA-Z]{32})[^\s<>"]*', re.IGNORECASE
+)
+# Raspagem dos sites de torrent (YTSBR, Rede Torrent): magnets com hash hex no HTML bruto e âncoras <a href="magnet:...">
+MAGNET_IN_HTML_RE = re.compile(r'magnet:\?xt=urn:btih:[a-fA-F0-9]{40}[^\s\'"<>]*')
+MAGNET_HREF_RE = re.compile(r'^magnet:\?')
+_BTIH_RE = re.compile(r'xt=urn:btih:([0-9a-fA-F]{40}|[0-9a-zA-Z]{32})', re.IGNORECASE)
+# Parâmetros usados do magnet (nome, tamanho e trackers), lidos direto da string sem urlparse/parse_qs
+_PARAM_RE = re.compile(r'[?&](dn|xl|tr)=([^&#]+)')
+
 
 class MagnetLink:
     """Representa um magnet link com suas propriedades extraídas."""
@@ -27,29 +40,23 @@ class MagnetLink:
         """Extrai informações do magnet link."""
         try:
             # Extrair info hash (btih)
-            btih_match = re.search(r'xt=urn:btih:([0-9a-fA-F]{40}|[0-9a-zA-Z]{32})', self.raw_link, re.IGNORECASE)
+            btih_match = _BTIH_RE.search(self.raw_link)
             if btih_match:
                 self.info_hash = btih_match.group(1).upper()
                 self.exact_topic = f"urn:btih:{self.info_hash}"
             
-            # Parse URL parameters
-            parsed = urllib.parse.urlparse(self.raw_link)
-            params = urllib.parse.parse_qs(parsed.query)
-            
-            # Extrair display name (dn)
-            if 'dn' in params:
-                self.display_name = urllib.parse.unquote(params['dn'][0])
-            
-            # Extrair tamanho exato (xl)
-            if 'xl' in params:
-                try:
-                    self.size = int(params['xl'][0])
-                except (ValueError, IndexError):
-                    pass
-            
-            # Extrair trackers (tr)
-            if 'tr' in params:
-                self.trackers = [urllib.parse.unquote(tr) for tr in params['tr']]
+            # Extrair display name (dn), tamanho exato (xl) e trackers (tr); dn e xl valem na 1ª ocorrência
+            for key, value in _PARAM_RE.findall(self.raw_link):
+                if key == 'tr':
+                    self.trackers.append(urllib.parse.unquote_plus(value))
+                elif key == 'dn':
+                    if self.display_name is None:
+                        self.display_name = urllib.parse.unquote_plus(value)
+                elif self.size is None:
+                    try:
+                        self.size = int(value)
+                    except ValueError:
+                        pass
             
         except Exception as e:
             logger.error(f"Erro ao fazer parse do magnet link: {e}")
@@ -125,12 +132,7 @@ def extract_magnet_links(text: str) -> List[MagnetLink]:
     Returns:
         Lista de objetos MagnetLink encontrados
     """
-    # Regex melhorado para capturar magnet links completos
-    # Aceita qualquer magnet link que comece com magnet:? e contenha xt=urn:btih:
-    # em qualquer posição, seguido de hash de 40 (hex) ou 32 (base32) caracteres
-    magnet_pattern = r'magnet:\?[^\s<>"]*xt=urn:btih:(?:[0-9a-fA-F]{40}|[0-9a-zA-Z]{32})[^\s<>"]*'
-    
-    matches = re.findall(magnet_pattern, text, re.IGNORECASE)
+    matches = MAGNET_LINK_RE.findall(text)
     
     magnet_links = []
     for match in matches:
@@ -0,0 +1,30 @@
+"""
+Limitador de taxa no estilo token bucket.
+Permite rajadas curtas e segura apenas quem passar da taxa média, em vez de pausas fixas entre chamadas.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Token bucket thread-safe: até `capacity` chamadas em rajada, repondo `rate` fichas por segundo."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Consome uma ficha, esperando o tempo necessário se o balde estiver vazio."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A ficha é reservada já aqui (saldo negativo), assim quem chega depois espera na fila
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
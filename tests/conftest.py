@@ -0,0 +1,28 @@
+"""
+Fixtures compartilhadas pelos testes.
+"""
+import pytest
+
+
+class FakeClock:
+    """Relógio controlado pelo teste: substitui time.monotonic e time.sleep"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """Relógio falso no módulo testado, passado via parametrize(..., indirect=True)"""
+    fake = FakeClock()
+    monkeypatch.setattr(request.param.time, "monotonic", fake)
+    monkeypatch.setattr(request.param.time, "sleep", fake.sleep)
+    return fake
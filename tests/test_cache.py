@@ -0,0 +1,84 @@
+"""
+Testes para o módulo cache.
+"""
+import pytest
+from src.utils import cache as cache_module
+from src.utils.cache import TTLCache
+
+
+pytestmark = pytest.mark.parametrize("clock", [cache_module], indirect=True)
+
+
+def test_get_returns_value_before_expiry(clock):
+    """Testa leitura de valor ainda válido."""
+    cache = TTLCache(default_ttl=10)
+    cache.set("libraries", [1, 2, 3])
+
+    clock.now += 9
+    assert cache.get("libraries") == [1, 2, 3]
+
+
+def test_get_returns_default_after_expiry(clock):
+    """Testa expiração da entrada após o TTL."""
+    cache = TTLCache(default_ttl=10)
+    cache.set("libraries", [1, 2, 3])
+
+    clock.now += 10
+    assert cache.get("libraries") is None
+    assert cache.get("libraries", "padrão") == "padrão"
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl(clock):
+    """Testa TTL específico por entrada."""
+    cache = TTLCache(default_ttl=300)
+    cache.set("recent", ["a"], ttl=30)
+    cache.set("libraries", ["b"])
+
+    clock.now += 60
+    assert cache.get("recent") is None
+    assert cache.get("libraries") == ["b"]
+
+
+def test_lookup_serves_stale_within_window(clock):
+    """Testa a janela stale: `lookup` ainda retorna o valor, `get` não."""
+    cache = TTLCache(default_ttl=10)
+    cache.set("libraries", ["a"], stale_ttl=50)
+
+    assert cache.lookup("libraries") == (["a"], True)
+    clock.now += 30
+    assert cache.lookup("libraries") == (["a"], False)
+    assert cache.get("libraries") is None
+    clock.now += 30
+    assert cache.lookup("libraries") == (None, False)
+    assert len(cache) == 0
+
+
+def test_maxsize_evicts_oldest(clock):
+    """Testa descarte da entrada mais antiga ao atingir o limite."""
+    cache = TTLCache(default_ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_invalidate_and_clear(clock):
+    """Testa remoção manual de entradas."""
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
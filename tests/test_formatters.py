@@ -0,0 +1,36 @@
+"""
+Testes para o módulo formatters.
+"""
+import pytest
+from src.utils.formatters import format_bytes, truncate
+
+
+@pytest.mark.parametrize("size, expected", [
+    (0, "0.00 B"),
+    (1023, "1023.00 B"),
+    (1024, "1.00 KB"),
+    (1536, "1.50 KB"),
+    (1024 ** 2 - 1, "1024.00 KB"),
+    (5 * 1024 ** 3, "5.00 GB"),
+    (3 * 1024 ** 5, "3.00 PB"),
+    (2048 * 1024 ** 5, "2048.00 PB"),
+    (1536.0, "1.50 KB"),
+])
+def test_format_bytes(size, expected):
+    """Testa a escolha da unidade e o arredondamento."""
+    assert format_bytes(size) == expected
+
+
+@pytest.mark.parametrize("text, limit, suffix, expected", [
+    ("", 5, "…", ""),
+    ("abcde", 5, "…", "abcde"),
+    ("abcdef", 5, "…", "abcd…"),
+    ("abcdefgh", 6, "...", "abc..."),
+])
+def test_truncate(text, limit, suffix, expected):
+    """Testa que o texto cortado respeita o limite, incluindo o sufixo."""
+    assert truncate(text, limit, suffix) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,32 @@
+"""
+Testes para o formatter do Jellyfin.
+"""
+import pytest
+
+# O pacote jellyfin importa o cliente HTTP junto com o formatter
+pytest.importorskip("aiohttp")
+pytest.importorskip("requests")
+
+from src.integrations.jellyfin.formatter import JellyfinFormatter
+
+
+@pytest.mark.parametrize("item", [
+    {'Name': 'Filme', 'Type': 'Movie', 'Genres': None},
+    {'Name': 'Filme', 'Type': 'Movie'},
+])
+def test_message_without_genres(item):
+    """Testa item com Genres nulo ou ausente."""
+    assert JellyfinFormatter.format_item_info(item).genres == ()
+    message = JellyfinFormatter.format_telegram_message(item)
+    assert "Filme" in message
+    assert "Gêneros" not in message
+
+
+def test_message_shows_first_three_genres():
+    """Testa que só os 3 primeiros gêneros aparecem."""
+    item = {'Name': 'Série', 'Type': 'Series', 'Genres': ['Drama', 'Crime', 'Ação', 'Terror']}
+    assert "🎭 Gêneros: Drama, Crime, Ação" in JellyfinFormatter.format_telegram_message(item)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -46,6 +46,16 @@ def test_magnet_link_with_trackers():
     assert "udp://tracker.example.com:80" in magnet_obj.trackers
 
 
+def test_magnet_link_encoded_name():
+    """Testa nome de exibição com codificação de URL."""
+    magnet = "magnet:?xt=urn:btih:faecd4f63fc45b2add695413f828ecb3148d64fb&dn=Meu+Filme%20%282024%29&xl=abc"
+    
+    magnet_obj = MagnetLink(magnet)
+    
+    assert magnet_obj.display_name == "Meu Filme (2024)"
+    assert magnet_obj.size is None
+
+
 def test_extract_multiple_magnets():
     """Testa extração de múltiplos magnet links de um texto."""
     text = """
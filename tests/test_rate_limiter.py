@@ -0,0 +1,40 @@
+"""
+Testes para o módulo rate_limiter.
+"""
+import pytest
+from src.utils import rate_limiter as rate_limiter_module
+from src.utils.rate_limiter import TokenBucket
+
+
+pytestmark = pytest.mark.parametrize("clock", [rate_limiter_module], indirect=True)
+
+
+def test_burst_up_to_capacity_without_waiting(clock):
+    """Testa que a rajada inicial não espera."""
+    bucket = TokenBucket(rate=1, capacity=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == []
+
+
+def test_waits_once_bucket_is_empty(clock):
+    """Testa a espera proporcional à taxa depois da rajada."""
+    bucket = TokenBucket(rate=2, capacity=1)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_refills_over_time(clock):
+    """Testa a reposição das fichas com o passar do tempo."""
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 2
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.slept == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
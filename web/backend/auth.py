@@ -4,6 +4,7 @@ Authentication module for Web API Backend
 Handles JWT token generation, validation, and password management
 """
 import os
+from functools import lru_cache
 from datetime import datetime, timedelta
 from typing import Optional, Dict
 from passlib.context import CryptContext
@@ -39,6 +40,12 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+@lru_cache(maxsize=1)
+def _default_password_hash() -> str:
+    """bcrypt hash of the fallback 'admin' password, computed once per process"""
+    return get_password_hash('admin')
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -68,8 +75,7 @@ def authenticate_user(username: str, password: str) -> bool:
     
     if not WEB_PASSWORD_HASH:
         logger.warning("WEB_PASSWORD_HASH not set - using default password 'admin'")
-        default_hash = get_password_hash('admin')
-        return verify_password(password, default_hash)
+        return verify_password(password, _default_password_hash())
     
     return verify_password(password, WEB_PASSWORD_HASH)
 
@@ -8,6 +8,9 @@ import os
 import json
 import yaml
 import requests as req_lib
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Request, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -15,7 +18,10 @@ from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
 import asyncio
 import logging
-from typing import List, Optional, Dict
+import re
+import threading
+import time
+from typing import Any, Hashable, List, Optional, Dict
 from datetime import datetime, timedelta
 from pathlib import Path
 from pydantic import BaseModel
@@ -23,6 +29,17 @@ import psutil
 import platform
 import socket
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
@@ -62,7 +79,7 @@ JELLYFIN_API_KEY = os.getenv('JELLYFIN_API_KEY', '')
 
 
 def parse_jellyfin_accounts() -> List[Dict]:
-    urls = [u.strip() for u in JELLYFIN_URL.split(',') if u.strip()]
+    urls = [u.strip().rstrip('/') for u in JELLYFIN_URL.split(',') if u.strip()]
     usernames = [u.strip() for u in JELLYFIN_USERNAME.split(',') if u.strip()]
     passwords = [p.strip() for p in JELLYFIN_PASSWORD.split(',') if p.strip()]
     api_keys = [k.strip() for k in JELLYFIN_API_KEY.split(',') if k.strip()]
@@ -107,6 +124,9 @@ GOSTREAM_API_PORT = int(os.getenv('GOSTREAM_API_PORT', '8090'))
 GOSTREAM_MOUNT_PATH = os.getenv('GOSTREAM_MOUNT_PATH', '/mnt/gostream')
 GOSTREAM_WEBHOOK_PORT = int(os.getenv('GOSTREAM_WEBHOOK_PORT', '5001'))
 
+# Extensões aceitas como streamáveis (tupla: str.endswith testa todas de uma vez)
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv')
+
 # ---------------------------------------------------------------------------
 # GoStream Client
 # ---------------------------------------------------------------------------
@@ -213,11 +233,10 @@ class GoStreamClient:
             
             files = data.get('files', [])
             # Filtra apenas arquivos de vídeo
-            video_exts = {'.mp4', '.mkv', '.avi', '.mov', '.webm', '.flv', '.wmv'}
             streamable = []
             for f in files:
                 path = f.get('path', '')
-                if any(path.lower().endswith(ext) for ext in video_exts):
+                if path.lower().endswith(VIDEO_EXTENSIONS):
                     streamable.append({
                         'name': os.path.basename(path),
                         'path': path,
@@ -236,16 +255,14 @@ class GoStreamClient:
             name = name.replace(char, '_')
         return name[:255]
     
+    _SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
     def _format_size(self, size_bytes: int) -> str:
         """Format bytes to human readable"""
         if size_bytes < 1024:
             return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-        else:
-            return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+        idx = min((int(size_bytes).bit_length() - 1) // 10, 3)
+        return f"{size_bytes / (1 << (idx * 10)):.1f} {self._SIZE_UNITS[idx]}"
 
 # Initialize GoStream client
 gostream_client = GoStreamClient(
@@ -341,8 +358,63 @@ def qb_get_storage_info(session: req_lib.Session, url: str) -> Dict:
 # Lightweight Jellyfin helpers
 # ---------------------------------------------------------------------------
 
+JELLYFIN_AUTH_HEADER = 'MediaBrowser Client="TelegramTorrent", Device="Server", DeviceId="unique-device-id", Version="1.0.0"'
+
+
+def _build_jellyfin_session() -> req_lib.Session:
+    """Session única (keep-alive + pool) para a API e para os proxies de imagem/legenda/stream"""
+    session = req_lib.Session()
+    # Rajadas (temporada -> episódios -> imagens) reaproveitam conexões; 5xx transitórios são repetidos
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# O token vai nos headers/query de cada requisição, então todas as contas compartilham a Session
+JELLYFIN_SESSION = _build_jellyfin_session()
+
+# Parte fixa dos params de listagem; cada chamada só acrescenta as chaves dinâmicas
+_RECENT_ITEMS_PARAMS = {
+    'Recursive': 'true',
+    'IncludeItemTypes': 'Movie,Series',
+    'SortBy': 'DateCreated',
+    'SortOrder': 'Descending',
+}
+# Extrai só a mensagem do corpo de erro do Jellyfin, sem decodificar o JSON (ou HTML de proxy) inteiro
+_ERROR_MESSAGE_RE = re.compile(rb'"Message"\s*:\s*"([^"]{0,500})"')
+
+
+def _jellyfin_error_detail(response) -> str:
+    head = response.content[:2048]
+    match = _ERROR_MESSAGE_RE.search(head)
+    if match:
+        return match.group(1).decode('utf-8', 'replace')
+    return head[:200].decode('utf-8', 'replace')
+
+
+# Metadados (item, temporadas, episódios, bibliotecas) mudam pouco durante a navegação
+_METADATA_TTL = 300
+_METADATA_CACHE_SIZE = 512
+
+# Saída sempre transcodificada (AAC estéreo) para compatibilidade com navegadores
+_STREAM_PARAMS = {
+    'AudioCodec': 'aac',
+    'AudioBitrate': 384000,
+    'MaxAudioChannels': 2,
+    'VideoCodec': 'h264,hevc',
+    'VideoBitrate': 120000000,
+}
+
+
 class JellyfinClient:
     """Cliente individual para uma conta Jellyfin"""
+    __slots__ = (
+        'url', 'username', 'password', 'api_key', 'access_token', 'user_id', 'session', '_available',
+        '_user_params', '_metadata_cache', '_cache_lock', '_auth_request_headers', '_api_headers',
+    )
+
     def __init__(self, url: str, username: str = '', password: str = '', api_key: str = ''):
         self.url = url.rstrip('/')
         self.username = username
@@ -350,56 +422,98 @@ class JellyfinClient:
         self.api_key = api_key
         self.access_token = None
         self.user_id = None
-        self.session = req_lib.Session()
+        self.session = JELLYFIN_SESSION
         self._available = False
+        # Params de escopo de usuário, montados uma vez após o login
+        self._user_params: Dict = {}
+        # chave -> (expira_em, valor); ver _cache_get/_cache_set
+        self._metadata_cache: Dict[Hashable, tuple] = {}
+        self._cache_lock = threading.Lock()
+        # Headers do login montados uma única vez por cliente
+        self._auth_request_headers = {
+            'Content-Type': 'application/json',
+            'X-Emby-Authorization': JELLYFIN_AUTH_HEADER,
+        }
 
         if self.url:
             if username and password:
                 self._authenticate(username, password)
             if self.api_key or self.access_token:
                 self._available = True
+        self._build_api_headers()
 
-    def _headers(self) -> Dict:
-        h = {'Content-Type': 'application/json'}
+    def _build_api_headers(self) -> None:
+        # Só GETs usam estes headers; o POST de login tem os seus (com Content-Type)
         token = self.api_key or self.access_token
-        if token:
-            h['X-Emby-Token'] = token
-        return h
+        self._api_headers = {'X-Emby-Token': token} if token else {}
+
+    def _headers(self) -> Dict:
+        return self._api_headers
 
     def _authenticate(self, username: str, password: str):
         try:
-            auth_header = 'MediaBrowser Client="TelegramTorrent", Device="Server", DeviceId="unique-device-id", Version="1.0.0"'
             resp = self.session.post(
                 f"{self.url}/Users/authenticatebyname",
-                headers={
-                    'Content-Type': 'application/json',
-                    'X-Emby-Authorization': auth_header
-                },
+                headers=self._auth_request_headers,
                 json={'Username': username, 'Password': password},
                 timeout=30,
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = _json_loads(resp.content)
             self.access_token = data.get('AccessToken')
             self.user_id = data.get('User', {}).get('Id')
+            self._user_params = {'userId': self.user_id} if self.user_id else {}
             logger.info("Jellyfin authentication OK")
         except Exception as e:
             logger.error(f"Jellyfin auth error: {e}")
-            try:
-                logger.error(f"Response content: {e.response.text if hasattr(e, 'response') else 'N/A'}")
-            except:
-                pass
+            response = getattr(e, 'response', None)
+            if response is not None:
+                logger.error(f"Response content: {_jellyfin_error_detail(response)}")
 
     def is_available(self) -> bool:
         return self._available
 
+    def _cache_get(self, key: Hashable) -> Any:
+        with self._cache_lock:
+            entry = self._metadata_cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._metadata_cache[key]
+                return None
+            return entry[1]
+
+    def _cache_set(self, key: Hashable, value: Any) -> None:
+        # Respostas vazias não são guardadas: podem ser falha transitória
+        if not value:
+            return
+        with self._cache_lock:
+            if key not in self._metadata_cache and len(self._metadata_cache) >= _METADATA_CACHE_SIZE:
+                del self._metadata_cache[next(iter(self._metadata_cache))]
+            self._metadata_cache[key] = (time.monotonic() + _METADATA_TTL, value)
+
+    def _get_items(self, path: str, params: Dict = None) -> List[Dict]:
+        """Lê o array `Items` em streaming (ijson), sem bufferizar o corpo inteiro da resposta"""
+        with self.session.get(f"{self.url}{path}", headers=self._headers(), params=params,
+                              timeout=30, stream=True) as resp:
+            resp.raise_for_status()
+            if ijson is None:
+                return _json_loads(resp.content).get('Items', [])
+            resp.raw.decode_content = True
+            return list(ijson.items(resp.raw, 'Items.item', use_float=True))
+
     def get_libraries(self) -> List[Dict]:
         if not self._available:
             return []
+        cached = self._cache_get('libraries')
+        if cached is not None:
+            return cached
         try:
             resp = self.session.get(f"{self.url}/Library/VirtualFolders", headers=self._headers(), timeout=30)
             resp.raise_for_status()
-            return resp.json()
+            libraries = _json_loads(resp.content)
+            self._cache_set('libraries', libraries)
+            return libraries
         except Exception as e:
             logger.error(f"Jellyfin libraries error: {e}")
             return []
@@ -407,18 +521,10 @@ class JellyfinClient:
     def get_recent_items(self, limit: int = 10) -> List[Dict]:
         if not self._available:
             return []
-        params = {
-            'Limit': limit,
-            'Recursive': True,
-            'IncludeItemTypes': 'Movie,Series',
-            'SortBy': 'DateCreated',
-            'SortOrder': 'Descending',
-        }
+        params = {**_RECENT_ITEMS_PARAMS, 'Limit': limit}
         try:
             endpoint = f"/Users/{self.user_id}/Items" if self.user_id else "/Items"
-            resp = self.session.get(f"{self.url}{endpoint}", headers=self._headers(), params=params, timeout=30)
-            resp.raise_for_status()
-            return resp.json().get('Items', [])
+            return self._get_items(endpoint, params)
         except Exception as e:
             logger.error(f"Jellyfin recent items error: {e}")
             return []
@@ -426,11 +532,17 @@ class JellyfinClient:
     def get_item(self, item_id: str) -> Optional[Dict]:
         if not self._available:
             return None
+        key = ('item', item_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         try:
             endpoint = f"/Users/{self.user_id}/Items/{item_id}" if self.user_id else f"/Items/{item_id}"
             resp = self.session.get(f"{self.url}{endpoint}", headers=self._headers(), timeout=30)
             resp.raise_for_status()
-            return resp.json()
+            item = _json_loads(resp.content)
+            self._cache_set(key, item)
+            return item
         except Exception as e:
             logger.error(f"Jellyfin get item error: {e}")
             return None
@@ -438,16 +550,14 @@ class JellyfinClient:
     def get_seasons(self, series_id: str) -> List[Dict]:
         if not self._available:
             return []
+        key = ('seasons', series_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         try:
-            params = {}
-            if self.user_id:
-                params['userId'] = self.user_id
-            resp = self.session.get(
-                f"{self.url}/Shows/{series_id}/Seasons",
-                headers=self._headers(), params=params, timeout=30,
-            )
-            resp.raise_for_status()
-            return resp.json().get('Items', [])
+            seasons = self._get_items(f"/Shows/{series_id}/Seasons", self._user_params)
+            self._cache_set(key, seasons)
+            return seasons
         except Exception as e:
             logger.error(f"Jellyfin get seasons error: {e}")
             return []
@@ -455,18 +565,17 @@ class JellyfinClient:
     def get_episodes(self, series_id: str, season_id: str = None) -> List[Dict]:
         if not self._available:
             return []
+        key = ('episodes', series_id, season_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
         try:
-            params = {'Recursive': True}
-            if self.user_id:
-                params['userId'] = self.user_id
+            params = {'Recursive': 'true', **self._user_params}
             if season_id:
                 params['seasonId'] = season_id
-            resp = self.session.get(
-                f"{self.url}/Shows/{series_id}/Episodes",
-                headers=self._headers(), params=params, timeout=30,
-            )
-            resp.raise_for_status()
-            return resp.json().get('Items', [])
+            episodes = self._get_items(f"/Shows/{series_id}/Episodes", params)
+            self._cache_set(key, episodes)
+            return episodes
         except Exception as e:
             logger.error(f"Jellyfin get episodes error: {e}")
             return []
@@ -475,15 +584,12 @@ class JellyfinClient:
         if not self._available:
             return None
         try:
-            params = {}
-            if self.user_id:
-                params['userId'] = self.user_id
             resp = self.session.get(
                 f"{self.url}/Items/{item_id}/PlaybackInfo",
-                headers=self._headers(), params=params, timeout=30,
+                headers=self._headers(), params=self._user_params, timeout=30,
             )
             resp.raise_for_status()
-            return resp.json()
+            return _json_loads(resp.content)
         except Exception as e:
             logger.error(f"Jellyfin playback info error: {e}")
             return None
@@ -493,10 +599,10 @@ class JellyfinClient:
         # Always request transcoded/decoded stream from Jellyfin
         # Jellyfin will automatically transcode EAC3 to AAC for browser compatibility
         # static=false allows Jellyfin to transcode when needed
-        url = f"{self.url}/Videos/{item_id}/stream?static=false&api_key={token}&AudioCodec=aac&AudioBitrate=384000&MaxAudioChannels=2&VideoCodec=h264,hevc&VideoBitrate=120000000"
+        params = {'static': 'false', 'api_key': token, **_STREAM_PARAMS}
         if audio_stream_index is not None:
-            url += f"&AudioStreamIndex={audio_stream_index}"
-        return url
+            params['AudioStreamIndex'] = audio_stream_index
+        return f"{self.url}/Videos/{item_id}/stream?{urlencode(params)}"
 
     def get_transcode_url(self, item_id: str, audio_stream_index: int = None) -> str:
         # Same as get_stream_url - always use transcoded output
@@ -504,11 +610,11 @@ class JellyfinClient:
 
     def get_subtitle_url(self, item_id: str, media_source_id: str, index: int) -> str:
         token = self.api_key or self.access_token or ''
-        return f"{self.url}/Videos/{item_id}/{media_source_id}/Subtitles/{index}/0/Stream.vtt?api_key={token}"
+        return f"{self.url}/Videos/{item_id}/{media_source_id}/Subtitles/{index}/0/Stream.vtt?{urlencode({'api_key': token})}"
 
     def get_image_url(self, item_id: str, image_type: str = 'Primary', max_width: int = 300) -> str:
         token = self.api_key or self.access_token or ''
-        return f"{self.url}/Items/{item_id}/Images/{image_type}?maxWidth={max_width}&api_key={token}"
+        return f"{self.url}/Items/{item_id}/Images/{image_type}?{urlencode({'maxWidth': max_width, 'api_key': token})}"
 
 
 class JellyfinHelper:
@@ -543,20 +649,24 @@ class JellyfinHelper:
     def is_available(self) -> bool:
         return len(self.clients) > 0
     
-    def get_libraries(self) -> List[Dict]:
+    async def get_libraries_async(self) -> List[Dict]:
+        """Consulta as bibliotecas de todos os servidores em paralelo"""
+        results = await asyncio.gather(
+            *(asyncio.to_thread(client.get_libraries) for client in self.clients),
+            return_exceptions=True,
+        )
         all_libraries = []
-        for client in self.clients:
-            try:
-                libraries = client.get_libraries()
-                for lib in libraries:
-                    lib['_jellyfin_url'] = client.url
-                all_libraries.extend(libraries)
-            except Exception as e:
-                logger.error(f"Error getting libraries from {client.url}: {e}")
+        for client, libraries in zip(self.clients, results):
+            if isinstance(libraries, Exception):
+                logger.error(f"Error getting libraries from {client.url}: {libraries}")
+                continue
+            for lib in libraries:
+                lib['_jellyfin_url'] = client.url
+            all_libraries.extend(libraries)
         return all_libraries
     
-    def get_recent_items(self, limit: int = 10) -> List[Dict]:
-        all_items = []
+    async def get_recent_items_async(self, limit: int = 10) -> List[Dict]:
+        """Consulta os itens recentes de todos os servidores em paralelo"""
         num_clients = len(self.clients)
         
         if num_clients == 0:
@@ -565,14 +675,18 @@ class JellyfinHelper:
         # Busca mais itens de cada servidor para garantir variedade após ordenação
         per_client_limit = max(limit, limit * 2 // num_clients) if num_clients > 1 else limit
         
-        for client in self.clients:
-            try:
-                items = client.get_recent_items(per_client_limit)
-                for item in items:
-                    item['_jellyfin_url'] = client.url
-                all_items.extend(items)
-            except Exception as e:
-                logger.error(f"Error getting recent items from {client.url}: {e}")
+        results = await asyncio.gather(
+            *(asyncio.to_thread(client.get_recent_items, per_client_limit) for client in self.clients),
+            return_exceptions=True,
+        )
+        all_items = []
+        for client, items in zip(self.clients, results):
+            if isinstance(items, Exception):
+                logger.error(f"Error getting recent items from {client.url}: {items}")
+                continue
+            for item in items:
+                item['_jellyfin_url'] = client.url
+            all_items.extend(items)
         
         # Ordena por data de criação e retorna mais itens quando há múltiplos servidores
         all_items.sort(key=lambda x: x.get('DateCreated', ''), reverse=True)
@@ -692,11 +806,16 @@ class ConnectionManager:
             self.active_connections.remove(websocket)
 
     async def broadcast(self, message: dict):
-        for conn in self.active_connections:
-            try:
-                await conn.send_json(message)
-            except Exception:
-                pass
+        # Send to every client concurrently so one slow socket does not delay the rest
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(conn.send_json(message) for conn in connections),
+            return_exceptions=True,
+        )
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.debug(f"WebSocket send failed, dropping connection: {result}")
+                self.disconnect(conn)
 
 ws_manager = ConnectionManager()
 
@@ -1102,7 +1221,7 @@ async def gostream_stream_proxy(
 async def broadcast_updates():
     while True:
         try:
-            torrents_data = get_all_torrents()
+            torrents_data = await get_all_torrents()
             if torrents_data:
                 await ws_manager.broadcast({
                     "type": "torrents_update",
@@ -1114,12 +1233,14 @@ async def broadcast_updates():
         await asyncio.sleep(5)
 
 
-def get_all_torrents() -> List[Dict]:
+async def get_all_torrents() -> List[Dict]:
+    # requests is blocking: each instance is fetched in a worker thread, all of them in parallel
+    instances = [inst for inst in app_state.qb_sessions if inst['session'] is not None]
+    results = await asyncio.gather(
+        *(asyncio.to_thread(qb_fetch_torrents, inst['session'], inst['url']) for inst in instances)
+    )
     all_torrents = []
-    for inst in app_state.qb_sessions:
-        if inst['session'] is None:
-            continue
-        torrents = qb_fetch_torrents(inst['session'], inst['url'])
+    for inst, torrents in zip(instances, results):
         for t in torrents:
             t['instance'] = inst['name']
         all_torrents.extend(torrents)
@@ -1216,17 +1337,15 @@ async def verify_auth(current_user: Dict = Depends(get_current_user)):
 async def get_system_status(current_user: Dict = Depends(get_current_user)):
     connected_qb = any(i['session'] is not None for i in app_state.qb_sessions)
     
-    # Coletar informações de armazenamento de todas as instâncias
-    total_storage = 0
-    used_storage = 0
-    free_storage = 0
-    
-    for inst in app_state.qb_sessions:
-        if inst['session'] is not None:
-            storage_info = qb_get_storage_info(inst['session'], inst['url'])
-            total_storage += storage_info['total']
-            used_storage += storage_info['used']
-            free_storage += storage_info['free']
+    # Coletar informações de armazenamento de todas as instâncias (requisições em paralelo)
+    storage_infos = await asyncio.gather(*(
+        asyncio.to_thread(qb_get_storage_info, inst['session'], inst['url'])
+        for inst in app_state.qb_sessions
+        if inst['session'] is not None
+    ))
+    total_storage = sum(info['total'] for info in storage_infos)
+    used_storage = sum(info['used'] for info in storage_infos)
+    free_storage = sum(info['free'] for info in storage_infos)
     
     return {
         "qbittorrent": {
@@ -1253,7 +1372,7 @@ async def get_system_status(current_user: Dict = Depends(get_current_user)):
 @app.get("/api/torrents")
 async def get_torrents(current_user: Dict = Depends(get_current_user)):
     try:
-        torrents = get_all_torrents()
+        torrents = await get_all_torrents()
         active = [t for t in torrents if t.get('state') in ['downloading', 'uploading', 'stalledDL', 'stalledUP']]
         paused = [t for t in torrents if t.get('state') == 'pausedDL']
         completed = [t for t in torrents if t.get('state') in ['uploading', 'pausedUP']]
@@ -1275,7 +1394,7 @@ async def add_torrent(magnet_link: str, current_user: Dict = Depends(get_current
     try:
         inst = get_first_session()
         if inst:
-            result = qb_add_magnet(inst['session'], inst['url'], magnet_link)
+            result = await asyncio.to_thread(qb_add_magnet, inst['session'], inst['url'], magnet_link)
             return {"success": result, "instance": inst['name']}
         raise HTTPException(status_code=503, detail="qBittorrent not connected")
     except HTTPException:
@@ -1289,7 +1408,7 @@ async def pause_torrent(torrent_hash: str, current_user: Dict = Depends(get_curr
     inst = get_first_session()
     if not inst:
         raise HTTPException(status_code=503, detail="qBittorrent not connected")
-    ok = qb_action(inst['session'], inst['url'], 'pause', torrent_hash)
+    ok = await asyncio.to_thread(qb_action, inst['session'], inst['url'], 'pause', torrent_hash)
     return {"success": ok}
 
 
@@ -1298,7 +1417,7 @@ async def resume_torrent(torrent_hash: str, current_user: Dict = Depends(get_cur
     inst = get_first_session()
     if not inst:
         raise HTTPException(status_code=503, detail="qBittorrent not connected")
-    ok = qb_action(inst['session'], inst['url'], 'resume', torrent_hash)
+    ok = await asyncio.to_thread(qb_action, inst['session'], inst['url'], 'resume', torrent_hash)
     return {"success": ok}
 
 
@@ -1307,28 +1426,30 @@ async def delete_torrent(torrent_hash: str, delete_files: bool = False, current_
     inst = get_first_session()
     if not inst:
         raise HTTPException(status_code=503, detail="qBittorrent not connected")
-    ok = qb_action(inst['session'], inst['url'], 'delete', torrent_hash, deleteFiles=str(delete_files).lower())
+    ok = await asyncio.to_thread(
+        qb_action, inst['session'], inst['url'], 'delete', torrent_hash, deleteFiles=str(delete_files).lower()
+    )
     return {"success": ok}
 
 
 @app.get("/api/jellyfin/libraries")
 async def get_jellyfin_libraries(current_user: Dict = Depends(get_current_user)):
     if app_state.jellyfin and app_state.jellyfin.is_available():
-        return {"libraries": app_state.jellyfin.get_libraries()}
+        return {"libraries": await app_state.jellyfin.get_libraries_async()}
     raise HTTPException(status_code=503, detail="Jellyfin not available")
 
 
 @app.get("/api/jellyfin/recent")
 async def get_jellyfin_recent(limit: int = 10, current_user: Dict = Depends(get_current_user)):
     if app_state.jellyfin and app_state.jellyfin.is_available():
-        return {"items": app_state.jellyfin.get_recent_items(limit=limit)}
+        return {"items": await app_state.jellyfin.get_recent_items_async(limit=limit)}
     raise HTTPException(status_code=503, detail="Jellyfin not available")
 
 
 @app.get("/api/jellyfin/items/{item_id}")
 async def get_jellyfin_item(item_id: str, server_url: str = None, current_user: Dict = Depends(get_current_user)):
     if app_state.jellyfin and app_state.jellyfin.is_available():
-        item = app_state.jellyfin.get_item(item_id, server_url)
+        item = await asyncio.to_thread(app_state.jellyfin.get_item, item_id, server_url)
         if item:
             return item
         raise HTTPException(status_code=404, detail="Item not found")
@@ -1338,14 +1459,14 @@ async def get_jellyfin_item(item_id: str, server_url: str = None, current_user:
 @app.get("/api/jellyfin/shows/{series_id}/seasons")
 async def get_jellyfin_seasons(series_id: str, server_url: str = None, current_user: Dict = Depends(get_current_user)):
     if app_state.jellyfin and app_state.jellyfin.is_available():
-        return {"items": app_state.jellyfin.get_seasons(series_id, server_url)}
+        return {"items": await asyncio.to_thread(app_state.jellyfin.get_seasons, series_id, server_url)}
     raise HTTPException(status_code=503, detail="Jellyfin not available")
 
 
 @app.get("/api/jellyfin/shows/{series_id}/episodes")
 async def get_jellyfin_episodes(series_id: str, season_id: str = None, server_url: str = None, current_user: Dict = Depends(get_current_user)):
     if app_state.jellyfin and app_state.jellyfin.is_available():
-        return {"items": app_state.jellyfin.get_episodes(series_id, season_id, server_url)}
+        return {"items": await asyncio.to_thread(app_state.jellyfin.get_episodes, series_id, season_id, server_url)}
     raise HTTPException(status_code=503, detail="Jellyfin not available")
 
 
@@ -1358,7 +1479,8 @@ async def get_jellyfin_image(item_id: str, type: str = "Primary", maxWidth: int
     if not image_url:
         raise HTTPException(status_code=404, detail="Image not found - server not available")
     try:
-        resp = req_lib.get(image_url, stream=True, timeout=30)
+        # requests bloqueia: fora do event loop as várias capas da grade são buscadas em paralelo
+        resp = await asyncio.to_thread(JELLYFIN_SESSION.get, image_url, stream=True, timeout=30)
         if resp.status_code == 404:
             raise HTTPException(status_code=404, detail="Image not found")
         resp.raise_for_status()
@@ -1376,7 +1498,7 @@ async def get_jellyfin_image(item_id: str, type: str = "Primary", maxWidth: int
 async def get_jellyfin_playback_info(item_id: str, server_url: str = None, current_user: Dict = Depends(get_current_user)):
     if not app_state.jellyfin or not app_state.jellyfin.is_available():
         raise HTTPException(status_code=503, detail="Jellyfin not available")
-    info = app_state.jellyfin.get_playback_info(item_id, server_url)
+    info = await asyncio.to_thread(app_state.jellyfin.get_playback_info, item_id, server_url)
     if info:
         return info
     raise HTTPException(status_code=404, detail="Playback info not found")
@@ -1391,7 +1513,7 @@ async def get_jellyfin_subtitle(item_id: str, media_source_id: str, index: int,
     if not sub_url:
         raise HTTPException(status_code=404, detail="Subtitle not found - server not available")
     try:
-        resp = req_lib.get(sub_url, stream=True, timeout=30)
+        resp = await asyncio.to_thread(JELLYFIN_SESSION.get, sub_url, stream=True, timeout=30)
         resp.raise_for_status()
         return StreamingResponse(
             resp.iter_content(chunk_size=65536),
@@ -1419,7 +1541,7 @@ async def stream_jellyfin(item_id: str, request: Request, audioStreamIndex: int
     if 'range' in request.headers:
         headers['Range'] = request.headers['range']
     try:
-        resp = req_lib.get(stream_url, headers=headers, stream=True, timeout=60)
+        resp = await asyncio.to_thread(JELLYFIN_SESSION.get, stream_url, headers=headers, stream=True, timeout=60)
         resp.raise_for_status()
         response_headers = {}
         for key in ['Content-Type', 'Content-Length', 'Content-Range', 'Accept-Ranges']:
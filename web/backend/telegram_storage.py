@@ -23,6 +23,8 @@ class TelegramStorageService:
         self.bot_token = bot_token or TELEGRAM_BOT_TOKEN
         self.chat_id = chat_id or TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        # Reuse the TCP/TLS connection to api.telegram.org across uploads and downloads
+        self.session = requests.Session()
         
         # Local metadata storage (maps file_id to metadata)
         _base_dir = Path(__file__).parent / "appstore_data"
@@ -87,7 +89,7 @@ class TelegramStorageService:
                     'caption': f"📄 {filename}\n🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                 }
                 
-                resp = requests.post(url, files=files, data=data, timeout=60)
+                resp = self.session.post(url, files=files, data=data, timeout=60)
                 if resp.status_code != 200:
                     logger.error(f"Telegram API error: {resp.status_code} - {resp.text}")
                 resp.raise_for_status()
@@ -134,7 +136,7 @@ class TelegramStorageService:
         try:
             # Get file path from Telegram
             url = f"{self.base_url}/getFile"
-            resp = requests.get(url, params={'file_id': file_id}, timeout=30)
+            resp = self.session.get(url, params={'file_id': file_id}, timeout=30)
             resp.raise_for_status()
             result = resp.json()
             
@@ -145,7 +147,7 @@ class TelegramStorageService:
             
             # Download file content
             download_url = f"https://api.telegram.org/file/bot{self.bot_token}/{file_path}"
-            download_resp = requests.get(download_url, timeout=60)
+            download_resp = self.session.get(download_url, timeout=60)
             download_resp.raise_for_status()
             
             content = download_resp.text
@@ -212,7 +214,7 @@ class TelegramStorageService:
                     'chat_id': self.chat_id,
                     'message_id': message_id
                 }
-                resp = requests.post(url, json=data, timeout=30)
+                resp = self.session.post(url, json=data, timeout=30)
                 resp.raise_for_status()
             
             # Remove from metadata